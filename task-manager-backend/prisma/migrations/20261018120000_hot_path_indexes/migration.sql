@@ -0,0 +1,8 @@
+-- CreateIndex
+CREATE INDEX "UserGroup_groupId_userId_idx" ON "UserGroup"("groupId", "userId");
+
+-- CreateIndex
+CREATE INDEX "Task_groupId_idx" ON "Task"("groupId");
+
+-- CreateIndex
+CREATE INDEX "Task_groupId_completed_idx" ON "Task"("groupId", "completed");
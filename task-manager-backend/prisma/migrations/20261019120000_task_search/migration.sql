@@ -0,0 +1,40 @@
+-- Full-text index over task titles and descriptions. The index reads Task
+-- through a view so each row also carries its group as a token
+-- ("g<groupId>"): group and user scopes are part of the MATCH itself.
+-- Not expressible in schema.prisma; see the README before running
+-- `prisma migrate dev`.
+CREATE VIEW "TaskSearchSource" AS
+SELECT "id", "title", "description", 'g' || "groupId" AS "scope" FROM "Task";
+
+CREATE VIRTUAL TABLE "TaskSearch" USING fts5(
+    "title", "description", "scope",
+    content = 'TaskSearchSource',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Title matches weigh more than description matches; scope never ranks
+INSERT INTO "TaskSearch" ("TaskSearch", "rank") VALUES ('rank', 'bm25(4.0, 1.0, 0.0)');
+
+-- Triggers keep the index in sync, so bulk inserts and FK cascades are covered too
+CREATE TRIGGER "Task_search_insert" AFTER INSERT ON "Task" BEGIN
+    INSERT INTO "TaskSearch" ("rowid", "title", "description", "scope")
+    VALUES (new."id", new."title", new."description", 'g' || new."groupId");
+END;
+
+CREATE TRIGGER "Task_search_delete" AFTER DELETE ON "Task" BEGIN
+    INSERT INTO "TaskSearch" ("TaskSearch", "rowid", "title", "description", "scope")
+    VALUES ('delete', old."id", old."title", old."description", 'g' || old."groupId");
+END;
+
+-- Completing a task does not touch the index
+CREATE TRIGGER "Task_search_update" AFTER UPDATE OF "title", "description", "groupId" ON "Task" BEGIN
+    INSERT INTO "TaskSearch" ("TaskSearch", "rowid", "title", "description", "scope")
+    VALUES ('delete', old."id", old."title", old."description", 'g' || old."groupId");
+    INSERT INTO "TaskSearch" ("rowid", "title", "description", "scope")
+    VALUES (new."id", new."title", new."description", 'g' || new."groupId");
+END;
+
+-- Index the tasks that already exist
+INSERT INTO "TaskSearch" ("TaskSearch") VALUES ('rebuild');
@@ -0,0 +1,12 @@
+import { Controller, Get } from '@nestjs/common';
+import { AdmissionService } from './admission.service';
+
+@Controller('admission')
+export class AdmissionController {
+  constructor(private readonly admission: AdmissionService) {}
+
+  @Get('stats')
+  getStats() {
+    return this.admission.stats();
+  }
+}
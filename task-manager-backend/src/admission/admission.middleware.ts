@@ -0,0 +1,29 @@
+import { Injectable, NestMiddleware } from '@nestjs/common';
+import type { NextFunction, Request, Response } from 'express';
+import { AdmissionService } from './admission.service';
+import { clientId } from './client-id';
+
+const REJECTIONS = {
+  429: { error: 'Too Many Requests', message: 'Rate limit exceeded' },
+  503: { error: 'Service Unavailable', message: 'Server is at capacity' },
+};
+
+@Injectable()
+export class AdmissionMiddleware implements NestMiddleware {
+  constructor(private readonly admission: AdmissionService) {}
+
+  use(req: Request, res: Response, next: NextFunction) {
+    const decision = this.admission.admit(req.method, req.path, clientId(req));
+    if (!decision.admitted) {
+      // Whole seconds, rounded up, as Retry-After requires
+      res.setHeader('Retry-After', Math.ceil(decision.retryAfterMs / 1000));
+      res
+        .status(decision.status)
+        .json({ statusCode: decision.status, ...REJECTIONS[decision.status] });
+      return;
+    }
+    // 'close' also fires when the client disconnects before the response ends
+    res.once('close', decision.release);
+    next();
+  }
+}
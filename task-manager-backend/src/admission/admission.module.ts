@@ -0,0 +1,16 @@
+import { Global, MiddlewareConsumer, Module, NestModule } from '@nestjs/common';
+import { AdmissionController } from './admission.controller';
+import { AdmissionMiddleware } from './admission.middleware';
+import { AdmissionService } from './admission.service';
+
+@Global()
+@Module({
+  controllers: [AdmissionController],
+  providers: [AdmissionService],
+  exports: [AdmissionService],
+})
+export class AdmissionModule implements NestModule {
+  configure(consumer: MiddlewareConsumer) {
+    consumer.apply(AdmissionMiddleware).forRoutes('{*splat}');
+  }
+}
@@ -0,0 +1,110 @@
+import { Injectable } from '@nestjs/common';
+import { intFromEnv } from '../common/env';
+import { TokenBuckets } from './token-bucket';
+
+const WRITE_METHODS = new Set(['POST', 'PUT', 'PATCH', 'DELETE']);
+
+// Long-lived or diagnostic routes that must keep working under overload
+const UNLIMITED_ROUTE = /^\/(?:metrics|admission\/stats|groups\/\d+\/events)\/?$/;
+
+interface RateRule {
+  name: string;
+  path: RegExp;
+  buckets: TokenBuckets;
+  limited: number;
+}
+
+export type Admission =
+  | { admitted: true; release: () => void }
+  | { admitted: false; status: 429 | 503; retryAfterMs: number };
+
+function rateRule(name: string, path: RegExp, variable: string) {
+  const ratePerSecond = intFromEnv(variable, 0);
+  if (ratePerSecond === 0) {
+    return [];
+  }
+  const burstMs = intFromEnv('RATE_LIMIT_BURST_MS', 1000);
+  const burst = Math.max(1, Math.floor((ratePerSecond * burstMs) / 1000));
+  const buckets = new TokenBuckets(
+    ratePerSecond,
+    burst,
+    Math.max(intFromEnv('RATE_LIMIT_MAX_CLIENTS', 10000), 1),
+  );
+  return [{ name, path, buckets, limited: 0 }];
+}
+
+/**
+ * Decides, before any pipe or query runs, whether a request is served.
+ * Task and member writes take a token from the client's bucket for that
+ * route (429 when empty); every request then needs one of MAX_IN_FLIGHT
+ * slots (503 when none is free). Rejections carry Retry-After, so an
+ * overloaded server answers quickly instead of queueing on the SQLite
+ * writer until clients time out.
+ */
+@Injectable()
+export class AdmissionService {
+  readonly maxInFlight = intFromEnv('MAX_IN_FLIGHT', 256);
+  private readonly rules: RateRule[] = [
+    ...rateRule(
+      'task-writes',
+      /^\/groups\/\d+\/tasks(?:\/|$)/,
+      'RATE_LIMIT_TASK_WRITES',
+    ),
+    ...rateRule(
+      'member-writes',
+      /^\/groups\/\d+\/members(?:\/|$)/,
+      'RATE_LIMIT_MEMBER_WRITES',
+    ),
+  ];
+  private inFlight = 0;
+  private admitted = 0;
+  private overloaded = 0;
+
+  admit(method: string, path: string, client: string): Admission {
+    if (UNLIMITED_ROUTE.test(path)) {
+      return { admitted: true, release: () => {} };
+    }
+
+    if (WRITE_METHODS.has(method)) {
+      const rule = this.rules.find((r) => r.path.test(path));
+      const waitMs = rule ? rule.buckets.take(client) : 0;
+      if (waitMs > 0) {
+        rule!.limited++;
+        return { admitted: false, status: 429, retryAfterMs: waitMs };
+      }
+    }
+
+    if (this.maxInFlight > 0 && this.inFlight >= this.maxInFlight) {
+      this.overloaded++;
+      return { admitted: false, status: 503, retryAfterMs: 1000 };
+    }
+    this.inFlight++;
+    this.admitted++;
+    let released = false;
+    return {
+      admitted: true,
+      release: () => {
+        if (!released) {
+          released = true;
+          this.inFlight--;
+        }
+      },
+    };
+  }
+
+  stats() {
+    return {
+      maxInFlight: this.maxInFlight,
+      inFlight: this.inFlight,
+      admitted: this.admitted,
+      overloaded: this.overloaded,
+      rateLimits: this.rules.map((rule) => ({
+        name: rule.name,
+        ratePerSecond: rule.buckets.ratePerSecond,
+        burst: rule.buckets.burst,
+        clients: rule.buckets.size,
+        limited: rule.limited,
+      })),
+    };
+  }
+}
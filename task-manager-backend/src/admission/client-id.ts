@@ -0,0 +1,11 @@
+import type { Request } from 'express';
+
+/**
+ * The client a request is counted against, by rate limits and idempotency
+ * keys alike: the RATE_LIMIT_CLIENT_HEADER header when one is configured
+ * (e.g. X-Client-Id set by a gateway), the remote IP otherwise.
+ */
+export function clientId(req: Request): string {
+  const header = process.env.RATE_LIMIT_CLIENT_HEADER;
+  return (header && req.header(header)) || req.ip || '';
+}
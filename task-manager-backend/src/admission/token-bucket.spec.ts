@@ -0,0 +1,47 @@
+import { TokenBuckets } from './token-bucket';
+
+describe('TokenBuckets', () => {
+  let now: number;
+  const clock = () => now;
+
+  beforeEach(() => {
+    now = 0;
+  });
+
+  it('allows a burst, then one request per refilled token', () => {
+    const buckets = new TokenBuckets(10, 3, 100, clock);
+
+    expect([1, 2, 3].map(() => buckets.take('a'))).toEqual([0, 0, 0]);
+    expect(buckets.take('a')).toBe(100);
+
+    now = 50;
+    expect(buckets.take('a')).toBe(50);
+    now = 100;
+    expect(buckets.take('a')).toBe(0);
+  });
+
+  it('keeps a separate bucket per client and never refills past the burst', () => {
+    const buckets = new TokenBuckets(10, 2, 100, clock);
+    buckets.take('a');
+    buckets.take('a');
+
+    expect(buckets.take('b')).toBe(0);
+    expect(buckets.take('a')).toBeGreaterThan(0);
+
+    now = 60_000;
+    expect([1, 2, 3].map(() => buckets.take('a'))).toEqual([0, 0, 100]);
+  });
+
+  it('forgets the least recently seen client when full', () => {
+    const buckets = new TokenBuckets(1, 1, 2, clock);
+    buckets.take('a');
+    buckets.take('b');
+    buckets.take('a');
+    buckets.take('c');
+
+    expect(buckets.size).toBe(2);
+    // 'b' was evicted, so it starts again with a full bucket
+    expect(buckets.take('b')).toBe(0);
+    expect(buckets.take('c')).toBe(1000);
+  });
+});
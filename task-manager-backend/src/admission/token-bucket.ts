@@ -0,0 +1,50 @@
+interface Bucket {
+  tokens: number;
+  refilledAt: number;
+}
+
+/**
+ * One token bucket per key (client), holding up to `burst` tokens and
+ * refilled at `ratePerSecond`. Buckets are refilled lazily when taken from.
+ * A bucket left idle until it is full again is the same as a new one, so
+ * only the `maxKeys` most recently seen keys are kept.
+ */
+export class TokenBuckets {
+  private readonly buckets = new Map<string, Bucket>();
+
+  constructor(
+    readonly ratePerSecond: number,
+    readonly burst: number,
+    private readonly maxKeys = 10000,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  get size() {
+    return this.buckets.size;
+  }
+
+  /** Takes a token: 0 if one was available, else ms until the next one */
+  take(key: string): number {
+    const now = this.now();
+    let bucket = this.buckets.get(key);
+    if (bucket) {
+      // Re-inserted below, so the map stays in least recently used order
+      this.buckets.delete(key);
+      const refill = ((now - bucket.refilledAt) * this.ratePerSecond) / 1000;
+      bucket.tokens = Math.min(this.burst, bucket.tokens + refill);
+      bucket.refilledAt = now;
+    } else {
+      bucket = { tokens: this.burst, refilledAt: now };
+      if (this.buckets.size >= this.maxKeys) {
+        this.buckets.delete(this.buckets.keys().next().value!);
+      }
+    }
+    this.buckets.set(key, bucket);
+
+    if (bucket.tokens >= 1) {
+      bucket.tokens -= 1;
+      return 0;
+    }
+    return Math.ceil(((1 - bucket.tokens) * 1000) / this.ratePerSecond);
+  }
+}
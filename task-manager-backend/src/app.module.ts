@@ -2,13 +2,20 @@ import { Module } from '@nestjs/common';
 import { AppController } from './app.controller';
 import { AppService } from './app.service';
 import { PrismaModule } from './prisma/prisma.module';
+import { AdmissionModule } from './admission/admission.module';
+import { CacheModule } from './cache/cache.module';
+import { MetricsModule } from './metrics/metrics.module';
+import { VersionsModule } from './versions/versions.module';
+import { EventsModule } from './events/events.module';
+import { IdempotencyModule } from './idempotency/idempotency.module';
 
 
 
+import { ArchiveModule } from './archive/archive.module';
 import { TasksModule } from './tasks/tasks.module';
 import { UsersModule } from './users/users.module';
 @Module({
-  imports: [PrismaModule, UsersModule, TasksModule],
+  imports: [PrismaModule, AdmissionModule, CacheModule, MetricsModule, VersionsModule, EventsModule, IdempotencyModule, UsersModule, TasksModule, ArchiveModule],
   controllers: [AppController],
   providers: [AppService],
 })
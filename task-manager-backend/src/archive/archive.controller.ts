@@ -0,0 +1,27 @@
+import { Controller, Get, Post, Param, Req, UnsupportedMediaTypeException } from "@nestjs/common";
+import type { Request } from "express";
+import { ArchiveService } from "./archive.service";
+import { ndjson, NDJSON_CONTENT_TYPE, parseNdjson } from "src/common/ndjson";
+import { requestBody } from "src/common/compression";
+
+// Export/import of a whole group; responses are compressed like any other
+// (Accept-Encoding), imports may be sent with Content-Encoding: gzip or br
+@Controller('groups')
+export class ArchiveController {
+    constructor(private archiveService: ArchiveService){}
+
+    @Get(':id/export')
+    async exportGroup(@Param('id') id: string) {
+        const groupID = parseInt(id)
+        return ndjson(await this.archiveService.exportGroup(groupID), `group-${groupID}.ndjson`)
+    }
+
+    // The body is read as a stream, so it must not be JSON (the body parser would buffer it)
+    @Post('import')
+    importGroup(@Req() req: Request) {
+        if (!req.is(NDJSON_CONTENT_TYPE)) {
+            throw new UnsupportedMediaTypeException(`Send the archive as ${NDJSON_CONTENT_TYPE}`)
+        }
+        return this.archiveService.importGroup(parseNdjson(requestBody(req)))
+    }
+}
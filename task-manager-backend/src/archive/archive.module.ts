@@ -0,0 +1,12 @@
+import { Module } from "@nestjs/common";
+import { PrismaModule } from "src/prisma/prisma.module";
+import { GroupsModule } from "src/groups/groups.module";
+import { ArchiveController } from "./archive.controller";
+import { ArchiveService } from "./archive.service";
+
+@Module({
+    imports: [PrismaModule, GroupsModule],
+    controllers: [ArchiveController],
+    providers: [ArchiveService]
+})
+export class ArchiveModule{}
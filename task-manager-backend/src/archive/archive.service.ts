@@ -0,0 +1,273 @@
+import { BadRequestException, Injectable } from "@nestjs/common";
+import type { Group } from "@prisma/client";
+import { PrismaService } from "src/prisma/prisma.service";
+import { GroupsService } from "src/groups/groups.service";
+import { VersionsService } from "src/versions/versions.service";
+import { pageWindow, toPage } from "src/common/pagination";
+import { NdjsonLine, pageBatches, STREAM_BATCH_SIZE } from "src/common/ndjson";
+import { BULK_TRANSACTION_OPTIONS } from "src/prisma/transactions";
+
+export const ARCHIVE_VERSION = 1;
+
+// Records written per import transaction; one batch of each kind is held at a time
+export const IMPORT_BATCH_SIZE = 1000;
+
+interface MemberRecord {
+    name: string;
+    email: string;
+    createdAt?: Date;
+    joinedAt?: Date;
+}
+
+interface TaskRecord {
+    title: string;
+    description: string | null;
+    completed: boolean;
+    createdAt?: Date;
+}
+
+export interface ImportResult {
+    sourceGroupId: number | null;
+    group: Group;
+    members: number;
+    usersCreated: number;
+    usersMatched: number;
+    tasks: number;
+}
+
+type Fields = Record<string, unknown>;
+
+function text(record: Fields, field: string, line: number) {
+    const value = record[field];
+    if (typeof value !== 'string' || !value.trim()) {
+        throw new BadRequestException(`Line ${line}: ${field} must be a non-empty string`);
+    }
+    return value;
+}
+
+function optionalText(record: Fields, field: string, line: number) {
+    return record[field] === undefined || record[field] === null ? null : text(record, field, line);
+}
+
+function date(record: Fields, field: string, line: number) {
+    if (record[field] === undefined || record[field] === null) {
+        return undefined;
+    }
+    const value = new Date(record[field] as string);
+    if (typeof record[field] !== 'string' || isNaN(value.getTime())) {
+        throw new BadRequestException(`Line ${line}: ${field} must be an ISO date`);
+    }
+    return value;
+}
+
+/**
+ * Group archives: one NDJSON record per line, a `group` record first, then
+ * a `member` record per membership and a `task` record per task. Export
+ * pages through the group in ID order, so memory stays at one page however
+ * large it is. Import creates a new group, matches members to existing
+ * users by email (creating the missing ones) and writes tasks in batched
+ * transactions, so every ID is remapped.
+ */
+@Injectable()
+export class ArchiveService {
+    constructor(
+        private prisma: PrismaService,
+        private groupsService: GroupsService,
+        private versions: VersionsService
+    ){}
+
+    // Resolves the group first, so a missing one is a 404 before streaming starts
+    async exportGroup(id: number) {
+        const group = await this.groupsService.getById(id)
+
+        return this.records(group)
+    }
+
+    private async *records(group: Group) {
+        yield [{ type: 'group', version: ARCHIVE_VERSION, ...group }]
+
+        const members = pageBatches(async (cursor) => {
+            const { limit, take, after } = pageWindow({ cursor, limit: STREAM_BATCH_SIZE })
+            const rows = await this.prisma.userGroup.findMany({
+                where: { groupId: group.id, userId: after },
+                include: { user: true },
+                orderBy: { userId: 'asc' },
+                take
+            })
+            return toPage(rows, limit, (member) => member.userId)
+        })
+        for await (const batch of members) {
+            yield batch.map(({ userId, joinedAt, user }) => ({
+                type: 'member', userId, name: user.name, email: user.email, createdAt: user.createdAt, joinedAt
+            }))
+        }
+
+        const tasks = pageBatches(async (cursor) => {
+            const { limit, take, after } = pageWindow({ cursor, limit: STREAM_BATCH_SIZE })
+            const rows = await this.prisma.task.findMany({
+                where: { groupId: group.id, id: after },
+                orderBy: { id: 'asc' },
+                take
+            })
+            return toPage(rows, limit, (task) => task.id)
+        })
+        for await (const batch of tasks) {
+            yield batch.map(({ groupId, ...task }) => ({ type: 'task', ...task }))
+        }
+    }
+
+    async importGroup(lines: AsyncIterable<NdjsonLine>): Promise<ImportResult> {
+        let result: ImportResult | undefined
+        let members: MemberRecord[] = []
+        let tasks: TaskRecord[] = []
+        const createdUsers: number[] = []
+
+        try {
+            for await (const { line, value } of lines) {
+                const record = (value ?? {}) as Fields
+                if (!result) {
+                    result = await this.createGroup(record, line)
+                    continue
+                }
+                switch (record.type) {
+                    case 'member':
+                        members.push({
+                            name: text(record, 'name', line),
+                            email: text(record, 'email', line),
+                            createdAt: date(record, 'createdAt', line),
+                            joinedAt: date(record, 'joinedAt', line)
+                        })
+                        if (members.length >= IMPORT_BATCH_SIZE) {
+                            await this.importMembers(result, members, createdUsers)
+                            members = []
+                        }
+                        break
+                    case 'task':
+                        if (record.completed !== undefined && typeof record.completed !== 'boolean') {
+                            throw new BadRequestException(`Line ${line}: completed must be a boolean`)
+                        }
+                        tasks.push({
+                            title: text(record, 'title', line),
+                            description: optionalText(record, 'description', line),
+                            completed: record.completed === true,
+                            createdAt: date(record, 'createdAt', line)
+                        })
+                        if (tasks.length >= IMPORT_BATCH_SIZE) {
+                            await this.importTasks(result, tasks)
+                            tasks = []
+                        }
+                        break
+                    default:
+                        throw new BadRequestException(`Line ${line}: unknown record type ${JSON.stringify(record.type)}`)
+                }
+            }
+            if (!result) {
+                throw new BadRequestException('The archive is empty')
+            }
+            await this.importMembers(result, members, createdUsers)
+            await this.importTasks(result, tasks)
+        } catch (error) {
+            if (result) {
+                await this.discard(result.group.id, createdUsers)
+            }
+            throw error
+        }
+
+        this.versions.touchGroups('members', result.group.id)
+        this.versions.touchGroups('tasks', result.group.id)
+        return result
+    }
+
+    private async createGroup(record: Fields, line: number): Promise<ImportResult> {
+        if (record.type !== 'group') {
+            throw new BadRequestException(`Line ${line}: an archive starts with a group record`)
+        }
+        if (record.version !== ARCHIVE_VERSION) {
+            throw new BadRequestException(`Unsupported archive version ${JSON.stringify(record.version)} (expected ${ARCHIVE_VERSION})`)
+        }
+        const group = await this.prisma.group.create({
+            data: {
+                name: text(record, 'name', line),
+                description: optionalText(record, 'description', line),
+                createdAt: date(record, 'createdAt', line)
+            }
+        })
+
+        return {
+            sourceGroupId: typeof record.id === 'number' ? record.id : null,
+            group,
+            members: 0,
+            usersCreated: 0,
+            usersMatched: 0,
+            tasks: 0
+        }
+    }
+
+    // Users are matched by email; a member listed twice is added once
+    private async importMembers(result: ImportResult, batch: MemberRecord[], createdUsers: number[]) {
+        if (!batch.length) {
+            return
+        }
+        const groupId = result.group.id
+        const { created, matched, added } = await this.prisma.$transaction(async (tx) => {
+            const byEmail = new Map(batch.map((member) => [member.email, member]))
+            const existing = await tx.user.findMany({
+                where: { email: { in: [...byEmail.keys()] } },
+                select: { id: true, email: true }
+            })
+            const ids = new Map(existing.map((user) => [user.email, user.id]))
+            const created = await tx.user.createManyAndReturn({
+                data: [...byEmail.values()]
+                    .filter((member) => !ids.has(member.email))
+                    .map(({ name, email, createdAt }) => ({ name, email, createdAt })),
+                select: { id: true, email: true }
+            })
+            created.forEach((user) => ids.set(user.email, user.id))
+
+            const current = new Set((await tx.userGroup.findMany({
+                where: { groupId, userId: { in: [...ids.values()] } },
+                select: { userId: true }
+            })).map((member) => member.userId))
+            const data: { groupId: number, userId: number, joinedAt?: Date }[] = []
+            for (const { email, joinedAt } of byEmail.values()) {
+                const userId = ids.get(email)!
+                if (!current.has(userId)) {
+                    data.push({ groupId, userId, joinedAt })
+                }
+            }
+            const { count } = await tx.userGroup.createMany({ data })
+
+            return { created: created.map((user) => user.id), matched: existing.length, added: count }
+        }, BULK_TRANSACTION_OPTIONS)
+
+        createdUsers.push(...created)
+        result.usersCreated += created.length
+        result.usersMatched += matched
+        result.members += added
+    }
+
+    private async importTasks(result: ImportResult, batch: TaskRecord[]) {
+        if (!batch.length) {
+            return
+        }
+        const groupId = result.group.id
+        const { count } = await this.prisma.$transaction((tx) =>
+            tx.task.createMany({
+                data: batch.map((task) => ({ ...task, groupId }))
+            }),
+            BULK_TRANSACTION_OPTIONS
+        )
+        result.tasks += count
+    }
+
+    // A failed import leaves nothing behind: its group (tasks and memberships
+    // cascade) and the users it created
+    private async discard(groupId: number, createdUsers: number[]) {
+        await this.groupsService.deleteGroup(groupId)
+        for (let i = 0; i < createdUsers.length; i += IMPORT_BATCH_SIZE) {
+            await this.prisma.user.deleteMany({
+                where: { id: { in: createdUsers.slice(i, i + IMPORT_BATCH_SIZE) } }
+            })
+        }
+    }
+}
@@ -0,0 +1,12 @@
+import { Controller, Get } from '@nestjs/common';
+import { CacheService } from './cache.service';
+
+@Controller('cache')
+export class CacheController {
+  constructor(private readonly cacheService: CacheService) {}
+
+  @Get('stats')
+  getStats() {
+    return this.cacheService.stats();
+  }
+}
@@ -0,0 +1,11 @@
+import { Global, Module } from '@nestjs/common';
+import { CacheController } from './cache.controller';
+import { CacheService } from './cache.service';
+
+@Global()
+@Module({
+  controllers: [CacheController],
+  providers: [CacheService],
+  exports: [CacheService],
+})
+export class CacheModule {}
@@ -0,0 +1,30 @@
+import { Injectable } from '@nestjs/common';
+import { intFromEnv } from 'src/common/env';
+import { CacheStats, LruCache } from './lru-cache';
+
+/**
+ * Owns the named lookup caches so services that invalidate each other's
+ * entries (a user delete removing emptied groups) share one instance.
+ * Set LOOKUP_CACHE_MAX_ENTRIES=0 to disable caching.
+ */
+@Injectable()
+export class CacheService {
+  private readonly caches = new Map<string, LruCache<unknown, unknown>>();
+  private readonly maxEntries = intFromEnv('LOOKUP_CACHE_MAX_ENTRIES', 10000);
+  private readonly ttlMs = intFromEnv('LOOKUP_CACHE_TTL_MS', 30000);
+
+  cache<K, V>(name: string): LruCache<K, V> {
+    let cache = this.caches.get(name);
+    if (!cache) {
+      cache = new LruCache<unknown, unknown>(this.maxEntries, this.ttlMs);
+      this.caches.set(name, cache);
+    }
+    return cache as LruCache<K, V>;
+  }
+
+  stats(): Record<string, CacheStats> {
+    return Object.fromEntries(
+      [...this.caches].map(([name, cache]) => [name, cache.stats()]),
+    );
+  }
+}
@@ -0,0 +1,64 @@
+import { LruCache } from './lru-cache';
+
+describe('LruCache', () => {
+  let now: number;
+  const clock = () => now;
+
+  beforeEach(() => {
+    now = 0;
+  });
+
+  it('evicts the least recently used entry when full', () => {
+    const cache = new LruCache<number, string>(2, 1000, clock);
+    cache.set(1, 'a');
+    cache.set(2, 'b');
+    cache.get(1);
+    cache.set(3, 'c');
+
+    expect(cache.get(2)).toBeUndefined();
+    expect(cache.get(1)).toBe('a');
+    expect(cache.get(3)).toBe('c');
+    expect(cache.stats()).toMatchObject({ size: 2, evictions: 1 });
+  });
+
+  it('expires entries after the TTL', () => {
+    const cache = new LruCache<number, string>(10, 1000, clock);
+    cache.set(1, 'a');
+    now = 999;
+    expect(cache.get(1)).toBe('a');
+    now = 1000;
+    expect(cache.get(1)).toBeUndefined();
+    expect(cache.stats()).toMatchObject({ hits: 1, misses: 1, size: 0 });
+  });
+
+  it('does not cache misses', async () => {
+    const cache = new LruCache<number, string>(10, 1000, clock);
+    const load = jest.fn().mockResolvedValue(null);
+
+    await cache.getOrLoad(1, load);
+    await cache.getOrLoad(1, load);
+
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+
+  it('drops a load that raced with an invalidation', async () => {
+    const cache = new LruCache<number, string>(10, 1000, clock);
+    let finishLoad: (value: string) => void = () => {};
+    const pending = cache.getOrLoad(
+      1,
+      () => new Promise<string>((resolve) => (finishLoad = resolve)),
+    );
+
+    cache.delete(1);
+    finishLoad('stale');
+
+    await expect(pending).resolves.toBe('stale');
+    expect(cache.get(1)).toBeUndefined();
+  });
+
+  it('is a no-op when disabled', () => {
+    const cache = new LruCache<number, string>(0, 1000, clock);
+    cache.set(1, 'a');
+    expect(cache.get(1)).toBeUndefined();
+  });
+});
@@ -0,0 +1,111 @@
+export interface CacheStats {
+  size: number;
+  maxEntries: number;
+  ttlMs: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  invalidations: number;
+}
+
+interface Entry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * Bounded in-process LRU with a per-entry TTL. A Map keeps insertion
+ * order, so re-inserting on every hit makes the first key the least
+ * recently used one.
+ */
+export class LruCache<K, V> {
+  private readonly entries = new Map<K, Entry<V>>();
+  // bumped by every invalidation so in-flight loads know their result may be stale
+  private generation = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+  private invalidations = 0;
+
+  constructor(
+    readonly maxEntries: number,
+    readonly ttlMs: number,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  get enabled() {
+    return this.maxEntries > 0 && this.ttlMs > 0;
+  }
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expiresAt <= this.now()) {
+      if (entry) {
+        this.entries.delete(key);
+      }
+      this.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key: K, value: V) {
+    if (!this.enabled) {
+      return;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as K;
+      this.entries.delete(oldest);
+      this.evictions++;
+    }
+  }
+
+  delete(key: K) {
+    this.generation++;
+    this.invalidations++;
+    this.entries.delete(key);
+  }
+
+  clear() {
+    this.generation++;
+    this.entries.clear();
+  }
+
+  /**
+   * Read-through lookup. Missing results (null/undefined) are not cached,
+   * and a load that overlapped an invalidation is not stored, so a delete
+   * can never be undone by a slower concurrent read.
+   */
+  async getOrLoad(
+    key: K,
+    load: () => Promise<V | null | undefined>,
+  ): Promise<V | null | undefined> {
+    const cached = this.get(key);
+    if (cached !== undefined) {
+      return cached;
+    }
+    const generation = this.generation;
+    const value = await load();
+    if (value !== null && value !== undefined && generation === this.generation) {
+      this.set(key, value);
+    }
+    return value;
+  }
+
+  stats(): CacheStats {
+    return {
+      size: this.entries.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttlMs,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      invalidations: this.invalidations,
+    };
+  }
+}
@@ -0,0 +1,169 @@
+import { UnsupportedMediaTypeException } from '@nestjs/common';
+import type { NextFunction, Request, Response } from 'express';
+import { pipeline, type Readable, type Transform } from 'node:stream';
+import {
+  constants,
+  createBrotliCompress,
+  createBrotliDecompress,
+  createGunzip,
+  createGzip,
+} from 'node:zlib';
+
+// Quality 11 (the brotli default) is far too slow for per-request use
+const ENCODERS = {
+  br: () =>
+    createBrotliCompress({ params: { [constants.BROTLI_PARAM_QUALITY]: 4 } }),
+  gzip: () => createGzip(),
+};
+
+export type Encoding = keyof typeof ENCODERS;
+
+const DECODERS: Record<string, () => Transform> = {
+  br: createBrotliDecompress,
+  gzip: createGunzip,
+  'x-gzip': createGunzip,
+};
+
+const COMPRESSIBLE = /json|text\/|javascript|xml/i;
+// Events must reach the client as they are written, not when a block fills
+const NEVER_COMPRESS = /text\/event-stream/i;
+
+/** Picks the encoding with the highest q-value; ties go to the client's order */
+export function negotiateEncoding(header?: string): Encoding | undefined {
+  let best: Encoding | undefined;
+  let bestQuality = 0;
+  for (const part of (header ?? '').split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map((p) => p.trim()).find((p) => p.startsWith('q='));
+    const quality = q ? Number(q.slice(2)) : 1;
+    const names = name === '*' ? Object.keys(ENCODERS) : [name];
+    for (const candidate of names) {
+      if (candidate in ENCODERS && quality > bestQuality) {
+        best = candidate as Encoding;
+        bestQuality = quality;
+      }
+    }
+  }
+  return best;
+}
+
+/**
+ * A request body that is read as a stream, decoded according to its
+ * Content-Encoding. Decoding errors surface when the stream is read.
+ */
+export function requestBody(req: Request): Readable {
+  const encoding = (req.headers['content-encoding'] ?? 'identity')
+    .trim()
+    .toLowerCase();
+  if (encoding === 'identity') {
+    return req;
+  }
+  const decoder = DECODERS[encoding];
+  if (!decoder) {
+    throw new UnsupportedMediaTypeException(
+      `Unsupported Content-Encoding: ${encoding}`,
+    );
+  }
+  return pipeline(req, decoder(), () => {});
+}
+
+function byteLength(chunk: unknown, encoding?: BufferEncoding) {
+  if (chunk === undefined || chunk === null) {
+    return 0;
+  }
+  return Buffer.isBuffer(chunk)
+    ? chunk.length
+    : Buffer.byteLength(String(chunk), encoding);
+}
+
+function toBuffer(chunk: unknown, encoding?: BufferEncoding) {
+  return Buffer.isBuffer(chunk) ? chunk : Buffer.from(String(chunk), encoding);
+}
+
+/**
+ * gzip/brotli middleware. Whether to compress is decided on the first
+ * write: bodies below `threshold` bytes, non-text types and responses that
+ * already carry a Content-Encoding are passed through. Streamed bodies
+ * (NDJSON) are compressed chunk by chunk with backpressure, so nothing is
+ * buffered beyond zlib's window.
+ */
+export function compression(threshold = 1024) {
+  return (req: Request, res: Response, next: NextFunction) => {
+    const encoding = negotiateEncoding(req.headers['accept-encoding']);
+    res.vary('Accept-Encoding');
+    if (!encoding || req.method === 'HEAD') {
+      return next();
+    }
+
+    const write = res.write.bind(res) as (...args: any[]) => boolean;
+    const end = res.end.bind(res) as (...args: any[]) => Response;
+    let encoder: Transform | undefined;
+    let decided = false;
+
+    const decide = (chunk: unknown, enc: BufferEncoding | undefined, ending: boolean) => {
+      if (decided) {
+        return;
+      }
+      decided = true;
+      const type = String(res.getHeader('Content-Type') ?? '');
+      const length = ending ? byteLength(chunk, enc) : Infinity;
+      if (
+        res.headersSent ||
+        res.statusCode === 204 ||
+        res.statusCode === 304 ||
+        res.getHeader('Content-Encoding') ||
+        !COMPRESSIBLE.test(type) ||
+        NEVER_COMPRESS.test(type) ||
+        length < threshold
+      ) {
+        return;
+      }
+      res.setHeader('Content-Encoding', encoding);
+      res.removeHeader('Content-Length');
+      const stream = ENCODERS[encoding]();
+      stream.on('data', (data: Buffer) => {
+        if (!write(data)) {
+          stream.pause();
+        }
+      });
+      stream.on('end', () => end());
+      // the writer upstream (e.g. a piped NDJSON stream) waits on res 'drain'
+      stream.on('drain', () => res.emit('drain'));
+      res.on('drain', () => stream.resume());
+      encoder = stream;
+    };
+
+    res.write = ((chunk: unknown, enc?: any, cb?: any) => {
+      if (typeof enc === 'function') {
+        [cb, enc] = [enc, undefined];
+      }
+      decide(chunk, enc, false);
+      return encoder
+        ? encoder.write(toBuffer(chunk, enc), cb)
+        : write(chunk, enc, cb);
+    }) as Response['write'];
+
+    res.end = ((chunk?: unknown, enc?: any, cb?: any) => {
+      if (typeof chunk === 'function') {
+        [cb, chunk] = [chunk, undefined];
+      } else if (typeof enc === 'function') {
+        [cb, enc] = [enc, undefined];
+      }
+      decide(chunk, enc, true);
+      if (!encoder) {
+        return end(chunk, enc, cb);
+      }
+      if (cb) {
+        res.once('finish', cb);
+      }
+      if (chunk === undefined || chunk === null) {
+        encoder.end();
+      } else {
+        encoder.end(toBuffer(chunk, enc));
+      }
+      return res;
+    }) as Response['end'];
+
+    next();
+  };
+}
@@ -0,0 +1,35 @@
+import { Type } from 'class-transformer';
+import { IsDate, IsInt, IsOptional, IsString, Max, Min } from 'class-validator';
+
+export const DEFAULT_PAGE_SIZE = 100;
+export const MAX_PAGE_SIZE = 1000;
+
+export class ListQueryDto {
+  @IsOptional()
+  @Type(() => Number)
+  @IsInt()
+  @Min(1)
+  @Max(MAX_PAGE_SIZE)
+  limit?: number;
+
+  // ID of the last row of the previous page (the X-Next-Cursor header)
+  @IsOptional()
+  @Type(() => Number)
+  @IsInt()
+  cursor?: number;
+
+  // comma-separated field names, e.g. fields=id,title
+  @IsOptional()
+  @IsString()
+  fields?: string;
+
+  @IsOptional()
+  @Type(() => Date)
+  @IsDate()
+  createdAfter?: Date;
+
+  @IsOptional()
+  @Type(() => Date)
+  @IsDate()
+  createdBefore?: Date;
+}
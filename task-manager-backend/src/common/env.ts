@@ -0,0 +1,12 @@
+// Integer settings read from the environment; invalid values fail startup
+export function intFromEnv(name: string, fallback: number) {
+  const value = process.env[name];
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  const parsed = Number(value);
+  if (!Number.isInteger(parsed) || parsed < 0) {
+    throw new Error(`${name} must be a non-negative integer (got "${value}")`);
+  }
+  return parsed;
+}
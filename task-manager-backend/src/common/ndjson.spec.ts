@@ -0,0 +1,48 @@
+import { BadRequestException } from '@nestjs/common';
+import { Readable } from 'node:stream';
+import { MAX_NDJSON_LINE_LENGTH, parseNdjson } from './ndjson';
+
+async function collect(
+  chunks: Iterable<Buffer | string> | AsyncIterable<Buffer | string>,
+) {
+  const values: unknown[] = [];
+  for await (const { value } of parseNdjson(Readable.from(chunks))) {
+    values.push(value);
+  }
+  return values;
+}
+
+describe('parseNdjson', () => {
+  it('yields one value per line across chunk boundaries', async () => {
+    const body = Buffer.from('{"a":1}\n\n{"b":"é"}\r\n{"c":3}');
+    // splits the two bytes of "é" between chunks
+    const chunks = [body.subarray(0, 16), body.subarray(16)];
+
+    expect(await collect(chunks)).toEqual([{ a: 1 }, { b: 'é' }, { c: 3 }]);
+  });
+
+  it('reports the line of invalid JSON as a 400', async () => {
+    const parsing = collect(['{"a":1}\n{oops}\n']);
+
+    await expect(parsing).rejects.toBeInstanceOf(BadRequestException);
+    await expect(parsing).rejects.toThrow('Line 2');
+  });
+
+  it('rejects a line longer than the limit before it has all arrived', async () => {
+    let read = 0;
+    async function* endless() {
+      yield '{"a":1}\n';
+      while (read < 1000) {
+        read++;
+        yield 'x'.repeat(64 * 1024);
+      }
+    }
+    const parsing = collect(endless());
+
+    await expect(parsing).rejects.toBeInstanceOf(BadRequestException);
+    await expect(parsing).rejects.toThrow(
+      `Line 2 is longer than ${MAX_NDJSON_LINE_LENGTH} characters`,
+    );
+    expect(read).toBeLessThan(1000);
+  });
+});
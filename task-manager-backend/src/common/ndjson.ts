@@ -0,0 +1,118 @@
+import {
+  BadRequestException,
+  HttpException,
+  StreamableFile,
+} from '@nestjs/common';
+import type { Request } from 'express';
+import { Readable } from 'node:stream';
+import { StringDecoder } from 'node:string_decoder';
+import { MAX_PAGE_SIZE } from './dto/list-query.dto';
+import type { Page } from './pagination';
+
+export const NDJSON_CONTENT_TYPE = 'application/x-ndjson';
+
+// Rows fetched per query while streaming; one batch is held at a time
+export const STREAM_BATCH_SIZE = MAX_PAGE_SIZE;
+
+/** True when the client prefers NDJSON over a JSON array */
+export function wantsNdjson(req: Request) {
+  return req.accepts(['application/json', NDJSON_CONTENT_TYPE]) === NDJSON_CONTENT_TYPE;
+}
+
+/**
+ * Walks a keyset-paginated query from `cursor` to the end, yielding one
+ * page of rows at a time.
+ */
+export async function* pageBatches<T>(
+  fetchPage: (cursor: number | undefined) => Promise<Page<T>>,
+  cursor?: number,
+): AsyncGenerator<T[]> {
+  do {
+    const page = await fetchPage(cursor);
+    yield page.items;
+    cursor = page.nextCursor ?? undefined;
+  } while (cursor !== undefined);
+}
+
+async function* ndjsonLines<T>(batches: AsyncIterable<T[]>) {
+  for await (const rows of batches) {
+    if (rows.length) {
+      yield rows.map((row) => JSON.stringify(row)).join('\n') + '\n';
+    }
+  }
+}
+
+/**
+ * One JSON document per line, written as batches arrive from the database.
+ * With a `filename` the response is sent as a download.
+ */
+export function ndjson<T>(batches: AsyncIterable<T[]>, filename?: string) {
+  return new StreamableFile(Readable.from(ndjsonLines(batches)), {
+    type: NDJSON_CONTENT_TYPE,
+    disposition: filename ? `attachment; filename="${filename}"` : undefined,
+  });
+}
+
+// Longest line parseNdjson accepts: the JSON body parser's default 100kb
+// limit, counted in characters
+export const MAX_NDJSON_LINE_LENGTH = 100 * 1024;
+
+export interface NdjsonLine {
+  line: number;
+  value: unknown;
+}
+
+/**
+ * Parses an NDJSON body one line at a time. The source is only read as
+ * fast as lines are consumed, so memory stays at about one chunk plus one
+ * line of at most MAX_NDJSON_LINE_LENGTH. Blank lines are skipped; longer
+ * lines, invalid JSON and unreadable bodies are 400s.
+ */
+export async function* parseNdjson(
+  source: AsyncIterable<Buffer | string>,
+): AsyncGenerator<NdjsonLine> {
+  const decoder = new StringDecoder('utf8');
+  let line = 0;
+  const tooLong = (number: number) =>
+    new BadRequestException(
+      `Line ${number} is longer than ${MAX_NDJSON_LINE_LENGTH} characters`,
+    );
+  const parse = (text: string) => {
+    line++;
+    if (text.length > MAX_NDJSON_LINE_LENGTH) {
+      throw tooLong(line);
+    }
+    if (!text.trim()) {
+      return [];
+    }
+    try {
+      return [{ line, value: JSON.parse(text) as unknown }];
+    } catch {
+      throw new BadRequestException(`Line ${line} is not valid JSON`);
+    }
+  };
+
+  let partial = '';
+  try {
+    for await (const chunk of source) {
+      const decoded = typeof chunk === 'string' ? chunk : decoder.write(chunk);
+      const lines = (partial + decoded).split('\n');
+      partial = lines.pop()!;
+      for (const text of lines) {
+        yield* parse(text);
+      }
+      if (partial.length > MAX_NDJSON_LINE_LENGTH) {
+        throw tooLong(line + 1);
+      }
+    }
+  } catch (error) {
+    if (error instanceof HttpException) {
+      throw error;
+    }
+    // e.g. a corrupt gzip body
+    throw new BadRequestException(
+      `Could not read the request body: ${(error as Error).message}`,
+    );
+  }
+  yield* parse(partial + decoder.end());
+}
@@ -0,0 +1,82 @@
+import { BadRequestException, ValidationPipe } from '@nestjs/common';
+import type { Response } from 'express';
+import { DEFAULT_PAGE_SIZE, ListQueryDto } from './dto/list-query.dto';
+
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+// The global pipe only validates; list queries also need numbers/dates converted
+export const listQueryPipe = new ValidationPipe({ transform: true });
+
+// Cursors are the last row's ID, or another key for orders other than ID
+export interface Page<T, C = number> {
+  items: T[];
+  nextCursor: C | null;
+}
+
+/**
+ * Keyset window for a list query. One extra row is fetched so we know
+ * whether another page exists without running a COUNT.
+ */
+export function pageWindow(query: ListQueryDto) {
+  const limit = query.limit ?? DEFAULT_PAGE_SIZE;
+  return {
+    limit,
+    take: limit + 1,
+    after: query.cursor === undefined ? undefined : { gt: query.cursor },
+  };
+}
+
+export function toPage<T, C = number>(
+  rows: T[],
+  limit: number,
+  cursorOf: (row: T) => C,
+): Page<T, C> {
+  const hasMore = rows.length > limit;
+  const items = hasMore ? rows.slice(0, limit) : rows;
+  return {
+    items,
+    nextCursor: hasMore ? cursorOf(items[items.length - 1]) : null,
+  };
+}
+
+export function dateRange(query: ListQueryDto) {
+  if (!query.createdAfter && !query.createdBefore) {
+    return undefined;
+  }
+  return { gte: query.createdAfter, lt: query.createdBefore };
+}
+
+/**
+ * Turns `fields=a,b` into a Prisma select. The cursor key is always
+ * selected so the next page can be computed.
+ */
+export function selectFields<F extends string>(
+  fields: string | undefined,
+  allowed: readonly F[],
+  key: F,
+): Record<F, true> | undefined {
+  if (!fields) {
+    return undefined;
+  }
+  const requested = fields
+    .split(',')
+    .map((f) => f.trim())
+    .filter(Boolean);
+  const unknown = requested.filter((f) => !allowed.includes(f as F));
+  if (unknown.length) {
+    throw new BadRequestException(
+      `Unknown fields: ${unknown.join(', ')}. Allowed: ${allowed.join(', ')}`,
+    );
+  }
+  return Object.fromEntries(
+    [key, ...requested].map((f) => [f, true]),
+  ) as Record<F, true>;
+}
+
+/** Sets the next-page header and returns the rows as the response body */
+export function sendPage<T, C>(res: Response, page: Page<T, C>): T[] {
+  if (page.nextCursor !== null) {
+    res.setHeader(NEXT_CURSOR_HEADER, String(page.nextCursor));
+  }
+  return page.items;
+}
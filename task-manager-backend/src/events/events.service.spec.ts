@@ -0,0 +1,56 @@
+import { EventsService } from './events.service';
+import { RingBuffer } from './ring-buffer';
+
+describe('RingBuffer', () => {
+  it('keeps the newest items in order once full', () => {
+    const buffer = new RingBuffer<number>(3);
+    [1, 2, 3, 4, 5].forEach((n) => buffer.push(n));
+
+    expect([...buffer]).toEqual([3, 4, 5]);
+    expect(buffer.oldest()).toBe(3);
+    expect(buffer.size).toBe(3);
+  });
+});
+
+describe('EventsService', () => {
+  let events: EventsService;
+
+  beforeEach(() => {
+    process.env.EVENTS_BUFFER_SIZE = '3';
+    events = new EventsService();
+  });
+
+  afterEach(() => {
+    delete process.env.EVENTS_BUFFER_SIZE;
+  });
+
+  it('delivers new events to subscribers of the group only', () => {
+    const seen: string[] = [];
+    const unsubscribe = events.subscribe(1, (event) => seen.push(event.type));
+    events.publish(1, 'task.created', {});
+    events.publish(2, 'task.created', {});
+    unsubscribe();
+    events.publish(1, 'task.deleted', {});
+
+    expect(seen).toEqual(['task.created']);
+  });
+
+  it("replays the group's events after the last event ID", () => {
+    const first = events.publish(1, 'task.created', {});
+    events.publish(2, 'task.created', {});
+    const third = events.publish(1, 'task.completed', {});
+
+    expect(events.replay(1, first.id)).toEqual([third]);
+    expect(events.replay(1, third.id)).toEqual([]);
+  });
+
+  it('reports a gap once the events after the ID were overwritten', () => {
+    const first = events.publish(1, 'task.created', {});
+    for (let i = 0; i < 4; i++) {
+      events.publish(1, 'task.updated', {});
+    }
+
+    expect(events.replay(1, first.id)).toBeNull();
+    expect(events.replay(1, 'oldboot-1')).toBeNull();
+  });
+});
@@ -0,0 +1,91 @@
+import { Injectable } from '@nestjs/common';
+import { EventEmitter } from 'events';
+import { intFromEnv } from '../common/env';
+import { RingBuffer } from './ring-buffer';
+
+export type ChangeType =
+  | 'task.created'
+  | 'task.updated'
+  | 'task.completed'
+  | 'task.deleted'
+  | 'tasks.created'
+  | 'tasks.updated'
+  | 'tasks.completed'
+  | 'member.added'
+  | 'member.removed'
+  | 'members.updated'
+  | 'group.deleted';
+
+export interface ChangeEvent {
+  id: string;
+  seq: number;
+  type: ChangeType;
+  groupId: number;
+  at: string;
+  data: unknown;
+}
+
+/**
+ * In-process change feed. Services publish after their write commits;
+ * every event gets a sequence number and is kept in one ring buffer of
+ * EVENTS_BUFFER_SIZE events shared by all groups, so a reconnecting
+ * subscriber can replay what it missed. Event IDs carry a boot ID, so an
+ * ID from before a restart is recognised as a gap.
+ */
+@Injectable()
+export class EventsService {
+  readonly bootId = Date.now().toString(36);
+  private readonly buffer = new RingBuffer<ChangeEvent>(
+    intFromEnv('EVENTS_BUFFER_SIZE', 10000),
+  );
+  private readonly emitter = new EventEmitter().setMaxListeners(0);
+  private seq = 0;
+
+  /** ID of the newest event, for streams that start without replay */
+  lastEventId() {
+    return `${this.bootId}-${this.seq}`;
+  }
+
+  publish(groupId: number, type: ChangeType, data: unknown) {
+    const seq = ++this.seq;
+    const event: ChangeEvent = {
+      id: `${this.bootId}-${seq}`,
+      seq,
+      type,
+      groupId,
+      at: new Date().toISOString(),
+      data,
+    };
+    this.buffer.push(event);
+    this.emitter.emit(String(groupId), event);
+    return event;
+  }
+
+  /**
+   * The group's events after `lastEventId`, or `null` when some events
+   * after it are no longer buffered (or it comes from another boot) and
+   * the subscriber has to refetch instead.
+   */
+  replay(groupId: number, lastEventId: string): ChangeEvent[] | null {
+    const match = /^([0-9a-z]+)-(\d+)$/.exec(lastEventId);
+    if (!match || match[1] !== this.bootId || Number(match[2]) > this.seq) {
+      return null;
+    }
+    const after = Number(match[2]);
+    const oldest = this.buffer.oldest()?.seq ?? this.seq + 1;
+    if (after < this.seq && oldest > after + 1) {
+      return null;
+    }
+    return [...this.buffer].filter(
+      (event) => event.seq > after && event.groupId === groupId,
+    );
+  }
+
+  /** Calls `listener` for each new event in the group; returns the unsubscribe function */
+  subscribe(groupId: number, listener: (event: ChangeEvent) => void) {
+    this.emitter.on(String(groupId), listener);
+    return () => {
+      this.emitter.off(String(groupId), listener);
+    };
+  }
+}
@@ -0,0 +1,37 @@
+/** Fixed-capacity FIFO; pushing onto a full buffer overwrites the oldest item */
+export class RingBuffer<T> {
+  private readonly items: (T | undefined)[];
+  private start = 0;
+  private count = 0;
+
+  constructor(readonly capacity: number) {
+    this.items = new Array<T | undefined>(Math.max(capacity, 0));
+  }
+
+  get size() {
+    return this.count;
+  }
+
+  push(item: T) {
+    if (this.capacity === 0) {
+      return;
+    }
+    if (this.count < this.capacity) {
+      this.items[(this.start + this.count) % this.capacity] = item;
+      this.count++;
+    } else {
+      this.items[this.start] = item;
+      this.start = (this.start + 1) % this.capacity;
+    }
+  }
+
+  oldest(): T | undefined {
+    return this.count ? this.items[this.start] : undefined;
+  }
+
+  *[Symbol.iterator](): IterableIterator<T> {
+    for (let i = 0; i < this.count; i++) {
+      yield this.items[(this.start + i) % this.capacity] as T;
+    }
+  }
+}
@@ -0,0 +1,91 @@
+import type { Request, Response } from 'express';
+import { createServer, get, Server, ServerResponse } from 'node:http';
+import { AddressInfo, connect, Socket } from 'node:net';
+import { EventsService } from './events.service';
+import { SSE_HEARTBEAT_MS, streamEvents } from './sse';
+
+describe('streamEvents', () => {
+  let server: Server;
+  let port: number;
+  let events: EventsService;
+  let streams: ServerResponse[];
+  let reader: Socket;
+
+  beforeEach(async () => {
+    // Only the heartbeat interval is faked; sockets need real timers
+    jest.useFakeTimers({
+      doNotFake: ['nextTick', 'setImmediate', 'setTimeout', 'clearTimeout', 'Date'],
+    });
+    events = new EventsService();
+    streams = [];
+    server = createServer((req, res) => {
+      streams.push(res);
+      streamEvents(
+        req as unknown as Request,
+        res as unknown as Response,
+        events,
+        1,
+      );
+    });
+    await new Promise<void>((resolve) => server.listen(0, resolve));
+    port = (server.address() as AddressInfo).port;
+  });
+
+  afterEach(async () => {
+    reader?.destroy();
+    streams.forEach((res) => res.destroy());
+    await new Promise((resolve) => server.close(resolve));
+    jest.useRealTimers();
+  });
+
+  it('drops a client that stops reading without taking the server down', async () => {
+    // Connects and never reads, so the response buffer fills up
+    reader = connect(port);
+    reader.pause();
+    reader.write('GET /groups/1/events HTTP/1.1\r\nHost: localhost\r\n\r\n');
+    while (!streams.length) {
+      await new Promise((resolve) => setTimeout(resolve, 5));
+    }
+    const slow = streams[0];
+    const errors: Error[] = [];
+    slow.on('error', (error) => errors.push(error));
+
+    const payload = 'x'.repeat(64 * 1024);
+    for (let i = 0; i < 1000 && !slow.destroyed; i++) {
+      events.publish(1, 'task.updated', { payload });
+      await new Promise((resolve) => setImmediate(resolve));
+    }
+    expect(slow.destroyed).toBe(true);
+
+    // Both used to write to the ended response: an unhandled
+    // ERR_STREAM_WRITE_AFTER_END that crashed the process
+    events.publish(1, 'task.updated', {});
+    jest.advanceTimersByTime(SSE_HEARTBEAT_MS);
+    await new Promise((resolve) => setTimeout(resolve, 20));
+    expect(errors).toEqual([]);
+
+    const status = await new Promise<number | undefined>((resolve, reject) => {
+      get(`http://localhost:${port}/groups/1/events`, (res) => {
+        resolve(res.statusCode);
+        res.destroy();
+      }).on('error', reject);
+    });
+    expect(status).toBe(200);
+  });
+
+  it('ends the stream after the group is deleted', async () => {
+    const body = await new Promise<string>((resolve, reject) => {
+      get(`http://localhost:${port}/groups/1/events`, (res) => {
+        let text = '';
+        res.setEncoding('utf8');
+        res.on('data', (chunk: string) => (text += chunk));
+        res.on('end', () => resolve(text));
+        // Published once the stream is open; 'end' only comes if it is closed
+        setImmediate(() => events.publish(1, 'group.deleted', { id: 1 }));
+      }).on('error', reject);
+    });
+
+    expect(body).toContain('event: group.deleted');
+    expect(streams[0].writableEnded).toBe(true);
+  });
+});
@@ -0,0 +1,76 @@
+import type { Request, Response } from 'express';
+import { ChangeEvent, EventsService } from './events.service';
+
+export const SSE_HEARTBEAT_MS = 15_000;
+// A client this far behind is dropped; it reconnects and replays from Last-Event-ID
+const MAX_BUFFERED_BYTES = 1 << 20;
+
+export function formatEvent(event: ChangeEvent) {
+  return `id: ${event.id}\nevent: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`;
+}
+
+/**
+ * Streams a group's change events as text/event-stream until the client
+ * goes away or the group is deleted. With a Last-Event-ID, missed events are replayed first; if
+ * they are no longer buffered a `reset` event tells the client to refetch
+ * its lists. Replay and subscription happen in the same tick, so no event
+ * is lost or sent twice in between.
+ */
+export function streamEvents(
+  req: Request,
+  res: Response,
+  events: EventsService,
+  groupId: number,
+  lastEventId?: string,
+) {
+  res.setHeader('Content-Type', 'text/event-stream');
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Connection', 'keep-alive');
+  res.setHeader('X-Accel-Buffering', 'no');
+  res.flushHeaders();
+
+  let closed = false;
+  let unsubscribe = () => {};
+  let heartbeat: NodeJS.Timeout | undefined;
+  const close = () => {
+    if (!closed) {
+      closed = true;
+      clearInterval(heartbeat);
+      unsubscribe();
+    }
+  };
+  // A write after the stream ended would emit an unhandled 'error'
+  const write = (chunk: string) => {
+    if (!closed && !res.writableEnded && !res.destroyed) {
+      res.write(chunk);
+    }
+  };
+  const send = (event: ChangeEvent) => {
+    if (res.writableLength > MAX_BUFFERED_BYTES) {
+      close();
+      res.destroy();
+      return;
+    }
+    write(formatEvent(event));
+    // Nothing follows a deletion; a reconnect gets the group's 404
+    if (event.type === 'group.deleted') {
+      close();
+      res.end();
+    }
+  };
+
+  write('retry: 3000\n\n');
+  const missed = lastEventId ? events.replay(groupId, lastEventId) : [];
+  if (missed === null) {
+    write(`id: ${events.lastEventId()}\nevent: reset\ndata: {}\n\n`);
+  } else {
+    missed.forEach(send);
+  }
+  if (closed) {
+    return;
+  }
+  unsubscribe = events.subscribe(groupId, send);
+  heartbeat = setInterval(() => write(': ping\n\n'), SSE_HEARTBEAT_MS);
+  req.on('close', close);
+  res.on('close', close);
+}
@@ -0,0 +1,18 @@
+import { ArrayMaxSize, IsArray, IsInt, IsOptional } from "class-validator";
+
+export const MAX_BULK_MEMBERS = 10000;
+
+// At least one of add/remove must be non-empty (checked in the service)
+export class BulkMembersDto {
+    @IsOptional()
+    @IsArray()
+    @ArrayMaxSize(MAX_BULK_MEMBERS)
+    @IsInt({ each: true })
+    add?: number[];
+
+    @IsOptional()
+    @IsArray()
+    @ArrayMaxSize(MAX_BULK_MEMBERS)
+    @IsInt({ each: true })
+    remove?: number[];
+}
@@ -1,15 +1,24 @@
-import { Controller , Get, Post, Delete , Param, Body} from "@nestjs/common";
+import { Controller , Get, Post, Delete , Param, Body, Query, Req, Res, HttpCode, Headers, UseInterceptors} from "@nestjs/common";
+import type { Request, Response } from "express";
 import {GroupsService} from "./groups.service"
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { listQueryPipe, sendPage } from "src/common/pagination";
+import { ndjson, wantsNdjson } from "src/common/ndjson";
 import { CreateGroupDto } from "./dto/create-group.dto";
 import { AddMemberDto } from "./dto/add-member.dto";
+import { BulkMembersDto } from "./dto/bulk-members.dto";
+import { EventsService } from "src/events/events.service";
+import { streamEvents } from "src/events/sse";
+import { IdempotencyInterceptor } from "src/idempotency/idempotency.interceptor";
 @Controller('groups') 
 export class GroupsController{
     constructor(
-        private groupsService: GroupsService
+        private groupsService: GroupsService,
+        private events: EventsService
     ){}
     @Get()
-    getAllGroups(){
-        return this.groupsService.getAllGroups()
+    async getAllGroups(@Query(listQueryPipe) query: ListQueryDto, @Res({ passthrough: true }) res: Response){
+        return sendPage(res, await this.groupsService.getAllGroups(query))
     }
 
     @Get(':id')
@@ -20,6 +29,7 @@ export class GroupsController{
     }
 
     @Post()
+    @UseInterceptors(IdempotencyInterceptor)
     createGroup(@Body() data: CreateGroupDto) {
         return this.groupsService.createGroup(data)
     }
@@ -32,16 +42,41 @@ export class GroupsController{
         return this.groupsService.deleteGroup(groupID)
     }
 
+    @Post(':id/members/bulk')
+    @HttpCode(200)
+    updateMembers(@Param('id') groupid: string, @Body() body: BulkMembersDto) {
+        return this.groupsService.updateMembers(parseInt(groupid), body)
+    }
+
     @Post(':id/members')
+    @UseInterceptors(IdempotencyInterceptor)
     addMember(@Param('id') groupid: string, @Body() userData: AddMemberDto) {
         const groupID = parseInt(groupid)
         return this.groupsService.addMember(groupID, userData)
     }
 
     @Get(':id/members') 
-    getMembers(@Param('id') id : string){
+    async getMembers(@Param('id') id : string, @Query(listQueryPipe) query: ListQueryDto, @Req() req: Request, @Res({ passthrough: true }) res: Response){
         const groupID  = parseInt(id) 
-        return this.groupsService.getMembers(groupID)
+        if (wantsNdjson(req)) {
+            return ndjson(await this.groupsService.streamMembers(groupID, query))
+        }
+        return sendPage(res, await this.groupsService.getMembers(groupID, query))
+    }
+
+    // Server-sent change feed; EventSource resends Last-Event-ID on reconnect,
+    // ?lastEventId= lets a fresh connection resume too
+    @Get(':id/events')
+    async getEvents(
+        @Param('id') id: string,
+        @Headers('last-event-id') lastEventId: string | undefined,
+        @Query('lastEventId') resumeFrom: string | undefined,
+        @Req() req: Request,
+        @Res() res: Response
+    ) {
+        const groupID = parseInt(id)
+        await this.groupsService.getById(groupID)
+        streamEvents(req, res, this.events, groupID, lastEventId ?? resumeFrom)
     }
 
     @Delete(':id/members/:userId')
@@ -1,24 +1,57 @@
-import {Injectable, NotFoundException } from "@nestjs/common";
+import {BadRequestException, Injectable, NotFoundException } from "@nestjs/common";
 import { PrismaService } from "src/prisma/prisma.service";
 import { CreateGroupDto } from "./dto/create-group.dto";
 import { AddMemberDto } from "./dto/add-member.dto";
+import { BulkMembersDto } from "./dto/bulk-members.dto";
 import { UsersService } from "src/users/users.service";
+import { isForeignKeyViolation, isRecordNotFound, orNotFound } from "src/prisma/prisma-errors";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { dateRange, pageWindow, selectFields, toPage } from "src/common/pagination";
+import { pageBatches, STREAM_BATCH_SIZE } from "src/common/ndjson";
+import { USER_FIELDS } from "src/users/users.service";
+import { CacheService } from "src/cache/cache.service";
+import { LruCache } from "src/cache/lru-cache";
+import type { Group } from "@prisma/client";
+import { VersionsService } from "src/versions/versions.service";
+import { EventsService } from "src/events/events.service";
+import { BULK_TRANSACTION_OPTIONS } from "src/prisma/transactions";
+
+export const GROUP_FIELDS = ['id', 'name', 'description', 'createdAt'] as const;
 
 @Injectable() 
 export class GroupsService {
+    private readonly groups: LruCache<number, Group>;
+
     constructor(
         private prisma : PrismaService,
-        private userService : UsersService
-    ){}
+        private userService : UsersService,
+        private versions : VersionsService,
+        private events : EventsService,
+        cacheService : CacheService
+    ){
+        this.groups = cacheService.cache('groups')
+    }
 
-    async getAllGroups () {
-        return this.prisma.group.findMany()
+    async getAllGroups (query: ListQueryDto) {
+        const { limit, take, after } = pageWindow(query)
+        const groups = await this.prisma.group.findMany({
+            where: {
+                id: after,
+                createdAt: dateRange(query)
+            },
+            select: selectFields(query.fields, GROUP_FIELDS, 'id'),
+            orderBy: { id: 'asc' },
+            take
+        })
+
+        return toPage(groups, limit, (group) => group.id)
     }
 
+    // Read-through: every task and member route checks its group here
     async getById(id: number) {
-        const group = await this.prisma.group.findUnique({
+        const group = await this.groups.getOrLoad(id, () => this.prisma.group.findUnique({
             where: {id}
-        })
+        }))
         if (!group) {
             throw new NotFoundException(`Group with ID ${id} not found!`);
         }
@@ -35,47 +68,149 @@ export class GroupsService {
     }
 
     async deleteGroup(id: number) {
-        await this.getById(id);
-
-        return this.prisma.group.delete({
+        const group = await orNotFound(this.prisma.group.delete({
             where:{id}
-        })
+        }), `Group with ID ${id} not found!`)
+        this.groups.delete(id)
+        this.versions.touchGroups('group', id)
+        this.events.publish(id, 'group.deleted', group)
+
+        return group
     }
 
     async addMember(groupID: number, userData: AddMemberDto) {
+        try {
+            const member = await this.prisma.userGroup.create({
+                data:{
+                    groupId: groupID,
+                    userId : userData.userId
+                }
+            })
+            this.versions.touchGroups('members', groupID)
+            this.events.publish(groupID, 'member.added', member)
+            return member
+        } catch (error) {
+            if (isForeignKeyViolation(error)) {
+                // only on the failure path: find out which parent is missing
+                await this.getById(groupID)
+                await this.userService.getById(userData.userId)
+            }
+            throw error
+        }
+    }
+
+    // One IN query validates every user and existing memberships are read, then
+    // the rest inserted/removed, all in a single transaction. Unknown users and
+    // no-op changes are reported per ID instead of failing the request.
+    async updateMembers(groupID: number, { add = [], remove = [] }: BulkMembersDto) {
+        const toAdd = [...new Set(add)]
+        const toRemove = [...new Set(remove)]
+        if (!toAdd.length && !toRemove.length) {
+            throw new BadRequestException('Provide user IDs to add and/or remove')
+        }
         await this.getById(groupID)
-        const user = await this.userService.getById(userData.userId)
 
-        return this.prisma.userGroup.create({
-            data:{
-                groupId: groupID,
-                userId : user.id
+        const { known, existing, removed } = await this.prisma.$transaction(async (tx) => {
+            const known = new Set((await tx.user.findMany({
+                where: { id: { in: toAdd } },
+                select: { id: true }
+            })).map((user) => user.id))
+            const current = await tx.userGroup.findMany({
+                where: { groupId: groupID, userId: { in: [...toAdd, ...toRemove] } },
+                select: { userId: true }
+            })
+            const existing = new Set(current.map((member) => member.userId))
+            await tx.userGroup.createMany({
+                data: toAdd
+                    .filter((userId) => known.has(userId) && !existing.has(userId))
+                    .map((userId) => ({ groupId: groupID, userId }))
+            })
+            const removed = toRemove.filter((userId) => existing.has(userId))
+            await tx.userGroup.deleteMany({
+                where: { groupId: groupID, userId: { in: removed } }
+            })
+            return { known, existing, removed: new Set(removed) }
+        }, BULK_TRANSACTION_OPTIONS).catch(async (error) => {
+            if (isForeignKeyViolation(error)) {
+                // the group was deleted after the check above
+                await this.getById(groupID)
             }
+            throw error
         })
+
+        const results = [
+            ...toAdd.map((userId) => ({
+                userId,
+                action: 'add',
+                status: !known.has(userId) ? 'user_not_found' : existing.has(userId) ? 'already_member' : 'added'
+            })),
+            ...toRemove.map((userId) => ({
+                userId,
+                action: 'remove',
+                status: removed.has(userId) ? 'removed' : 'not_member'
+            }))
+        ]
+        const added = results.filter((r) => r.status === 'added').map((r) => r.userId)
+        if (added.length || removed.size) {
+            this.versions.touchGroups('members', groupID)
+            this.events.publish(groupID, 'members.updated', { added, removed: [...removed] })
+        }
+
+        return { added: added.length, removed: removed.size, results }
     }
 
-    async getMembers (id : number) {
+    // Pages by userId within the group; `fields` projects the nested user
+    async getMembers (id : number, query: ListQueryDto) {
         await this.getById(id)
-        
-        return this.prisma.userGroup.findMany({
-            where: {groupId : id},
+
+        return this.pageMembers(id, query)
+    }
+
+    async streamMembers (id : number, query: ListQueryDto) {
+        await this.getById(id)
+
+        return pageBatches((cursor) => this.pageMembers(id, { ...query, cursor, limit: STREAM_BATCH_SIZE }), query.cursor)
+    }
+
+    private async pageMembers (id : number, query: ListQueryDto) {
+        const { limit, take, after } = pageWindow(query)
+        const userSelect = selectFields(query.fields, USER_FIELDS, 'id')
+        const members = await this.prisma.userGroup.findMany({
+            where: {
+                groupId : id,
+                userId: after,
+                joinedAt: dateRange(query)
+            },
             include : {
-                user: true
-            }
+                user: userSelect ? { select: userSelect } : true
+            },
+            orderBy: { userId: 'asc' },
+            take
         })
+
+        return toPage(members, limit, (member) => member.userId)
     }
 
     async deleteMember(groupID: number , userID :number) {
-        const group = await this.getById(groupID)
-        const user  = await this.userService.getById(userID)
-
-        return this.prisma.userGroup.delete ({
-            where: {
-                userId_groupId: {
-                    userId: userID,
-                    groupId: groupID
+        try {
+            const member = await this.prisma.userGroup.delete ({
+                where: {
+                    userId_groupId: {
+                        userId: userID,
+                        groupId: groupID
+                    }
                 }
+            })
+            this.versions.touchGroups('members', groupID)
+            this.events.publish(groupID, 'member.removed', member)
+            return member
+        } catch (error) {
+            if (isRecordNotFound(error)) {
+                await this.getById(groupID)
+                await this.userService.getById(userID)
+                throw new NotFoundException(`User with id ${userID} is not a member of group ${groupID}!`)
             }
-        })
+            throw error
+        }
     }
 }
\ No newline at end of file
@@ -0,0 +1,12 @@
+import { Controller, Get } from '@nestjs/common';
+import { IdempotencyService } from './idempotency.service';
+
+@Controller('idempotency')
+export class IdempotencyController {
+  constructor(private readonly idempotency: IdempotencyService) {}
+
+  @Get('stats')
+  getStats() {
+    return this.idempotency.stats();
+  }
+}
@@ -0,0 +1,54 @@
+import {
+  CallHandler,
+  ExecutionContext,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { from, lastValueFrom, map } from 'rxjs';
+import { clientId } from '../admission/client-id';
+import {
+  IDEMPOTENCY_KEY_HEADER,
+  IdempotencyService,
+  requestFingerprint,
+} from './idempotency.service';
+
+export const IDEMPOTENT_REPLAYED_HEADER = 'Idempotent-Replayed';
+
+/**
+ * Applied to create routes with @UseInterceptors. Requests without an
+ * Idempotency-Key pass straight through. Keys are scoped to the client,
+ * method and path, so one client cannot replay another client's response
+ * and a key can be reused across different resources.
+ */
+@Injectable()
+export class IdempotencyInterceptor implements NestInterceptor {
+  constructor(private readonly idempotency: IdempotencyService) {}
+
+  intercept(context: ExecutionContext, next: CallHandler) {
+    const http = context.switchToHttp();
+    const req = http.getRequest<Request>();
+    const key = req.header(IDEMPOTENCY_KEY_HEADER);
+    if (key === undefined || !this.idempotency.enabled) {
+      return next.handle();
+    }
+
+    const res = http.getResponse<Response>();
+    const result = this.idempotency.run(
+      `${clientId(req)} ${req.method} ${req.path}`,
+      key,
+      requestFingerprint(req.body),
+      () => lastValueFrom(next.handle()),
+    );
+    // The status code is set by Nest after this returns, so a replay gets
+    // the same status as the original response
+    return from(result).pipe(
+      map(({ body, replayed }) => {
+        if (replayed) {
+          res.setHeader(IDEMPOTENT_REPLAYED_HEADER, 'true');
+        }
+        return body;
+      }),
+    );
+  }
+}
@@ -0,0 +1,12 @@
+import { Global, Module } from '@nestjs/common';
+import { IdempotencyController } from './idempotency.controller';
+import { IdempotencyInterceptor } from './idempotency.interceptor';
+import { IdempotencyService } from './idempotency.service';
+
+@Global()
+@Module({
+  controllers: [IdempotencyController],
+  providers: [IdempotencyService, IdempotencyInterceptor],
+  exports: [IdempotencyService, IdempotencyInterceptor],
+})
+export class IdempotencyModule {}
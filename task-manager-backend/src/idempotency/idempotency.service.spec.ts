@@ -0,0 +1,63 @@
+import {
+  BadRequestException,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { IdempotencyService, requestFingerprint } from './idempotency.service';
+
+describe('IdempotencyService', () => {
+  const scope = 'POST /groups/1/tasks';
+  const body = requestFingerprint({ title: 'Milk' });
+  let service: IdempotencyService;
+  let executions: number;
+  const execute = () => {
+    executions++;
+    return Promise.resolve({ id: executions });
+  };
+
+  beforeEach(() => {
+    service = new IdempotencyService();
+    executions = 0;
+  });
+
+  it('replays the stored response for a repeated key', async () => {
+    const first = await service.run(scope, 'k1', body, execute);
+    const retry = await service.run(scope, 'k1', body, execute);
+
+    expect(first).toEqual({ body: { id: 1 }, replayed: false });
+    expect(retry).toEqual({ body: { id: 1 }, replayed: true });
+    expect(executions).toBe(1);
+    expect(service.stats()).toMatchObject({ stored: 1, replayed: 1 });
+  });
+
+  it('lets concurrent retries wait for the running request', async () => {
+    const results = await Promise.all(
+      [1, 2, 3].map(() => service.run(scope, 'k1', body, execute)),
+    );
+
+    expect(results.map((r) => r.body)).toEqual([{ id: 1 }, { id: 1 }, { id: 1 }]);
+    expect(executions).toBe(1);
+    expect(service.stats()).toMatchObject({ joined: 2, inFlight: 0 });
+  });
+
+  it('scopes keys by route and rejects a reused key with another body', async () => {
+    await service.run(scope, 'k1', body, execute);
+    await service.run('POST /groups/2/tasks', 'k1', body, execute);
+    expect(executions).toBe(2);
+
+    const other = requestFingerprint({ title: 'Eggs' });
+    await expect(service.run(scope, 'k1', other, execute)).rejects.toBeInstanceOf(
+      UnprocessableEntityException,
+    );
+    await expect(service.run(scope, '', body, execute)).rejects.toBeInstanceOf(
+      BadRequestException,
+    );
+  });
+
+  it('does not store failures, so the request can be retried', async () => {
+    const failing = () => Promise.reject(new Error('database is locked'));
+    await expect(service.run(scope, 'k1', body, failing)).rejects.toThrow('locked');
+
+    const retry = await service.run(scope, 'k1', body, execute);
+    expect(retry).toEqual({ body: { id: 1 }, replayed: false });
+  });
+});
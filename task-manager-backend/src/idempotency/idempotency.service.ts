@@ -0,0 +1,118 @@
+import {
+  BadRequestException,
+  Injectable,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { createHash } from 'node:crypto';
+import { intFromEnv } from '../common/env';
+import { CacheStats, LruCache } from '../cache/lru-cache';
+
+export const IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key';
+export const MAX_IDEMPOTENCY_KEY_LENGTH = 255;
+
+interface StoredResponse {
+  fingerprint: string;
+  body: unknown;
+}
+
+interface RunningRequest {
+  fingerprint: string;
+  result: Promise<unknown>;
+}
+
+export interface IdempotentResult {
+  body: unknown;
+  replayed: boolean;
+}
+
+export interface IdempotencyStats extends CacheStats {
+  inFlight: number;
+  stored: number;
+  replayed: number;
+  joined: number;
+  mismatched: number;
+}
+
+export function requestFingerprint(body: unknown) {
+  return createHash('sha1')
+    .update(JSON.stringify(body ?? null))
+    .digest('base64url');
+}
+
+/**
+ * Remembers the response of every successful request sent with an
+ * Idempotency-Key, in a bounded LRU (IDEMPOTENCY_MAX_KEYS) for
+ * IDEMPOTENCY_TTL_MS. A retry with the same key and body gets the stored
+ * response without reaching the handler; a retry that arrives while the
+ * first request is still running waits for it. Failed requests are not
+ * stored, so they can be retried. Setting either variable to 0 disables it.
+ */
+@Injectable()
+export class IdempotencyService {
+  private readonly responses = new LruCache<string, StoredResponse>(
+    intFromEnv('IDEMPOTENCY_MAX_KEYS', 10000),
+    intFromEnv('IDEMPOTENCY_TTL_MS', 3_600_000),
+  );
+  private readonly running = new Map<string, RunningRequest>();
+  private counters = { stored: 0, replayed: 0, joined: 0, mismatched: 0 };
+
+  get enabled() {
+    return this.responses.enabled;
+  }
+
+  async run(
+    scope: string,
+    key: string,
+    fingerprint: string,
+    execute: () => Promise<unknown>,
+  ): Promise<IdempotentResult> {
+    if (key.length === 0 || key.length > MAX_IDEMPOTENCY_KEY_LENGTH) {
+      throw new BadRequestException(
+        `${IDEMPOTENCY_KEY_HEADER} must be 1-${MAX_IDEMPOTENCY_KEY_LENGTH} characters`,
+      );
+    }
+    const id = `${scope}\n${key}`;
+
+    const stored = this.responses.get(id);
+    if (stored) {
+      this.checkFingerprint(stored.fingerprint, fingerprint);
+      this.counters.replayed++;
+      return { body: stored.body, replayed: true };
+    }
+
+    const running = this.running.get(id);
+    if (running) {
+      this.checkFingerprint(running.fingerprint, fingerprint);
+      this.counters.joined++;
+      return { body: await running.result, replayed: true };
+    }
+
+    const result = execute();
+    this.running.set(id, { fingerprint, result });
+    try {
+      const body = await result;
+      this.responses.set(id, { fingerprint, body });
+      this.counters.stored++;
+      return { body, replayed: false };
+    } finally {
+      this.running.delete(id);
+    }
+  }
+
+  stats(): IdempotencyStats {
+    return {
+      ...this.responses.stats(),
+      inFlight: this.running.size,
+      ...this.counters,
+    };
+  }
+
+  private checkFingerprint(expected: string, actual: string) {
+    if (expected !== actual) {
+      this.counters.mismatched++;
+      throw new UnprocessableEntityException(
+        `${IDEMPOTENCY_KEY_HEADER} was already used with a different request body`,
+      );
+    }
+  }
+}
@@ -2,10 +2,15 @@ import 'dotenv/config';
 import { NestFactory } from '@nestjs/core';
 import { AppModule } from './app.module';
 import { ValidationPipe } from '@nestjs/common';
+import { compression } from './common/compression';
+import { intFromEnv } from './common/env';
 
 async function bootstrap() {
   const app = await NestFactory.create(AppModule);
 
+  // Lets the task write queue flush before the process exits
+  app.enableShutdownHooks();
+  app.use(compression(intFromEnv('COMPRESSION_THRESHOLD', 1024)));
   app.useGlobalPipes(new ValidationPipe());
   await app.listen(process.env.PORT ?? 3000);
 }
@@ -0,0 +1,26 @@
+import { Histogram } from './histogram';
+
+describe('Histogram', () => {
+  it('renders cumulative buckets, sum and count per label set', () => {
+    const histogram = new Histogram('latency_seconds', 'Latency', [0.1, 1]);
+    histogram.observe({ route: '/a' }, 0.05);
+    histogram.observe({ route: '/a' }, 0.5);
+    histogram.observe({ route: '/a' }, 5);
+    histogram.observe({ route: '/b' }, 0.2);
+
+    const lines = histogram.render();
+
+    expect(lines).toContain('latency_seconds_bucket{route="/a",le="0.1"} 1');
+    expect(lines).toContain('latency_seconds_bucket{route="/a",le="1"} 2');
+    expect(lines).toContain('latency_seconds_bucket{route="/a",le="+Inf"} 3');
+    expect(lines).toContain('latency_seconds_sum{route="/a"} 5.55');
+    expect(lines).toContain('latency_seconds_count{route="/b"} 1');
+  });
+
+  it('escapes label values', () => {
+    const histogram = new Histogram('h', 'h', [1]);
+    histogram.observe({ route: 'a"b' }, 0);
+
+    expect(histogram.render()).toContain('h_count{route="a\\"b"} 1');
+  });
+});
@@ -0,0 +1,71 @@
+export type Labels = Record<string, string>;
+
+interface Series {
+  labels: Labels;
+  buckets: number[];
+  sum: number;
+  count: number;
+}
+
+function escapeLabel(value: string) {
+  return value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+export function formatLabels(labels: Labels) {
+  const pairs = Object.entries(labels).map(
+    ([name, value]) => `${name}="${escapeLabel(value)}"`,
+  );
+  return pairs.length ? `{${pairs.join(',')}}` : '';
+}
+
+/**
+ * Prometheus-style histogram with fixed upper bounds. Series are keyed by
+ * their label values, so callers must keep label cardinality bounded
+ * (route templates, not raw URLs).
+ */
+export class Histogram {
+  private readonly series = new Map<string, Series>();
+
+  constructor(
+    readonly name: string,
+    readonly help: string,
+    private readonly bounds: number[],
+  ) {}
+
+  observe(labels: Labels, value: number) {
+    const key = formatLabels(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, buckets: this.bounds.map(() => 0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    const index = this.bounds.findIndex((bound) => value <= bound);
+    if (index >= 0) {
+      series.buckets[index]++;
+    }
+    series.sum += value;
+    series.count++;
+  }
+
+  render(): string[] {
+    const lines = [
+      `# HELP ${this.name} ${this.help}`,
+      `# TYPE ${this.name} histogram`,
+    ];
+    for (const { labels, buckets, sum, count } of this.series.values()) {
+      let cumulative = 0;
+      this.bounds.forEach((bound, i) => {
+        cumulative += buckets[i];
+        lines.push(
+          `${this.name}_bucket${formatLabels({ ...labels, le: String(bound) })} ${cumulative}`,
+        );
+      });
+      lines.push(
+        `${this.name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`,
+        `${this.name}_sum${formatLabels(labels)} ${sum}`,
+        `${this.name}_count${formatLabels(labels)} ${count}`,
+      );
+    }
+    return lines;
+  }
+}
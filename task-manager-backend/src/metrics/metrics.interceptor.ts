@@ -0,0 +1,48 @@
+import {
+  CallHandler,
+  ExecutionContext,
+  HttpException,
+  Injectable,
+  NestInterceptor,
+} from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { tap } from 'rxjs';
+import { MetricsService } from './metrics.service';
+import { requestContext } from './request-context';
+
+/**
+ * Times every HTTP handler and records how many queries it issued. Routes
+ * are labelled by their template (`/groups/:groupId/tasks/:id`).
+ */
+@Injectable()
+export class MetricsInterceptor implements NestInterceptor {
+  constructor(private readonly metrics: MetricsService) {}
+
+  intercept(context: ExecutionContext, next: CallHandler) {
+    if (context.getType() !== 'http') {
+      return next.handle();
+    }
+    const http = context.switchToHttp();
+    const req = http.getRequest<Request>();
+    const res = http.getResponse<Response>();
+    const route = `${req.baseUrl}${(req.route as { path?: string } | undefined)?.path ?? ''}`;
+    const start = process.hrtime.bigint();
+
+    const record = (status: number) =>
+      this.metrics.observeRequest(
+        req.method,
+        route,
+        status,
+        Number(process.hrtime.bigint() - start) / 1e9,
+        requestContext.getStore(),
+      );
+
+    return next.handle().pipe(
+      tap({
+        complete: () => record(res.statusCode),
+        error: (error: unknown) =>
+          record(error instanceof HttpException ? error.getStatus() : 500),
+      }),
+    );
+  }
+}
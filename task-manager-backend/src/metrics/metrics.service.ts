@@ -0,0 +1,94 @@
+import { Injectable } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+import { PrismaService } from 'src/prisma/prisma.service';
+import { CacheService } from 'src/cache/cache.service';
+import { Histogram } from './histogram';
+import { RequestMetrics, requestContext } from './request-context';
+
+const SECONDS_BUCKETS = [
+  0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+  10,
+];
+const QUERY_COUNT_BUCKETS = [0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000];
+
+// First keyword and target table of a statement, e.g. SELECT / Task
+const STATEMENT = /^\s*(\w+)/;
+const TABLE = /\b(?:FROM|INTO|UPDATE)\s+(?:[`"]?main[`"]?\.)?[`"]?(\w+)/i;
+
+@Injectable()
+export class MetricsService {
+  readonly requestSeconds = new Histogram(
+    'http_request_duration_seconds',
+    'Time spent in route handlers',
+    SECONDS_BUCKETS,
+  );
+  readonly requestQueries = new Histogram(
+    'http_request_queries',
+    'Prisma queries issued per request',
+    QUERY_COUNT_BUCKETS,
+  );
+  readonly querySeconds = new Histogram(
+    'prisma_query_duration_seconds',
+    'Prisma query duration by statement and table',
+    SECONDS_BUCKETS,
+  );
+
+  constructor(
+    prisma: PrismaService,
+    private readonly cacheService: CacheService,
+  ) {
+    prisma.$on('query', (event) => this.observeQuery(event));
+  }
+
+  observeQuery(event: Prisma.QueryEvent) {
+    const seconds = event.duration / 1000;
+    this.querySeconds.observe(
+      {
+        statement: (STATEMENT.exec(event.query)?.[1] ?? 'unknown').toUpperCase(),
+        table: TABLE.exec(event.query)?.[1] ?? '',
+      },
+      seconds,
+    );
+    const current = requestContext.getStore();
+    if (current) {
+      current.queries++;
+      current.querySeconds += seconds;
+    }
+  }
+
+  observeRequest(
+    method: string,
+    route: string,
+    status: number,
+    seconds: number,
+    counters?: RequestMetrics,
+  ) {
+    this.requestSeconds.observe(
+      { method, route, status: String(status) },
+      seconds,
+    );
+    if (counters) {
+      this.requestQueries.observe({ method, route }, counters.queries);
+    }
+  }
+
+  render() {
+    const lines = [
+      ...this.requestSeconds.render(),
+      ...this.requestQueries.render(),
+      ...this.querySeconds.render(),
+    ];
+    const caches = Object.entries(this.cacheService.stats());
+    for (const [metric, key] of [
+      ['lookup_cache_hits_total', 'hits'],
+      ['lookup_cache_misses_total', 'misses'],
+      ['lookup_cache_evictions_total', 'evictions'],
+    ] as const) {
+      lines.push(`# TYPE ${metric} counter`);
+      for (const [name, stats] of caches) {
+        lines.push(`${metric}{cache="${name}"} ${stats[key]}`);
+      }
+    }
+    return lines.join('\n') + '\n';
+  }
+}
@@ -0,0 +1,19 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { Injectable, NestMiddleware } from '@nestjs/common';
+import type { NextFunction, Request, Response } from 'express';
+
+export interface RequestMetrics {
+  queries: number;
+  querySeconds: number;
+}
+
+// Per-request counters, reachable from Prisma query events fired while
+// the request is being handled
+export const requestContext = new AsyncLocalStorage<RequestMetrics>();
+
+@Injectable()
+export class RequestContextMiddleware implements NestMiddleware {
+  use(_req: Request, _res: Response, next: NextFunction) {
+    requestContext.run({ queries: 0, querySeconds: 0 }, next);
+  }
+}
@@ -0,0 +1,48 @@
+import type { PrismaLibSql } from '@prisma/adapter-libsql';
+import { withPragmas } from './pragma-adapter';
+
+// Behaves like a local libsql client: a transaction takes the current
+// connection, and the next query lazily opens a new, unconfigured one
+function fakeLibSql() {
+  let current: Map<string, string> | undefined;
+  const connection = () => (current ??= new Map());
+  const adapter = {
+    executeRaw: async ({ sql }: { sql: string }) => {
+      const [, name, value] = /PRAGMA (\w+) = (\S+)/.exec(sql)!;
+      connection().set(name, value);
+      return 0;
+    },
+    queryRaw: async ({ sql }: { sql: string }) => ({
+      rows: [[connection().get(/PRAGMA (\w+)/.exec(sql)![1])]],
+    }),
+    startTransaction: async () => {
+      connection();
+      current = undefined;
+      return { commit: async () => {}, rollback: async () => {} };
+    },
+  };
+  return { connect: async () => adapter } as unknown as PrismaLibSql;
+}
+
+const query = (sql: string) => ({ sql, args: [], argTypes: [] });
+
+describe('withPragmas', () => {
+  it('keeps busy_timeout on the connection that replaces a transaction', async () => {
+    const adapter = await withPragmas(fakeLibSql(), [
+      'PRAGMA busy_timeout = 5000',
+    ]).connect();
+    const busyTimeout = async () =>
+      (await adapter.queryRaw(query('PRAGMA busy_timeout'))).rows[0][0];
+
+    expect(await busyTimeout()).toBe('5000');
+
+    const tx = await adapter.startTransaction();
+    // Queued behind the transaction, so it runs on the new connection
+    const afterCommit = busyTimeout();
+    await tx.commit();
+    expect(await afterCommit).toBe('5000');
+
+    await (await adapter.startTransaction()).rollback();
+    expect(await busyTimeout()).toBe('5000');
+  });
+});
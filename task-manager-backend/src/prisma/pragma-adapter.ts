@@ -0,0 +1,108 @@
+import type { PrismaLibSql } from '@prisma/adapter-libsql';
+
+type Adapter = Awaited<ReturnType<PrismaLibSql['connect']>>;
+type Transaction = Awaited<ReturnType<Adapter['startTransaction']>>;
+
+/** Runs callers one at a time, in arrival order */
+class Lock {
+  private tail: Promise<void> = Promise.resolve();
+
+  acquire(): Promise<() => void> {
+    let release!: () => void;
+    const next = new Promise<void>((resolve) => (release = resolve));
+    const acquired = this.tail.then(() => release);
+    this.tail = this.tail.then(() => next);
+    return acquired;
+  }
+
+  async run<T>(fn: () => Promise<T>): Promise<T> {
+    const release = await this.acquire();
+    try {
+      return await fn();
+    } finally {
+      release();
+    }
+  }
+}
+
+/**
+ * Applies `statements` (connection-scoped PRAGMAs) to every SQLite
+ * connection the libsql adapter uses. A local libsql client hands its
+ * connection to each interactive transaction and lazily opens a new one
+ * for the queries after it, so settings applied once at startup would be
+ * lost after the first $transaction.
+ *
+ * The adapter already runs one query or transaction at a time; this
+ * wrapper takes the same turns, which lets it configure the replacement
+ * connection right after a transaction ends, before anything else uses it.
+ */
+export function withPragmas(
+  factory: PrismaLibSql,
+  statements: string[],
+): PrismaLibSql {
+  const connect = async (): Promise<Adapter> => {
+    const adapter = await factory.connect();
+    const lock = new Lock();
+    const configure = async () => {
+      for (const sql of statements) {
+        await adapter.executeRaw({ sql, args: [], argTypes: [] });
+      }
+    };
+    await configure();
+
+    return new Proxy(adapter, {
+      get(target, property) {
+        if (property === 'queryRaw' || property === 'executeRaw') {
+          return (query: Parameters<Adapter['queryRaw']>[0]) =>
+            lock.run(() => target[property](query) as Promise<never>);
+        }
+        if (property === 'startTransaction') {
+          return async (...args: Parameters<Adapter['startTransaction']>) => {
+            const release = await lock.acquire();
+            let tx: Transaction;
+            try {
+              tx = await target.startTransaction(...args);
+            } catch (error) {
+              release();
+              throw error;
+            }
+            let ended = false;
+            const end = async (method: 'commit' | 'rollback') => {
+              try {
+                await tx[method]();
+              } finally {
+                if (!ended) {
+                  ended = true;
+                  // The client now opens a fresh connection; set it up
+                  // before letting the next caller in
+                  await configure().finally(release);
+                }
+              }
+            };
+            return new Proxy(tx, {
+              get(txTarget, txProperty) {
+                if (txProperty === 'commit' || txProperty === 'rollback') {
+                  return () => end(txProperty);
+                }
+                const value = Reflect.get(txTarget, txProperty, txTarget);
+                return typeof value === 'function' ? value.bind(txTarget) : value;
+              },
+            });
+          };
+        }
+        const value = Reflect.get(target, property, target);
+        return typeof value === 'function' ? value.bind(target) : value;
+      },
+    });
+  };
+
+  return new Proxy(factory, {
+    get(target, property) {
+      if (property === 'connect') {
+        return connect;
+      }
+      const value = Reflect.get(target, property, target);
+      return typeof value === 'function' ? value.bind(target) : value;
+    },
+  });
+}
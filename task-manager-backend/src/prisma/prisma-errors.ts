@@ -0,0 +1,36 @@
+import { NotFoundException } from '@nestjs/common';
+import { Prisma } from '@prisma/client';
+
+// P2025: the record an update/delete targeted does not exist
+export function isRecordNotFound(error: unknown): boolean {
+  return (
+    error instanceof Prisma.PrismaClientKnownRequestError &&
+    error.code === 'P2025'
+  );
+}
+
+// P2003: an insert referenced a parent row that does not exist
+export function isForeignKeyViolation(error: unknown): boolean {
+  return (
+    error instanceof Prisma.PrismaClientKnownRequestError &&
+    error.code === 'P2003'
+  );
+}
+
+/**
+ * Runs a single conditional write and maps Prisma's "record not found"
+ * error to the same 404 the explicit existence checks used to produce.
+ */
+export async function orNotFound<T>(
+  query: Promise<T>,
+  message: string,
+): Promise<T> {
+  try {
+    return await query;
+  } catch (error) {
+    if (isRecordNotFound(error)) {
+      throw new NotFoundException(message);
+    }
+    throw error;
+  }
+}
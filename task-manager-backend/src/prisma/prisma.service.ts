@@ -1,17 +1,73 @@
-import { Injectable, OnModuleInit } from '@nestjs/common';
-import { PrismaClient } from '@prisma/client';
+import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
+import { Prisma, PrismaClient } from '@prisma/client';
 import { PrismaLibSql } from '@prisma/adapter-libsql';
+import { withPragmas } from './pragma-adapter';
+import {
+  pragmaStatements,
+  SqlitePragmas,
+  sqlitePragmasFromEnv,
+} from './sqlite-config';
 
+// Query events feed the per-request and per-statement metrics
 @Injectable()
-export class PrismaService extends PrismaClient implements OnModuleInit {
+export class PrismaService
+  extends PrismaClient<Prisma.PrismaClientOptions, 'query'>
+  implements OnModuleInit
+{
+  private readonly logger = new Logger(PrismaService.name);
+  private readonly url: string;
+  private readonly pragmas: SqlitePragmas;
+  effectivePragmas: Record<string, string> = {};
+
   constructor() {
-    const adapter = new PrismaLibSql({
-      url: process.env.DATABASE_URL || 'file:./dev.db',
-    });
-    super({ adapter });
+    const url = process.env.DATABASE_URL || 'file:./dev.db';
+    const pragmas = sqlitePragmasFromEnv();
+    // Remote libsql servers manage their own storage settings
+    const adapter = url.startsWith('file:')
+      ? withPragmas(new PrismaLibSql({ url }), pragmaStatements(pragmas))
+      : new PrismaLibSql({ url });
+    super({ adapter, log: [{ emit: 'event', level: 'query' }] });
+    this.url = url;
+    this.pragmas = pragmas;
   }
 
   async onModuleInit() {
     await this.$connect();
+    if (this.url.startsWith('file:')) {
+      await this.checkPragmas();
+    }
+  }
+
+  /**
+   * Reads the pragmas back after a transaction has run, because libsql
+   * replaces its connection when one ends. A busy_timeout or foreign_keys
+   * that did not survive stops startup instead of failing under load.
+   */
+  async checkPragmas() {
+    await this.$transaction((tx) => tx.$queryRawUnsafe('SELECT 1'));
+
+    for (const name of Object.keys(this.pragmas)) {
+      const rows = await this.$queryRawUnsafe<Record<string, unknown>[]>(
+        `PRAGMA ${name}`,
+      );
+      const value = rows[0] ? Object.values(rows[0])[0] : undefined;
+      this.effectivePragmas[name] = String(value);
+    }
+
+    this.logger.log(
+      `SQLite pragmas: ${Object.entries(this.effectivePragmas)
+        .map(([name, value]) => `${name}=${value}`)
+        .join(', ')}`,
+    );
+    const { busy_timeout, foreign_keys } = this.effectivePragmas;
+    if (
+      busy_timeout !== String(this.pragmas.busy_timeout) ||
+      foreign_keys !== '1'
+    ) {
+      throw new Error(
+        `SQLite pragmas were not applied to the connection after a transaction (busy_timeout=${busy_timeout}, foreign_keys=${foreign_keys})`,
+      );
+    }
+    return this.effectivePragmas;
   }
-}
\ No newline at end of file
+}
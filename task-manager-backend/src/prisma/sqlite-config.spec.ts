@@ -0,0 +1,39 @@
+import {
+  pragmaStatements,
+  SQLITE_DEFAULTS,
+  sqlitePragmasFromEnv,
+} from './sqlite-config';
+
+describe('sqlitePragmasFromEnv', () => {
+  it('falls back to the defaults', () => {
+    expect(sqlitePragmasFromEnv({})).toEqual(SQLITE_DEFAULTS);
+  });
+
+  it('reads and normalises overrides', () => {
+    const pragmas = sqlitePragmasFromEnv({
+      SQLITE_JOURNAL_MODE: 'delete',
+      SQLITE_SYNCHRONOUS: 'full',
+      SQLITE_CACHE_SIZE: '-64000',
+      SQLITE_MMAP_SIZE: '0',
+      SQLITE_BUSY_TIMEOUT: '250',
+    });
+
+    expect(pragmas).toMatchObject({
+      journal_mode: 'DELETE',
+      synchronous: 'FULL',
+      cache_size: -64000,
+      mmap_size: 0,
+      busy_timeout: 250,
+    });
+  });
+
+  it('rejects values that are not valid pragmas', () => {
+    expect(() => sqlitePragmasFromEnv({ SQLITE_JOURNAL_MODE: 'wal; DROP TABLE "Task"' })).toThrow();
+    expect(() => sqlitePragmasFromEnv({ SQLITE_BUSY_TIMEOUT: '-1' })).toThrow();
+    expect(() => sqlitePragmasFromEnv({ SQLITE_CACHE_SIZE: 'big' })).toThrow();
+  });
+
+  it('renders one PRAGMA statement per setting', () => {
+    expect(pragmaStatements(SQLITE_DEFAULTS)).toContain('PRAGMA journal_mode = WAL');
+  });
+});
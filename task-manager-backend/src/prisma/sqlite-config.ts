@@ -0,0 +1,101 @@
+// SQLite pragmas applied by PrismaService to every connection. Every value can be
+// overridden through the environment; invalid values fail startup.
+
+export interface SqlitePragmas {
+  journal_mode: string;
+  synchronous: string;
+  cache_size: number;
+  mmap_size: number;
+  busy_timeout: number;
+  foreign_keys: string;
+}
+
+const JOURNAL_MODES = ['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'];
+const SYNCHRONOUS_LEVELS = ['OFF', 'NORMAL', 'FULL', 'EXTRA'];
+
+export const SQLITE_DEFAULTS: SqlitePragmas = {
+  journal_mode: 'WAL', // readers no longer block the writer
+  synchronous: 'NORMAL', // durable at checkpoints; safe with WAL
+  cache_size: -20000, // negative = KiB, so ~20 MB of page cache
+  mmap_size: 268435456, // 256 MB
+  busy_timeout: 5000, // ms to wait on a locked database before SQLITE_BUSY
+  foreign_keys: 'ON', // cascades and membership inserts rely on it
+};
+
+function oneOf(
+  name: string,
+  value: string | undefined,
+  allowed: string[],
+  fallback: string,
+) {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  const upper = value.toUpperCase();
+  if (!allowed.includes(upper)) {
+    throw new Error(
+      `${name} must be one of ${allowed.join(', ')} (got "${value}")`,
+    );
+  }
+  return upper;
+}
+
+function integer(
+  name: string,
+  value: string | undefined,
+  fallback: number,
+  min = -Infinity,
+) {
+  if (value === undefined || value === '') {
+    return fallback;
+  }
+  const parsed = Number(value);
+  if (!Number.isInteger(parsed) || parsed < min) {
+    throw new Error(`${name} must be an integer >= ${min} (got "${value}")`);
+  }
+  return parsed;
+}
+
+export function sqlitePragmasFromEnv(
+  env: NodeJS.ProcessEnv = process.env,
+): SqlitePragmas {
+  return {
+    journal_mode: oneOf(
+      'SQLITE_JOURNAL_MODE',
+      env.SQLITE_JOURNAL_MODE,
+      JOURNAL_MODES,
+      SQLITE_DEFAULTS.journal_mode,
+    ),
+    synchronous: oneOf(
+      'SQLITE_SYNCHRONOUS',
+      env.SQLITE_SYNCHRONOUS,
+      SYNCHRONOUS_LEVELS,
+      SQLITE_DEFAULTS.synchronous,
+    ),
+    cache_size: integer(
+      'SQLITE_CACHE_SIZE',
+      env.SQLITE_CACHE_SIZE,
+      SQLITE_DEFAULTS.cache_size,
+    ),
+    mmap_size: integer(
+      'SQLITE_MMAP_SIZE',
+      env.SQLITE_MMAP_SIZE,
+      SQLITE_DEFAULTS.mmap_size,
+      0,
+    ),
+    busy_timeout: integer(
+      'SQLITE_BUSY_TIMEOUT',
+      env.SQLITE_BUSY_TIMEOUT,
+      SQLITE_DEFAULTS.busy_timeout,
+      0,
+    ),
+    foreign_keys: SQLITE_DEFAULTS.foreign_keys,
+  };
+}
+
+/** Values are validated above, so interpolating them into PRAGMA is safe */
+export function pragmaStatements(pragmas: SqlitePragmas): string[] {
+  return Object.entries(pragmas).map(
+    ([name, value]) => `PRAGMA ${name} = ${String(value)}`,
+  );
+}
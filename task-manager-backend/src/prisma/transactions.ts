@@ -0,0 +1,4 @@
+// Options for transactions that write whole batches (bulk task and member
+// routes, the task write queue, archive import); large batches can outlive
+// Prisma's 5s default timeout
+export const BULK_TRANSACTION_OPTIONS = { maxWait: 10_000, timeout: 60_000 };
@@ -0,0 +1,129 @@
+"""
+Shared HTTP client for the Task Manager API scripts.
+
+Wraps a single requests.Session so every call reuses pooled keep-alive
+connections instead of paying a TCP handshake per request. Idempotent
+requests are retried with exponential backoff on connection errors and
+429/502/503/504, waiting at least as long as the server's Retry-After.
+
+POSTs are only retried when the request never reached the server, unless
+they carry an Idempotency-Key: the server then replays the first response
+instead of creating a duplicate.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class ApiClient:
+    """Pooled, keep-alive client bound to one base URL"""
+
+    def __init__(self, base_url, pool_size=32, retries=3, backoff=0.2, timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._configure(pool_size, retries, backoff)
+
+    def _configure(self, pool_size, retries, backoff):
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session, self._adapter = self._session(pool_size, retry)
+        # Same policy, but POSTs are retried too: only used for keyed requests
+        keyed_retry = retry.new(allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"})
+        self._keyed_session, self._keyed_adapter = self._session(pool_size, keyed_retry)
+
+    @staticmethod
+    def _session(pool_size, retry):
+        # pool_block keeps us at pool_size sockets; extra threads wait for a
+        # free connection instead of opening throwaway ones.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session, adapter
+
+    def configure(self, base_url=None, pool_size=32, retries=3, backoff=0.2, timeout=None):
+        """Rebuild the session with new settings (used after CLI parsing)"""
+        self.close()
+        if base_url:
+            self.base_url = base_url.rstrip("/")
+        if timeout is not None:
+            self.timeout = timeout
+        with self._lock:
+            self._requests = 0
+            self._retries = 0
+        self._configure(pool_size, retries, backoff)
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        keyed = IDEMPOTENCY_HEADER in (kwargs.get("headers") or {})
+        session = self._keyed_session if keyed else self.session
+        response = session.request(method, f"{self.base_url}{path}", **kwargs)
+        history = getattr(getattr(response.raw, "retries", None), "history", ())
+        with self._lock:
+            self._requests += 1
+            self._retries += len(history)
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def stats(self):
+        """Connection reuse statistics across all pooled connections"""
+        connections = 0
+        pool_requests = 0
+        for adapter in (self._adapter, self._keyed_adapter):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    pool_requests += pool.num_requests
+        with self._lock:
+            sent, retried = self._requests, self._retries
+        return {
+            "requests": sent,
+            "retries": retried,
+            "connections_opened": connections,
+            "connections_reused": max(pool_requests - connections, 0),
+            "reuse_ratio": 1 - connections / pool_requests if pool_requests else 0.0,
+        }
+
+    def close(self):
+        for session in (getattr(self, "session", None), getattr(self, "_keyed_session", None)):
+            if session is not None:
+                session.close()
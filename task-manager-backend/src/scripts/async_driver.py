@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Multi-tenant driver for the Task Manager API test scenarios.
+
+Runs the sections of test_api.py (its SECTIONS, not a copy) as independent
+scenarios. Every scenario instance creates (and cleans up) its own users and
+groups under a namespace derived from TEST_RUN_ID and its tenant number, so
+the same scenarios can be fanned out to thousands of simulated tenants.
+
+This is a thread-pool driver over one shared aiohttp session, not an asyncio
+one. Sections are blocking functions, so each instance runs on a pool
+thread and waits there for every response. Requests go through AsyncClient
+(ApiClient's interface) and are sent on the event loop's session, which
+pools the connections and records latency per route. At most --concurrency
+scenarios are in flight, one OS thread each, like test_api.py --jobs N;
+the tenants beyond that queue for a free thread.
+
+Requires aiohttp (pip install aiohttp).
+
+Examples:
+    python async_driver.py                          # sections 1-8 once, on 50 threads
+    python async_driver.py --sections 4,7,8 --instances 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - import guard for a missing optional dependency
+    print("async_driver.py requires aiohttp: pip install aiohttp")
+    sys.exit(1)
+
+from test_api import (
+    BASE_URL, EXCLUSIVE_SECTIONS, SECTIONS, STREAMING_SECTIONS, GREEN, RED, RESET,
+    LatencyRecorder, log_info, log_section, run_section, use_client,
+)
+
+ID_SEGMENT = re.compile(r"/\d+")
+
+# Sections that check server-wide state or stream bodies cannot run per tenant
+SUPPORTED_SECTIONS = sorted(set(SECTIONS) - EXCLUSIVE_SECTIONS - STREAMING_SECTIONS)
+DEFAULT_SECTIONS = [1, 2, 3, 4, 5, 6, 7, 8]  # CRUD, 404s and cascades
+
+
+class AsyncResponse:
+    """The parts of requests.Response the test_api helpers read"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncClient:
+    """ApiClient's request interface for section threads; every request runs on the driver's loop"""
+
+    def __init__(self, driver, loop):
+        self.driver = driver
+        self.loop = loop
+        self.base_url = driver.base_url
+
+    def request(self, method, path, params=None, json=None, headers=None, data=None, timeout=None, stream=False):
+        if stream:
+            # STREAMING_SECTIONS are excluded for this reason
+            raise TypeError("AsyncClient reads whole response bodies; stream=True needs test_api.py's ApiClient")
+        call = self.driver.call(method, path, params=params, json=json, headers=headers, data=data, timeout=timeout)
+        return asyncio.run_coroutine_threadsafe(call, self.loop).result()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+
+# ============================================
+# DRIVER
+# ============================================
+class AsyncDriver:
+    def __init__(self, base_url, concurrency):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.recorder = LatencyRecorder()
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=60, connect=5)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def call(self, method, path, params=None, json=None, headers=None, data=None, timeout=None):
+        """Returns an AsyncResponse (status 0 if the request failed); records latency under the route template"""
+        route = f"{method} {ID_SEGMENT.sub('/:id', path)}"
+        options = {"json": json, "headers": headers, "data": data}
+        if params:
+            # aiohttp takes strings only; requests drops None values
+            options["params"] = {k: str(v) for k, v in params.items() if v is not None}
+        if timeout is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            options["timeout"] = aiohttp.ClientTimeout(connect=connect, sock_read=read)
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, f"{self.base_url}{path}", **options) as response:
+                status, response_headers, content = response.status, response.headers, await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status, response_headers, content = 0, {}, b""
+        self.recorder.record(route, time.perf_counter() - start, 0 < status < 500)
+        return AsyncResponse(status, response_headers, content)
+
+    async def run(self, sections, instances):
+        """Run every section for every instance; returns per-section results"""
+        loop = asyncio.get_running_loop()
+        client = AsyncClient(self, loop)
+        results = {section: {"passed": 0, "failures": [], "instances": 0, "seconds": 0.0}
+                   for section in sections}
+
+        def run_in_thread(section, instance):
+            use_client(client)
+            try:
+                return run_section(section, live=False, tenant=instance)
+            finally:
+                use_client(None)
+
+        # One thread per scenario in flight; each blocks on its own requests only
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            async def run_one(section, instance):
+                section_result = await loop.run_in_executor(pool, run_in_thread, section, instance)
+                result = results[section]
+                result["passed"] += section_result.passed
+                result["failures"].extend(f"[tenant {instance}] {f}" for f in section_result.failures)
+                result["instances"] += 1
+                result["seconds"] = max(result["seconds"], section_result.seconds)
+
+            await asyncio.gather(*(run_one(section, instance)
+                                   for instance in range(instances) for section in sections))
+        return results
+
+
+def print_results(results, wall, recorder, max_failures):
+    log_section("ASYNC DRIVER RESULTS")
+    total_passed = total_failed = 0
+    for section, result in results.items():
+        failed = len(result["failures"])
+        total_passed += result["passed"]
+        total_failed += failed
+        color = GREEN if not failed else RED
+        print(f"{color}{section}. {SECTIONS[section][0]:<48}{RESET} instances: {result['instances']:>6}  "
+              f"passed: {result['passed']:>7}  failed: {failed:>5}  slowest: {result['seconds']:.2f}s")
+        for failure in result["failures"][:max_failures]:
+            print(f"       {failure}")
+
+    endpoints = recorder.summary(wall)
+    requests_total = sum(s["count"] for s in endpoints.values())
+    print()
+    log_info(f"{requests_total} requests in {wall:.2f}s ({requests_total / wall if wall else 0:.1f} req/s)")
+    for route, stats in endpoints.items():
+        print(f"  {route:<44}{stats['count']:>8}  p50 {stats['p50_ms']:>7.1f}ms  "
+              f"p95 {stats['p95_ms']:>7.1f}ms  p99 {stats['p99_ms']:>7.1f}ms")
+
+    print(f"\n{GREEN}Passed: {total_passed}{RESET}  {RED}Failed: {total_failed}{RESET}")
+    return total_failed
+
+
+def parse_sections(value):
+    sections = sorted({int(part) for part in value.split(",") if part.strip()})
+    unknown = [s for s in sections if s not in SUPPORTED_SECTIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unsupported sections: {unknown} (choose from {SUPPORTED_SECTIONS})")
+    return sections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent asyncio driver for the API test scenarios")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"server URL (default: {BASE_URL})")
+    parser.add_argument("--sections", type=parse_sections, default=DEFAULT_SECTIONS,
+                        help=f"comma-separated test_api.py sections to run (default: {DEFAULT_SECTIONS})")
+    parser.add_argument("--instances", type=int, default=1,
+                        help="independent tenants, each running every selected section (default: 1)")
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="worker threads, i.e. scenarios and connections in flight (default: 50)")
+    parser.add_argument("--max-failures", type=int, default=10,
+                        help="failure messages to print per section (default: 10)")
+    args = parser.parse_args(argv)
+
+    async def run():
+        async with AsyncDriver(args.base_url, args.concurrency) as driver:
+            start = time.perf_counter()
+            results = await driver.run(args.sections, args.instances)
+            return results, time.perf_counter() - start, driver.recorder
+
+    log_section(f"ASYNC DRIVER - {args.instances} tenant(s) x sections {args.sections}")
+    results, wall, recorder = asyncio.run(run())
+    if print_results(results, wall, recorder, args.max_failures):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Query-plan benchmark for the hot lookup indexes.
+
+Builds a scratch SQLite database from prisma/migrations, seeds it with a
+fixed random seed (1M tasks / 100k memberships by default), and times the
+queries behind getMembers, findByGroupId, findByUserId and the deleteUser cascade
+before and after the hot_path_indexes migration, plus the full-text
+search queries behind /tasks/search. EXPLAIN QUERY PLAN is
+printed for both, so the plans can be checked directly.
+
+Run with: python index_bench.py [--tasks 1000000] [--memberships 100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "prisma" / "migrations"
+INDEX_MIGRATION = "hot_path_indexes"
+
+# TasksService.search, first page: every match is ranked in the FTS query.
+# Scopes under SCOPE_JOIN_TASKS tasks go into the MATCH, larger ones join Task.
+SEARCH_SQL = (
+    'SELECT "TaskSearch".rowid AS id, "TaskSearch".rank AS rank FROM "TaskSearch" WHERE "TaskSearch" MATCH ? '
+    'ORDER BY "TaskSearch".rank, "TaskSearch".rowid DESC LIMIT 101'
+)
+SEARCH_JOIN_SQL = (
+    'SELECT "TaskSearch".rowid AS id, "TaskSearch".rank AS rank FROM "TaskSearch" '
+    'JOIN "Task" t ON t.id = "TaskSearch".rowid WHERE "TaskSearch" MATCH ? AND t."groupId" IN (?) '
+    'ORDER BY "TaskSearch".rank, "TaskSearch".rowid DESC LIMIT 101'
+)
+
+
+def search_match(rng, group_ids=None):
+    """Same MATCH shape as src/tasks/task-search.ts, for one or two title words"""
+    words = [rng.choice(TITLE_NOUNS)] + ([rng.choice(TITLE_VERBS)] if rng.random() < 0.5 else [])
+    text = "{title description} : (" + " ".join(f'"{w}"' for w in words) + ")"
+    if group_ids is None:
+        return text
+    return f"{text} AND scope : (" + " OR ".join(f"g{g}" for g in group_ids) + ")"
+
+
+# name -> (sql, parameter factory); parameters are drawn from the seeded data
+QUERIES = {
+    "tasks page by group": (
+        'SELECT id, title, description, completed, groupId, createdAt FROM "Task" '
+        'WHERE groupId = ? AND id > ? ORDER BY id LIMIT 101',
+        lambda data, rng: (data.any_group(rng), 0),
+    ),
+    "open tasks page by group": (
+        'SELECT id, title, description, completed, groupId, createdAt FROM "Task" '
+        'WHERE groupId = ? AND completed = 0 ORDER BY id LIMIT 101',
+        lambda data, rng: (data.any_group(rng),),
+    ),
+    "tasks page for user": (
+        'SELECT id, title, description, completed, groupId, createdAt FROM "Task" '
+        'WHERE groupId IN (SELECT groupId FROM "UserGroup" WHERE userId = ?) AND id > ? ORDER BY id LIMIT 101',
+        lambda data, rng: (data.member_user(rng), 0),
+    ),
+    "count tasks by group": (
+        'SELECT COUNT(*) FROM "Task" WHERE groupId = ?',
+        lambda data, rng: (data.any_group(rng),),
+    ),
+    "members page by group": (
+        'SELECT userId, groupId, joinedAt FROM "UserGroup" '
+        'WHERE groupId = ? ORDER BY userId LIMIT 101',
+        lambda data, rng: (data.any_group(rng),),
+    ),
+    "count members by group": (
+        'SELECT COUNT(*) FROM "UserGroup" WHERE groupId = ?',
+        lambda data, rng: (data.any_group(rng),),
+    ),
+    "groups emptied by user delete": (
+        'SELECT m.groupId FROM "UserGroup" m WHERE m.userId = ? '
+        'AND NOT EXISTS (SELECT 1 FROM "UserGroup" o WHERE o.groupId = m.groupId AND o.userId <> ?)',
+        lambda data, rng: (lambda u: (u, u))(data.member_user(rng)),
+    ),
+    "search all tasks": (SEARCH_SQL, lambda data, rng: (search_match(rng),)),
+    "search one group": (SEARCH_SQL, lambda data, rng: (search_match(rng, [data.any_group(rng)]),)),
+    "search hot group": (SEARCH_JOIN_SQL, lambda data, rng: (search_match(rng), 1)),
+}
+
+
+class SeededData:
+    """Remembers what was seeded so queries hit realistic keys"""
+
+    def __init__(self, groups, memberships):
+        self.groups = groups
+        self.memberships = memberships
+
+    def any_group(self, rng):
+        return rng.randint(1, self.groups)
+
+    def member_user(self, rng):
+        return rng.choice(self.memberships)[0]
+
+
+def migration_files():
+    return sorted(p / "migration.sql" for p in MIGRATIONS_DIR.iterdir() if (p / "migration.sql").exists())
+
+
+def apply_migrations(conn, indexes_only=False):
+    """Apply every migration except the index one, or only the index one"""
+    for path in migration_files():
+        if (INDEX_MIGRATION in path.parent.name) == indexes_only:
+            conn.executescript(path.read_text())
+
+
+# Task titles are "<verb> <noun> <n>" so full-text search has realistic terms
+TITLE_VERBS = ("review", "draft", "send", "fix", "plan", "update", "call", "check", "book", "order",
+               "prepare", "schedule", "clean", "test", "deploy", "write", "pay", "renew", "file", "archive")
+TITLE_NOUNS = ("invoice", "report", "budget", "meeting", "release", "contract", "slides", "roadmap", "backup",
+               "server", "laptop", "newsletter", "receipt", "agenda", "proposal", "survey", "dashboard", "ticket",
+               "license", "payroll", "inventory", "schedule", "feedback", "migration", "onboarding", "audit",
+               "website", "database", "campaign", "insurance", "passport", "dentist", "groceries", "garden",
+               "flight", "hotel", "taxes", "warranty", "subscription", "presentation")
+
+
+def task_title(rng, i):
+    return f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_NOUNS)} {i}"
+
+
+def skewed_id(rng, upper):
+    """Pareto-distributed ID in [1, upper]: a few groups are very large"""
+    return min(int(rng.paretovariate(1.2)), upper)
+
+
+def seed(conn, users, groups, tasks, memberships, seed_value):
+    rng = random.Random(seed_value)
+    # Separate stream: titles do not shift the seeded groups and flags
+    words = random.Random(seed_value + 1)
+    start = time.perf_counter()
+    with conn:
+        conn.executemany(
+            'INSERT INTO "User" (id, name, email) VALUES (?, ?, ?)',
+            ((i, f"User {i}", f"user{i}@example.com") for i in range(1, users + 1)),
+        )
+        conn.executemany(
+            'INSERT INTO "Group" (id, name) VALUES (?, ?)',
+            ((i, f"Group {i}") for i in range(1, groups + 1)),
+        )
+        pairs = set()
+        while len(pairs) < memberships:
+            pairs.add((rng.randint(1, users), skewed_id(rng, groups)))
+        conn.executemany('INSERT INTO "UserGroup" (userId, groupId) VALUES (?, ?)', pairs)
+        conn.executemany(
+            'INSERT INTO "Task" (title, completed, groupId) VALUES (?, ?, ?)',
+            ((task_title(words, i), int(rng.random() < 0.3), skewed_id(rng, groups)) for i in range(tasks)),
+        )
+    conn.execute("ANALYZE")
+    return SeededData(groups, sorted(pairs)), time.perf_counter() - start
+
+
+def time_queries(conn, data, repeat, seed_value):
+    results = {}
+    for name, (sql, params_for) in QUERIES.items():
+        rng = random.Random(seed_value)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params_for(data, rng))]
+        samples = []
+        for _ in range(repeat):
+            params = params_for(data, rng)
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[name] = {
+            "median_ms": statistics.median(samples),
+            "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)],
+            "plan": plan,
+        }
+    return results
+
+
+def print_report(before, after):
+    print(f"\n{'query':<32}{'before p50':>12}{'after p50':>12}{'before p95':>12}{'after p95':>12}{'speedup':>10}")
+    print("-" * 90)
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        speedup = b["median_ms"] / a["median_ms"] if a["median_ms"] else float("inf")
+        print(f"{name:<32}{b['median_ms']:>10.3f}ms{a['median_ms']:>10.3f}ms"
+              f"{b['p95_ms']:>10.3f}ms{a['p95_ms']:>10.3f}ms{speedup:>9.1f}x")
+    print("\nQuery plans (before -> after):")
+    for name in QUERIES:
+        print(f"  {name}")
+        print(f"    before: {' | '.join(before[name]['plan'])}")
+        print(f"    after:  {' | '.join(after[name]['plan'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot-path indexes on a seeded SQLite database")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--groups", type=int, default=10000)
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--memberships", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50, help="timed executions per query (default: 50)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="database file to build (default: a temporary file, removed afterwards)")
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.memberships > args.users * args.groups:
+        parser.error("--memberships cannot exceed --users x --groups")
+
+    if args.db:
+        db_path = args.db
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    else:
+        fd, db_path = tempfile.mkstemp(suffix=".db", prefix="index_bench_")
+        os.close(fd)
+    conn = sqlite3.connect(db_path)
+    try:
+        apply_migrations(conn)
+        data, seconds = seed(conn, args.users, args.groups, args.tasks, args.memberships, args.seed)
+        print(f"Seeded {args.tasks} tasks, {args.memberships} memberships, {args.groups} groups, "
+              f"{args.users} users in {seconds:.1f}s ({db_path})")
+
+        before = time_queries(conn, data, args.repeat, args.seed)
+        start = time.perf_counter()
+        apply_migrations(conn, indexes_only=True)
+        conn.execute("ANALYZE")
+        print(f"Built indexes in {time.perf_counter() - start:.1f}s")
+        after = time_queries(conn, data, args.repeat, args.seed)
+    finally:
+        conn.close()
+        if not args.db:
+            os.remove(db_path)
+
+    print_report(before, after)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "before": before, "after": after}, f, indent=2)
+        print(f"\nWrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
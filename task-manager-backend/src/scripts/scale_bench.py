@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Deterministic scale seeder and route benchmark.
+
+`seed` fills a migrated SQLite database directly (bulk inserts in one
+transaction, fixed random seed, Pareto-skewed memberships and tasks, the
+same generator as index_bench.py). `run` benchmarks every route of the
+users, groups and tasks controllers against a server started on that
+database and writes a JSON report; `compare` diffs two reports.
+
+    npx prisma migrate deploy
+    python scale_bench.py seed --reset --users 100000 --groups 10000 --tasks 1000000
+    npm run start
+    python scale_bench.py run --output scale-before.json
+    python scale_bench.py compare scale-before.json scale-after.json
+
+Seed with the server stopped: the lookup cache and ETag counters only see
+writes made through the API.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from index_bench import TITLE_NOUNS, seed
+from test_api import LatencyRecorder, client, route_queries, scrape_metrics
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+TABLES = ("Task", "UserGroup", "Group", "User")
+BULK_SIZE = 100  # tasks per bulk request in the benchmark
+
+
+def default_db_path():
+    """DATABASE_URL (file: URLs resolve against the backend directory, like the server)"""
+    url = os.environ.get("DATABASE_URL", "file:./dev.db")
+    if not url.startswith("file:"):
+        sys.exit(f"DATABASE_URL must be a file: URL to seed directly (got {url})")
+    return BACKEND_DIR / url[len("file:"):]
+
+
+def table_counts(conn):
+    return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in TABLES}
+
+
+def run_seed(args):
+    db_path = Path(args.db) if args.db else default_db_path()
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not set(TABLES) <= tables:
+            sys.exit(f"{db_path} has no schema; run `npx prisma migrate deploy` first")
+        if any(table_counts(conn).values()):
+            if not args.reset:
+                sys.exit(f"{db_path} already has data; pass --reset to replace it")
+            with conn:
+                for table in TABLES:
+                    conn.execute(f'DELETE FROM "{table}"')
+                conn.execute("DELETE FROM sqlite_sequence")
+        # Throwaway data: skip fsyncs while loading
+        conn.execute("PRAGMA synchronous = OFF")
+        _, seconds = seed(conn, args.users, args.groups, args.tasks, args.memberships, args.seed)
+        counts = table_counts(conn)
+    finally:
+        conn.close()
+    print(f"Seeded {db_path} in {seconds:.1f}s (seed {args.seed}): "
+          + ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+class BenchData:
+    """Keys sampled from the seeded database with a fixed seed"""
+
+    def __init__(self, db_path, seed_value, samples=50):
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            self.counts = table_counts(conn)
+            rng = random.Random(seed_value)
+            self.hot_groups = [row[0] for row in conn.execute(
+                'SELECT groupId FROM "Task" GROUP BY groupId ORDER BY COUNT(*) DESC LIMIT 5')]
+            groups = [row[0] for row in conn.execute('SELECT id FROM "Group" ORDER BY id')]
+            self.groups = rng.sample(groups, min(samples, len(groups)))
+            users = [row[0] for row in conn.execute('SELECT DISTINCT userId FROM "UserGroup" ORDER BY userId')]
+            self.members = rng.sample(users, min(samples, len(users)))
+            tasks = conn.execute('SELECT id, groupId FROM "Task" ORDER BY id LIMIT 100000').fetchall()
+            self.tasks = rng.sample(tasks, min(samples, len(tasks)))
+        finally:
+            conn.close()
+        if not (self.hot_groups and self.groups and self.members and self.tasks):
+            sys.exit("The database looks empty; run `scale_bench.py seed` first")
+
+    def pick(self, values, i):
+        return values[i % len(values)]
+
+
+def route_cases(data, state):
+    """(route, method, request(i) -> (path, json), on_success(i, body)) in execution order.
+    Writes only touch rows the benchmark created itself, so the seeded data stays comparable."""
+    created = state.setdefault("created", {})
+
+    def keep(kind):
+        return lambda i, body: created.setdefault(kind, []).append(body)
+
+    def made(kind, i):
+        return created[kind][i % len(created[kind])]
+
+    scratch = state["scratch_group"]
+    return [
+        # Users
+        ("GET /users", "GET", lambda i: ("/users", None), None),
+        ("GET /users/:id", "GET", lambda i: (f"/users/{data.pick(data.members, i)}", None), None),
+        ("GET /users/:id/groups", "GET", lambda i: (f"/users/{data.pick(data.members, i)}/groups", None), None),
+        ("GET /users/:userId/tasks", "GET", lambda i: (f"/users/{data.pick(data.members, i)}/tasks", None), None),
+        ("GET /users/:userId/tasks?completed=false", "GET",
+         lambda i: (f"/users/{data.pick(data.members, i)}/tasks?completed=false", None), None),
+        ("POST /users", "POST", lambda i: ("/users", {"name": f"Scale {i}", "email": f"scale_{state['run']}_{i}@example.com"}),
+         keep("users")),
+        ("PUT /users/:id", "PUT", lambda i: (f"/users/{made('users', i)['id']}", {"name": f"Scale {i} renamed"}), None),
+        # Groups
+        ("GET /groups", "GET", lambda i: ("/groups", None), None),
+        ("GET /groups/:id", "GET", lambda i: (f"/groups/{data.pick(data.groups, i)}", None), None),
+        ("GET /groups/:id/members (hot)", "GET", lambda i: (f"/groups/{data.pick(data.hot_groups, i)}/members", None), None),
+        ("GET /groups/:id/members", "GET", lambda i: (f"/groups/{data.pick(data.groups, i)}/members", None), None),
+        ("POST /groups", "POST", lambda i: ("/groups", {"name": f"Scale group {i}"}), keep("groups")),
+        ("POST /groups/:id/members", "POST", lambda i: (f"/groups/{scratch}/members", {"userId": made("users", i)["id"]}),
+         None),
+        ("DELETE /groups/:id/members/:userId", "DELETE",
+         lambda i: (f"/groups/{scratch}/members/{made('users', i)['id']}", None), None),
+        ("POST /groups/:id/members/bulk", "POST",
+         lambda i: (f"/groups/{scratch}/members/bulk",
+                    {"remove" if i % 2 else "add": [u["id"] for u in created["users"][:BULK_SIZE]]}), None),
+        # Tasks
+        ("GET /groups/:groupId/tasks (hot)", "GET", lambda i: (f"/groups/{data.pick(data.hot_groups, i)}/tasks", None), None),
+        ("GET /groups/:groupId/tasks?completed=false", "GET",
+         lambda i: (f"/groups/{data.pick(data.hot_groups, i)}/tasks?completed=false", None), None),
+        ("GET /groups/:groupId/tasks/:id", "GET",
+         lambda i: ("/groups/{1}/tasks/{0}".format(*data.pick(data.tasks, i)), None), None),
+        ("GET /tasks", "GET", lambda i: ("/tasks", None), None),
+        ("GET /tasks/stats", "GET", lambda i: ("/tasks/stats", None), None),
+        ("GET /tasks/search", "GET", lambda i: (f"/tasks/search?q={data.pick(TITLE_NOUNS, i)}", None), None),
+        ("GET /tasks/search?groupId (hot)", "GET",
+         lambda i: (f"/tasks/search?q={data.pick(TITLE_NOUNS, i)}&groupId={data.pick(data.hot_groups, i)}", None), None),
+        ("GET /tasks/search?userId", "GET",
+         lambda i: (f"/tasks/search?q={data.pick(TITLE_NOUNS, i)}&userId={data.pick(data.members, i)}", None), None),
+        ("POST /groups/:groupId/tasks", "POST", lambda i: (f"/groups/{scratch}/tasks", {"title": f"Scale task {i}"}),
+         keep("tasks")),
+        ("PATCH /groups/:groupId/tasks/:id", "PATCH",
+         lambda i: (f"/groups/{scratch}/tasks/{made('tasks', i)['id']}", {"title": f"Scale task {i} edited"}), None),
+        ("PATCH /groups/:groupId/tasks/:id/complete", "PATCH",
+         lambda i: (f"/groups/{scratch}/tasks/{made('tasks', i)['id']}/complete", None), None),
+        ("POST /groups/:groupId/tasks/bulk", "POST",
+         lambda i: (f"/groups/{scratch}/tasks/bulk", {"tasks": [{"title": f"Bulk {i}.{j}"} for j in range(BULK_SIZE)]}),
+         keep("bulk")),
+        ("PATCH /groups/:groupId/tasks/bulk", "PATCH",
+         lambda i: (f"/groups/{scratch}/tasks/bulk", {"tasks": [{"id": t["id"], "title": "edited"} for t in made("bulk", i)]}),
+         None),
+        ("PATCH /groups/:groupId/tasks/bulk/complete", "PATCH",
+         lambda i: (f"/groups/{scratch}/tasks/bulk/complete", {"ids": [t["id"] for t in made("bulk", i)]}), None),
+        ("DELETE /groups/:groupId/tasks/:id", "DELETE",
+         lambda i: (f"/groups/{scratch}/tasks/{made('tasks', i)['id']}", None), None),
+        # Deletes last: they remove what the benchmark created above
+        ("DELETE /users/:id", "DELETE", lambda i: (f"/users/{made('users', i)['id']}", None), None),
+        ("DELETE /groups/:id", "DELETE", lambda i: (f"/groups/{made('groups', i)['id']}", None), None),
+    ]
+
+
+def bench_route(recorder, route, method, request, on_success, count, warmup):
+    """Warm up (reads only), then time `count` sequential requests. Returns (seconds, server queries)"""
+    for i in range(warmup if method == "GET" else 0):
+        path, body = request(i)
+        client.request(method, path, json=body)
+    before = scrape_metrics() or {}
+    start = time.perf_counter()
+    for i in range(count):
+        path, body = request(i)
+        sent = time.perf_counter()
+        response = client.request(method, path, json=body)
+        recorder.record(route, time.perf_counter() - sent, response.status_code < 400)
+        if on_success and response.status_code < 400:
+            on_success(i, response.json())
+    seconds = time.perf_counter() - start
+    after = scrape_metrics() or {}
+    queries = sum(q for q, _ in route_queries(before, after).values())
+    return seconds, queries
+
+
+def run_bench(args):
+    db_path = Path(args.db) if args.db else default_db_path()
+    data = BenchData(db_path, args.seed)
+    client.configure(base_url=args.base_url, pool_size=4, retries=0)
+    run = str(int(time.time()))
+    scratch = client.post("/groups", json={"name": f"Scale bench {run}"})
+    if scratch.status_code != 201:
+        sys.exit(f"Cannot create the scratch group: {scratch.status_code} {scratch.text}")
+    state = {"run": run, "scratch_group": scratch.json()["id"]}
+
+    recorder = LatencyRecorder()
+    durations, queries = {}, {}
+    print(f"Benchmarking {args.requests} requests per route against {args.base_url} "
+          f"({', '.join(f'{n} {t}' for t, n in data.counts.items())})")
+    try:
+        for route, method, request, on_success in route_cases(data, state):
+            durations[route], queries[route] = bench_route(
+                recorder, route, method, request, on_success, args.requests, args.warmup)
+            print(f"  {route:<48} {durations[route] * 1000 / args.requests:8.2f}ms avg")
+    finally:
+        client.delete(f"/groups/{state['scratch_group']}")
+
+    routes = {}
+    for route, stats in recorder.summary(1).items():
+        stats["throughput_rps"] = stats["count"] / durations[route] if durations[route] else 0.0
+        stats["queries_per_request"] = queries[route] / stats["count"] if stats["count"] else 0.0
+        routes[route] = stats
+    report = {
+        "run_id": run,
+        "base_url": args.base_url,
+        "dataset": data.counts,
+        "seed": args.seed,
+        "requests_per_route": args.requests,
+        "routes": routes,
+    }
+    print_report(report)
+    output = args.output or f"scale-{run}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+
+def print_report(report):
+    print(f"\n{'route':<48}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>8}{'q/req':>7}{'err':>5}")
+    print("-" * 95)
+    for route, s in report["routes"].items():
+        print(f"{route:<48}{s['p50_ms']:>7.2f}ms{s['p95_ms']:>7.2f}ms{s['p99_ms']:>7.2f}ms"
+              f"{s['throughput_rps']:>8.0f}{s['queries_per_request']:>7.1f}{s['errors']:>5}")
+
+
+def run_compare(args):
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    if before["dataset"] != after["dataset"]:
+        print(f"Warning: datasets differ ({before['dataset']} vs {after['dataset']})")
+    print(f"\n{'route':<48}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}{'change':>9}")
+    print("-" * 105)
+    for route, b in before["routes"].items():
+        a = after["routes"].get(route)
+        if not a:
+            print(f"{route:<48}{'(missing in after)':>24}")
+            continue
+        change = (a["p50_ms"] - b["p50_ms"]) / b["p50_ms"] * 100 if b["p50_ms"] else 0.0
+        print(f"{route:<48}{b['p50_ms']:>10.2f}ms{a['p50_ms']:>10.2f}ms"
+              f"{b['p95_ms']:>10.2f}ms{a['p95_ms']:>10.2f}ms{change:>+8.0f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the database at scale and benchmark every route")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="fill the database with deterministic data")
+    seed_cmd.add_argument("--db", help="SQLite file (default: DATABASE_URL, else ./dev.db)")
+    seed_cmd.add_argument("--users", type=int, default=100000)
+    seed_cmd.add_argument("--groups", type=int, default=10000)
+    seed_cmd.add_argument("--tasks", type=int, default=1000000)
+    seed_cmd.add_argument("--memberships", type=int, default=300000)
+    seed_cmd.add_argument("--seed", type=int, default=42)
+    seed_cmd.add_argument("--reset", action="store_true", help="delete existing rows first")
+
+    run_cmd = commands.add_parser("run", help="benchmark every route against a running server")
+    run_cmd.add_argument("--db", help="seeded SQLite file, read to sample keys (default: DATABASE_URL)")
+    run_cmd.add_argument("--base-url", default="http://localhost:3000")
+    run_cmd.add_argument("--requests", type=int, default=200, help="timed requests per route (default: 200)")
+    run_cmd.add_argument("--warmup", type=int, default=20, help="untimed GETs per route first (default: 20)")
+    run_cmd.add_argument("--seed", type=int, default=42)
+    run_cmd.add_argument("--output", help="report file (default: scale-<run id>.json)")
+
+    compare_cmd = commands.add_parser("compare", help="diff two reports")
+    compare_cmd.add_argument("before")
+    compare_cmd.add_argument("after")
+
+    args = parser.parse_args(argv)
+    if args.command == "seed":
+        if args.memberships > args.users * args.groups:
+            parser.error("--memberships cannot exceed --users x --groups")
+        run_seed(args)
+    elif args.command == "run":
+        run_bench(args)
+    else:
+        run_compare(args)
+
+
+if __name__ == "__main__":
+    main()
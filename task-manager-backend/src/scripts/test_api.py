@@ -3,11 +3,30 @@
 Automated API Test Script for Task Manager Backend
 Run with: python test_api.py
 Make sure the server is running on localhost:3000
+
+Sections are independent and can run in parallel, each under its own
+email/name namespace:
+    python test_api.py --jobs 8 [--pool process] [--sections 4,7,8]
+
+Benchmark mode replays the same flows concurrently and reports latency:
+    python test_api.py --bench --workers 16 --rate 200 --duration 60
 """
 
+import argparse
+import json
+import random
+import re
 import requests
+import socket
 import sys
+import threading
 import time
+import traceback
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from api_client import IDEMPOTENCY_HEADER, ApiClient
 
 BASE_URL = "http://localhost:3000"
 
@@ -22,36 +41,211 @@ BLUE = "\033[94m"
 CYAN = "\033[96m"
 RESET = "\033[0m"
 
-passed = 0
+passed = 0  # outside the suite (--perf); suite sections count in their SectionResult
 failed = 0
+section_metrics = None  # SectionMetrics while the functional suite runs with --jobs 1
+
+
+class SectionResult:
+    """Counts, failures, wall time and (when not live) buffered output of one section"""
+
+    def __init__(self, number, title, live):
+        self.number = number
+        self.title = title
+        self.live = live
+        self.passed = 0
+        self.failed = 0
+        self.failures = []
+        self.output = []
+        self.seconds = 0.0
+
+
+# Each pool thread runs one section at a time; logging goes to that section
+_current = threading.local()
+_lock = threading.Lock()
+
+
+class ThreadClient:
+    """The shared ApiClient, unless the calling thread installed its own with
+    use_client(). Any object with ApiClient's request/get/post/put/patch/delete
+    methods, returning requests-like responses, can run the sections; the
+    asyncio driver (async_driver.py) installs one backed by aiohttp."""
+
+    def __init__(self, default):
+        self.default = default
+
+    def __getattr__(self, name):
+        return getattr(getattr(_current, "client", None) or self.default, name)
+
+
+def use_client(override):
+    """Route this thread's requests through `override` (None restores the shared client)"""
+    _current.client = override
+
+
+# Shared keep-alive client; every helper routes through it
+client = ThreadClient(ApiClient(BASE_URL))
+
+
+def emit(text):
+    section = getattr(_current, "section", None)
+    if section is not None and not section.live:
+        section.output.append(text)
+    else:
+        with _lock:
+            print(text)
 
 
 def log_pass(message):
     global passed
-    passed += 1
-    print(f"{GREEN}[PASS]{RESET} {message}")
+    section = getattr(_current, "section", None)
+    if section is not None:
+        section.passed += 1
+    else:
+        with _lock:
+            passed += 1
+    emit(f"{GREEN}[PASS]{RESET} {message}")
 
 
 def log_fail(message, details=""):
     global failed
-    failed += 1
-    print(f"{RED}[FAIL]{RESET} {message}")
-    if details:
-        print(f"       {details}")
+    section = getattr(_current, "section", None)
+    if section is not None:
+        section.failed += 1
+        section.failures.append(f"{message} {details}".strip())
+    else:
+        with _lock:
+            failed += 1
+    emit(f"{RED}[FAIL]{RESET} {message}" + (f"\n       {details}" if details else ""))
 
 
 def log_section(title):
-    print(f"\n{BLUE}{'='*60}")
-    print(f" {title}")
-    print(f"{'='*60}{RESET}\n")
+    if section_metrics:
+        section_metrics.start(title)
+    emit(f"\n{BLUE}{'='*60}\n {title}\n{'='*60}{RESET}\n")
 
 
 def log_subsection(title):
-    print(f"\n{CYAN}--- {title} ---{RESET}\n")
+    emit(f"\n{CYAN}--- {title} ---{RESET}\n")
 
 
 def log_info(message):
-    print(f"{YELLOW}[INFO]{RESET} {message}")
+    emit(f"{YELLOW}[INFO]{RESET} {message}")
+
+
+def log_connection_stats():
+    stats = client.stats()
+    log_info(f"HTTP: {stats['requests']} requests over {stats['connections_opened']} connections "
+             f"({stats['reuse_ratio'] * 100:.1f}% reused, {stats['retries']} retries)")
+    return stats
+
+
+# ============================================
+# SERVER METRICS
+# ============================================
+METRIC_LINE = re.compile(r"^(\w+)(?:\{(.*)\})?\s+(\S+)$")
+METRIC_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+N_PLUS_ONE_THRESHOLD = 10  # queries per request worth a closer look
+
+
+def scrape_metrics():
+    """Parse /metrics into {(name, labels): value}; None if the server has no metrics"""
+    try:
+        response = client.get("/metrics")
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    samples = {}
+    for line in response.text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples[(name, tuple(METRIC_LABEL.findall(labels or "")))] = float(value)
+    return samples
+
+
+def route_queries(before, after):
+    """Per-route [queries, requests] issued between two scrapes (the scrapes themselves excluded)"""
+    routes = {}
+    for (name, labels), value in after.items():
+        if name not in ("http_request_queries_sum", "http_request_queries_count"):
+            continue
+        delta = value - before.get((name, labels), 0)
+        label = dict(labels)
+        if not delta or label.get("route") == "/metrics":
+            continue
+        counts = routes.setdefault(f"{label.get('method')} {label.get('route')}", [0, 0])
+        counts[0 if name.endswith("_sum") else 1] += delta
+    return routes
+
+
+class SectionMetrics:
+    """Scrapes /metrics at each section boundary and attributes queries to the section that ended"""
+
+    def __init__(self, baseline):
+        self.last = baseline
+        self.current = None
+        self.sections = []
+
+    def start(self, title):
+        self.finish()
+        self.current = title
+
+    def finish(self):
+        if self.current is None:
+            return
+        now = scrape_metrics() or self.last
+        routes = route_queries(self.last, now)
+        self.sections.append((self.current, routes))
+        self.last, self.current = now, None
+        queries = sum(q for q, _ in routes.values())
+        requests_seen = sum(r for _, r in routes.values())
+        if requests_seen:
+            log_info(f"Server: {queries:.0f} queries over {requests_seen:.0f} requests "
+                     f"({queries / requests_seen:.1f}/request)")
+
+    def report(self):
+        self.finish()
+        print(f"\n{'section':<52}{'requests':>10}{'queries':>10}{'q/req':>8}")
+        totals = {}
+        for title, routes in self.sections:
+            queries = sum(q for q, _ in routes.values())
+            requests_seen = sum(r for _, r in routes.values())
+            ratio = queries / requests_seen if requests_seen else 0
+            print(f"{title[:51]:<52}{requests_seen:>10.0f}{queries:>10.0f}{ratio:>8.1f}")
+            for route, (q, r) in routes.items():
+                total = totals.setdefault(route, [0, 0])
+                total[0] += q
+                total[1] += r
+        heavy = {route: q / r for route, (q, r) in totals.items() if r and q / r > N_PLUS_ONE_THRESHOLD}
+        for route, ratio in sorted(heavy.items(), key=lambda item: -item[1]):
+            log_info(f"{route}: {ratio:.1f} queries/request (possible N+1)")
+
+
+# ============================================
+# PAGINATION
+# ============================================
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def fetch_pages(path, params=None, page_size=None):
+    """Follow X-Next-Cursor to the last page. Returns (items, pages, status); items is None on error"""
+    params = {k: str(v).lower() if isinstance(v, bool) else v
+              for k, v in (params or {}).items() if v is not None}
+    if page_size:
+        params["limit"] = page_size
+    items, pages = [], 0
+    while True:
+        response = client.get(path, params=params)
+        if response.status_code != 200:
+            return None, pages, response.status_code
+        items.extend(response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return items, pages, response.status_code
+        params["cursor"] = cursor
 
 
 # ============================================
@@ -59,7 +253,7 @@ def log_info(message):
 # ============================================
 def test_create_user(name, email):
     """Create a user and return the user object"""
-    response = requests.post(f"{BASE_URL}/users", json={
+    response = client.post("/users", json={
         "name": name,
         "email": email
     })
@@ -71,21 +265,20 @@ def test_create_user(name, email):
         return None
 
 
-def test_get_all_users():
-    """Get all users"""
-    response = requests.get(f"{BASE_URL}/users")
-    if response.status_code == 200:
-        users = response.json()
-        log_pass(f"Get all users (found {len(users)})")
+def test_get_all_users(page_size=None, **filters):
+    """Get all users, walking every page"""
+    users, pages, status = fetch_pages("/users", filters, page_size)
+    if users is not None:
+        log_pass(f"Get all users (found {len(users)} in {pages} page(s))")
         return users
     else:
-        log_fail("Get all users", f"Status: {response.status_code}")
+        log_fail("Get all users", f"Status: {status}")
         return []
 
 
 def test_get_user_by_id(user_id):
     """Get user by ID"""
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
+    response = client.get(f"/users/{user_id}")
     if response.status_code == 200:
         log_pass(f"Get user by ID: {user_id}")
         return response.json()
@@ -102,7 +295,7 @@ def test_update_user(user_id, name=None, email=None):
     if email:
         data["email"] = email
 
-    response = requests.put(f"{BASE_URL}/users/{user_id}", json=data)
+    response = client.put(f"/users/{user_id}", json=data)
     if response.status_code == 200:
         log_pass(f"Updated user {user_id}")
         return response.json()
@@ -113,7 +306,7 @@ def test_update_user(user_id, name=None, email=None):
 
 def test_get_user_groups(user_id):
     """Get groups that a user belongs to"""
-    response = requests.get(f"{BASE_URL}/users/{user_id}/groups")
+    response = client.get(f"/users/{user_id}/groups")
     if response.status_code == 200:
         result = response.json()
         groups = result.get("groups", []) if result else []
@@ -124,9 +317,33 @@ def test_get_user_groups(user_id):
         return None
 
 
+def test_get_user_tasks(user_id, page_size=None, **filters):
+    """Tasks across all of a user's groups via GET /users/:id/tasks, walking every page"""
+    tasks, pages, status = fetch_pages(f"/users/{user_id}/tasks", filters, page_size)
+    if tasks is not None:
+        log_pass(f"Get tasks for user {user_id} (found {len(tasks)} in {pages} page(s))")
+        return tasks
+    else:
+        log_fail(f"Get tasks for user {user_id}", f"Status: {status}")
+        return []
+
+
+def user_tasks_by_fan_out(user_id, **filters):
+    """The client-side alternative: list the user's groups, then each group's tasks. Returns (tasks, requests)"""
+    response = client.get(f"/users/{user_id}/groups")
+    if response.status_code != 200:
+        return None, 1
+    requests_made, tasks = 1, []
+    for membership in response.json()["groups"]:
+        items, pages, _ = fetch_pages(f"/groups/{membership['group']['id']}/tasks", filters)
+        requests_made += pages
+        tasks.extend(items or [])
+    return sorted(tasks, key=lambda t: t["id"]), requests_made
+
+
 def test_delete_user(user_id):
     """Delete user by ID"""
-    response = requests.delete(f"{BASE_URL}/users/{user_id}")
+    response = client.delete(f"/users/{user_id}")
     if response.status_code == 200:
         log_pass(f"Deleted user: {user_id}")
         return response.json()
@@ -137,7 +354,7 @@ def test_delete_user(user_id):
 
 def test_get_user_not_found(user_id):
     """Test 404 for non-existent user"""
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
+    response = client.get(f"/users/{user_id}")
     if response.status_code == 404:
         log_pass(f"User not found returns 404 (ID: {user_id})")
         return True
@@ -148,7 +365,7 @@ def test_get_user_not_found(user_id):
 
 def test_user_exists(user_id):
     """Check if user exists (returns True/False, no logging)"""
-    response = requests.get(f"{BASE_URL}/users/{user_id}")
+    response = client.get(f"/users/{user_id}")
     return response.status_code == 200
 
 
@@ -161,7 +378,7 @@ def test_create_group(name, description=None):
     if description:
         data["description"] = description
 
-    response = requests.post(f"{BASE_URL}/groups", json=data)
+    response = client.post("/groups", json=data)
     if response.status_code == 201:
         log_pass(f"Created group: {name}")
         return response.json()
@@ -170,21 +387,20 @@ def test_create_group(name, description=None):
         return None
 
 
-def test_get_all_groups():
-    """Get all groups"""
-    response = requests.get(f"{BASE_URL}/groups")
-    if response.status_code == 200:
-        groups = response.json()
-        log_pass(f"Get all groups (found {len(groups)})")
+def test_get_all_groups(page_size=None, **filters):
+    """Get all groups, walking every page"""
+    groups, pages, status = fetch_pages("/groups", filters, page_size)
+    if groups is not None:
+        log_pass(f"Get all groups (found {len(groups)} in {pages} page(s))")
         return groups
     else:
-        log_fail("Get all groups", f"Status: {response.status_code}")
+        log_fail("Get all groups", f"Status: {status}")
         return []
 
 
 def test_get_group_by_id(group_id):
     """Get group by ID"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}")
+    response = client.get(f"/groups/{group_id}")
     if response.status_code == 200:
         log_pass(f"Get group by ID: {group_id}")
         return response.json()
@@ -195,7 +411,7 @@ def test_get_group_by_id(group_id):
 
 def test_delete_group(group_id):
     """Delete group by ID"""
-    response = requests.delete(f"{BASE_URL}/groups/{group_id}")
+    response = client.delete(f"/groups/{group_id}")
     if response.status_code == 200:
         log_pass(f"Deleted group: {group_id}")
         return True
@@ -206,7 +422,7 @@ def test_delete_group(group_id):
 
 def test_get_group_not_found(group_id):
     """Test 404 for non-existent group"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}")
+    response = client.get(f"/groups/{group_id}")
     if response.status_code == 404:
         log_pass(f"Group not found returns 404 (ID: {group_id})")
         return True
@@ -217,7 +433,7 @@ def test_get_group_not_found(group_id):
 
 def test_group_exists(group_id):
     """Check if group exists (returns True/False, no logging)"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}")
+    response = client.get(f"/groups/{group_id}")
     return response.status_code == 200
 
 
@@ -226,7 +442,7 @@ def test_group_exists(group_id):
 # ============================================
 def test_add_member(group_id, user_id):
     """Add a member to a group"""
-    response = requests.post(f"{BASE_URL}/groups/{group_id}/members", json={
+    response = client.post(f"/groups/{group_id}/members", json={
         "userId": user_id
     })
     if response.status_code == 201:
@@ -237,21 +453,20 @@ def test_add_member(group_id, user_id):
         return None
 
 
-def test_get_members(group_id):
-    """Get all members of a group"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}/members")
-    if response.status_code == 200:
-        members = response.json()
-        log_pass(f"Get members of group {group_id} (found {len(members)})")
+def test_get_members(group_id, page_size=None, **filters):
+    """Get all members of a group, walking every page"""
+    members, pages, status = fetch_pages(f"/groups/{group_id}/members", filters, page_size)
+    if members is not None:
+        log_pass(f"Get members of group {group_id} (found {len(members)} in {pages} page(s))")
         return members
     else:
-        log_fail(f"Get members of group {group_id}", f"Status: {response.status_code}")
+        log_fail(f"Get members of group {group_id}", f"Status: {status}")
         return []
 
 
 def test_delete_member(group_id, user_id):
     """Remove a member from a group"""
-    response = requests.delete(f"{BASE_URL}/groups/{group_id}/members/{user_id}")
+    response = client.delete(f"/groups/{group_id}/members/{user_id}")
     if response.status_code == 200:
         log_pass(f"Removed user {user_id} from group {group_id}")
         return True
@@ -260,6 +475,24 @@ def test_delete_member(group_id, user_id):
         return False
 
 
+def test_bulk_members(group_id, add=None, remove=None):
+    """Add/remove many members in one request; returns {added, removed, results} or None"""
+    body = {k: v for k, v in (("add", add), ("remove", remove)) if v is not None}
+    response = client.post(f"/groups/{group_id}/members/bulk", json=body)
+    if response.status_code == 200:
+        result = response.json()
+        log_pass(f"Bulk members in group {group_id}: +{result['added']} -{result['removed']}")
+        return result
+    else:
+        log_fail(f"Bulk members in group {group_id}", f"Status: {response.status_code}, Body: {response.text}")
+        return None
+
+
+def member_statuses(result):
+    """{(action, userId): status} from a bulk members response"""
+    return {(r["action"], r["userId"]): r["status"] for r in (result or {}).get("results", [])}
+
+
 # ============================================
 # TASK TESTS
 # ============================================
@@ -269,7 +502,7 @@ def test_create_task(group_id, title, description=None):
     if description:
         data["description"] = description
 
-    response = requests.post(f"{BASE_URL}/groups/{group_id}/tasks", json=data)
+    response = client.post(f"/groups/{group_id}/tasks", json=data)
     if response.status_code == 201:
         log_pass(f"Created task: {title}")
         return response.json()
@@ -278,21 +511,77 @@ def test_create_task(group_id, title, description=None):
         return None
 
 
-def test_get_tasks_by_group(group_id):
-    """Get all tasks for a group"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}/tasks")
-    if response.status_code == 200:
-        tasks = response.json()
-        log_pass(f"Get tasks for group {group_id} (found {len(tasks)})")
+def test_get_tasks_by_group(group_id, page_size=None, **filters):
+    """Get all tasks for a group, walking every page (filters: completed, fields, createdAfter, ...)"""
+    tasks, pages, status = fetch_pages(f"/groups/{group_id}/tasks", filters, page_size)
+    if tasks is not None:
+        log_pass(f"Get tasks for group {group_id} (found {len(tasks)} in {pages} page(s))")
         return tasks
     else:
-        log_fail(f"Get tasks for group {group_id}", f"Status: {response.status_code}")
+        log_fail(f"Get tasks for group {group_id}", f"Status: {status}")
+        return []
+
+
+def test_get_all_tasks(page_size=None, **filters):
+    """Get tasks across all groups via GET /tasks, walking every page (filters: groupId, completed, ...)"""
+    tasks, pages, status = fetch_pages("/tasks", filters, page_size)
+    if tasks is not None:
+        log_pass(f"Get all tasks {filters or ''}(found {len(tasks)} in {pages} page(s))")
+        return tasks
+    else:
+        log_fail("Get all tasks", f"Status: {status}")
+        return []
+
+
+def test_get_task_stats(page_size=None, **filters):
+    """Per-group {groupId, name, total, completed} via GET /tasks/stats, keyed by group ID"""
+    stats, pages, status = fetch_pages("/tasks/stats", filters, page_size)
+    if stats is not None:
+        log_pass(f"Get task stats for {len(stats)} group(s) in {pages} page(s)")
+        return {entry["groupId"]: entry for entry in stats}
+    else:
+        log_fail("Get task stats", f"Status: {status}")
+        return {}
+
+
+def test_list_rejected(path, params, label):
+    """Invalid list parameters are rejected with 400"""
+    response = client.get(path, params=params)
+    if response.status_code == 400:
+        log_pass(f"{label} returns 400")
+        return True
+    else:
+        log_fail(f"{label} should return 400", f"Got: {response.status_code}")
+        return False
+
+
+def idempotent_post(path, json, key):
+    """POST with an Idempotency-Key. Returns (status, body, replayed)"""
+    response = client.post(path, json=json, headers={IDEMPOTENCY_HEADER: key})
+    body = response.json() if response.content else None
+    return response.status_code, body, response.headers.get("Idempotent-Replayed") == "true"
+
+
+def get_idempotency_stats():
+    """Stored keys and replay counters (GET /idempotency/stats)"""
+    response = client.get("/idempotency/stats")
+    return response.json() if response.status_code == 200 else None
+
+
+def test_search_tasks(q, page_size=None, **scope):
+    """Ranked full-text search via GET /tasks/search, walking every page (scope: groupId, userId, fields)"""
+    tasks, pages, status = fetch_pages("/tasks/search", {"q": q, **scope}, page_size)
+    if tasks is not None:
+        log_pass(f"Search {q!r} {scope or ''}(found {len(tasks)} in {pages} page(s))")
+        return tasks
+    else:
+        log_fail(f"Search {q!r}", f"Status: {status}")
         return []
 
 
 def test_get_task_by_id(group_id, task_id):
     """Get task by ID"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}")
+    response = client.get(f"/groups/{group_id}/tasks/{task_id}")
     if response.status_code == 200:
         log_pass(f"Get task by ID: {task_id}")
         return response.json()
@@ -311,7 +600,7 @@ def test_update_task(group_id, task_id, title=None, description=None, completed=
     if completed is not None:
         data["completed"] = completed
 
-    response = requests.patch(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}", json=data)
+    response = client.patch(f"/groups/{group_id}/tasks/{task_id}", json=data)
     if response.status_code == 200:
         log_pass(f"Updated task {task_id}")
         return response.json()
@@ -322,7 +611,7 @@ def test_update_task(group_id, task_id, title=None, description=None, completed=
 
 def test_complete_task(group_id, task_id):
     """Mark task as complete using PATCH /complete endpoint"""
-    response = requests.patch(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}/complete")
+    response = client.patch(f"/groups/{group_id}/tasks/{task_id}/complete")
     if response.status_code == 200:
         log_pass(f"Marked task {task_id} as complete")
         return response.json()
@@ -333,7 +622,7 @@ def test_complete_task(group_id, task_id):
 
 def test_delete_task(group_id, task_id):
     """Delete task"""
-    response = requests.delete(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}")
+    response = client.delete(f"/groups/{group_id}/tasks/{task_id}")
     if response.status_code == 200:
         log_pass(f"Deleted task: {task_id}")
         return True
@@ -344,7 +633,7 @@ def test_delete_task(group_id, task_id):
 
 def test_get_task_not_found(group_id, task_id):
     """Test 404 for non-existent task"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}")
+    response = client.get(f"/groups/{group_id}/tasks/{task_id}")
     if response.status_code == 404:
         log_pass(f"Task not found returns 404 (ID: {task_id})")
         return True
@@ -353,57 +642,1140 @@ def test_get_task_not_found(group_id, task_id):
         return False
 
 
+def test_mutation_not_found(method, path, json=None, expect_in_message="not found"):
+    """Test that a write against a missing resource returns 404 with a not-found message"""
+    response = client.request(method, path, json=json)
+    message = response.json().get("message", "") if response.content else ""
+    if response.status_code == 404 and expect_in_message in str(message):
+        log_pass(f"{method} {path} returns 404 ({message})")
+        return True
+    else:
+        log_fail(f"{method} {path} should return 404", f"Got: {response.status_code}, Body: {response.text}")
+        return False
+
+
 def test_task_exists(group_id, task_id):
     """Check if task exists (returns True/False, no logging)"""
-    response = requests.get(f"{BASE_URL}/groups/{group_id}/tasks/{task_id}")
+    response = client.get(f"/groups/{group_id}/tasks/{task_id}")
     return response.status_code == 200
 
 
 # ============================================
-# MAIN TEST RUNNER
+# BULK TASK TESTS
 # ============================================
-def run_all_tests():
-    print(f"\n{BLUE}{'#'*60}")
-    print(f"  TASK MANAGER API - COMPREHENSIVE TEST SUITE")
-    print(f"  Server: {BASE_URL}")
-    print(f"{'#'*60}{RESET}")
+BULK_CHUNK = 10000  # server-side MAX_BULK_TASKS
+
+
+def test_bulk_create_tasks(group_id, tasks):
+    """Create many tasks in one request; `tasks` is a list of {title, description?}"""
+    response = client.post(f"/groups/{group_id}/tasks/bulk", json={"tasks": tasks})
+    if response.status_code == 201:
+        created = response.json()
+        log_pass(f"Bulk created {len(created)} tasks in group {group_id}")
+        return created
+    else:
+        log_fail(f"Bulk create {len(tasks)} tasks", f"Status: {response.status_code}, Body: {response.text}")
+        return []
+
 
-    # Check if server is running
+def test_bulk_update_tasks(group_id, updates):
+    """Apply per-task partial updates; `updates` is a list of {id, title?, description?, completed?}"""
+    response = client.patch(f"/groups/{group_id}/tasks/bulk", json={"tasks": updates})
+    if response.status_code == 200:
+        updated = response.json()
+        log_pass(f"Bulk updated {len(updated)} tasks in group {group_id}")
+        return updated
+    else:
+        log_fail(f"Bulk update {len(updates)} tasks", f"Status: {response.status_code}, Body: {response.text}")
+        return []
+
+
+def test_bulk_complete_tasks(group_id, task_ids):
+    """Mark many tasks complete; returns the number of tasks completed"""
+    response = client.patch(f"/groups/{group_id}/tasks/bulk/complete", json={"ids": task_ids})
+    if response.status_code == 200:
+        count = response.json().get("count", 0)
+        log_pass(f"Bulk completed {count} tasks in group {group_id}")
+        return count
+    else:
+        log_fail(f"Bulk complete {len(task_ids)} tasks", f"Status: {response.status_code}, Body: {response.text}")
+        return 0
+
+
+def test_bulk_not_found(group_id, task_id):
+    """Bulk complete with an unknown ID is rejected as a whole with 404"""
+    response = client.patch(f"/groups/{group_id}/tasks/bulk/complete", json={"ids": [task_id, 99999999]})
+    if response.status_code == 404 and not (test_get_task_by_id(group_id, task_id) or {}).get("completed"):
+        log_pass("Bulk complete with unknown ID returns 404 and rolls back")
+        return True
+    else:
+        log_fail("Bulk complete with unknown ID should 404 and roll back", f"Got: {response.status_code}")
+        return False
+
+
+# ============================================
+# COMPRESSION AND STREAMING
+# ============================================
+NDJSON = "application/x-ndjson"
+
+
+def supported_encodings():
+    """Encodings this client can decode (brotli needs the optional brotli package)"""
     try:
-        requests.get(f"{BASE_URL}/users", timeout=5)
-    except requests.exceptions.ConnectionError:
-        print(f"\n{RED}ERROR: Cannot connect to server at {BASE_URL}")
-        print(f"Make sure the server is running with: npm run start:dev{RESET}\n")
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        return ["gzip"]
+    return [e for e in ("br", "gzip") if e in ACCEPT_ENCODING]
+
+
+def fetch_wire_size(path, params=None, encoding="identity"):
+    """GET with one Accept-Encoding; returns (status, Content-Encoding, bytes on the wire, decoded bytes)"""
+    response = client.get(path, params=params, headers={"Accept-Encoding": encoding}, stream=True)
+    body = response.content
+    return response.status_code, response.headers.get("Content-Encoding"), response.raw.tell(), len(body)
+
+
+def stream_ndjson(path, params=None, encoding="gzip", on_row=None):
+    """Read an NDJSON response line by line without holding the body; returns (rows, bytes on the wire)"""
+    params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in (params or {}).items()}
+    response = client.get(path, params=params, stream=True,
+                          headers={"Accept": NDJSON, "Accept-Encoding": encoding})
+    if response.status_code != 200 or not response.headers.get("Content-Type", "").startswith(NDJSON):
+        response.close()
+        return None, 0
+    rows = 0
+    for line in response.iter_lines():
+        if line:
+            rows += 1
+            if on_row:
+                on_row(json.loads(line))
+    return rows, response.raw.tell()
+
+
+def test_stream_ndjson(path, expected, params=None, encoding="gzip"):
+    """Stream `path` as NDJSON and check every row arrives in ID order"""
+    ids = []
+    rows, wire = stream_ndjson(path, params, encoding, on_row=lambda row: ids.append(row.get("id", row.get("userId"))))
+    if rows == expected and ids == sorted(ids):
+        log_pass(f"Streamed {rows} rows from {path} as NDJSON ({wire / 1024:.1f} KiB on the wire, {encoding})")
+        return True
+    else:
+        log_fail(f"Stream {path} as NDJSON", f"Expected {expected} ordered rows, got {rows}")
+        return False
+
+
+# ============================================
+# GROUP ARCHIVES
+# ============================================
+ARCHIVE_UPLOAD_CHUNK = 64 * 1024
+IMPORT_BATCH = 1000  # server-side IMPORT_BATCH_SIZE
+
+
+def open_export(group_id, encoding="gzip"):
+    """Start streaming GET /groups/:id/export; returns the open response or None"""
+    response = client.get(f"/groups/{group_id}/export", stream=True, headers={"Accept-Encoding": encoding})
+    if response.status_code == 200 and response.headers.get("Content-Type", "").startswith(NDJSON):
+        return response
+    log_fail(f"Export group {group_id}", f"Status: {response.status_code}")
+    response.close()
+    return None
+
+
+def archive_chunks(lines, counts, encoding=None):
+    """Regroup archive lines into upload-sized chunks, counting records by type; gzip them if asked"""
+    compressor = zlib.compressobj(wbits=31) if encoding == "gzip" else None  # wbits=31: gzip container
+    pending, size = [], 0
+    for line in lines:
+        if not line:
+            continue
+        record_type = json.loads(line).get("type")
+        counts[record_type] = counts.get(record_type, 0) + 1
+        pending.append(line + b"\n")
+        size += len(line) + 1
+        if size >= ARCHIVE_UPLOAD_CHUNK:
+            data = b"".join(pending)
+            pending, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+    data = b"".join(pending)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def test_import_group(chunks, encoding=None):
+    """POST /groups/import with an archive streamed from `chunks`; returns the import result or None"""
+    headers = {"Content-Type": NDJSON}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    response = client.post("/groups/import", data=chunks, headers=headers)
+    if response.status_code == 201:
+        result = response.json()
+        log_pass(f"Imported group {result['sourceGroupId']} as {result['group']['id']}: "
+                 f"{result['members']} members, {result['tasks']} tasks")
+        return result
+    else:
+        log_fail("Import group", f"Status: {response.status_code}, Body: {response.text[:200]}")
+        return None
+
+
+def test_import_rejected(records, label, expected=400, content_type=NDJSON):
+    """An archive that cannot be imported is refused with `expected`"""
+    body = "".join(line if isinstance(line, str) else json.dumps(line) + "\n" for line in records)
+    response = client.post("/groups/import", data=body.encode(), headers={"Content-Type": content_type})
+    if response.status_code == expected:
+        log_pass(f"Import {label} returns {expected} ({response.json().get('message')})")
+        return True
+    else:
+        log_fail(f"Import {label} should return {expected}", f"Got: {response.status_code}, Body: {response.text[:200]}")
+        return False
+
+
+# ============================================
+# CONDITIONAL GET
+# ============================================
+def fetch_validators(path):
+    """GET path; returns (ETag, Last-Modified) or (None, None) on error"""
+    response = client.get(path)
+    if response.status_code != 200:
+        return None, None
+    return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def test_not_modified(path, etag=None, last_modified=None):
+    """Revalidation with an unchanged validator returns 304 and no body"""
+    headers = {"If-None-Match": etag} if etag else {"If-Modified-Since": last_modified}
+    response = client.get(path, headers=headers)
+    if response.status_code == 304 and not response.content:
+        log_pass(f"GET {path} revalidates to 304 ({'ETag' if etag else 'Last-Modified'})")
+        return True
+    else:
+        log_fail(f"GET {path} should be 304", f"Got: {response.status_code}")
+        return False
+
+
+def test_modified(path, etag, reason):
+    """Revalidation after a change returns 200 with a new ETag; returns the new ETag"""
+    response = client.get(path, headers={"If-None-Match": etag})
+    new_etag = response.headers.get("ETag")
+    if response.status_code == 200 and new_etag and new_etag != etag:
+        log_pass(f"GET {path} returns 200 with a new ETag after {reason}")
+        return new_etag
+    else:
+        log_fail(f"GET {path} should be 200 after {reason}", f"Got: {response.status_code}, ETag: {new_etag}")
+        return etag
+
+
+# ============================================
+# CHANGE FEED
+# ============================================
+class EventSubscriber:
+    """Reads a group's server-sent change feed on a background thread"""
+
+    def __init__(self, group_id, last_event_id=None):
+        headers = {"Accept": "text/event-stream"}
+        if last_event_id:
+            headers["Last-Event-ID"] = last_event_id
+        self.events = []
+        self._changed = threading.Condition()
+        self.response = client.get(f"/groups/{group_id}/events", headers=headers, stream=True)
+        self.status = self.response.status_code
+        if self.status == 200:
+            threading.Thread(target=self._read, daemon=True).start()
+        else:
+            self.response.close()
+
+    def _read(self):
+        fields = {}
+        try:
+            for line in self.response.iter_lines(decode_unicode=True):
+                if line:
+                    name, _, value = line.partition(":")
+                    if name:  # lines starting with ':' are heartbeats
+                        fields[name] = value[1:] if value.startswith(" ") else value
+                elif "data" in fields:
+                    with self._changed:
+                        self.events.append({"id": fields.get("id"), "type": fields.get("event", "message"),
+                                            "data": json.loads(fields["data"])})
+                        self._changed.notify_all()
+                    fields = {}
+        except (requests.exceptions.RequestException, AttributeError, ValueError):
+            pass  # closed by close() or by the server
+
+    def wait_for(self, count, timeout=5):
+        """Block until at least `count` events arrived; returns a copy of them"""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.events) >= count, timeout)
+            return list(self.events)
+
+    def last_event_id(self):
+        with self._changed:
+            return next((e["id"] for e in reversed(self.events) if e["id"]), None)
+
+    def close(self):
+        # Shut the socket down first: closing the response while the reader
+        # thread is blocked in recv() would wait for the next event.
+        sock = getattr(getattr(self.response.raw, "connection", None), "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.response.close()
+
+
+def event_types(events):
+    return [event["type"] for event in events]
+
+
+def test_receives_events(subscriber, expected_types, label):
+    """The subscriber sees exactly `expected_types`, in order; returns the events"""
+    events = subscriber.wait_for(len(expected_types))
+    if event_types(events) == expected_types:
+        log_pass(f"Change feed delivered {label}: {', '.join(expected_types)}")
+    else:
+        log_fail(f"Change feed for {label}", f"Expected {expected_types}, got {event_types(events)}")
+    return events
+
+
+# ============================================
+# CACHE TESTS
+# ============================================
+def get_cache_stats():
+    """Lookup cache counters keyed by cache name ({} if unavailable)"""
+    response = client.get("/cache/stats")
+    return response.json() if response.status_code == 200 else {}
+
+
+def cache_counter(stats, name, counter):
+    return stats.get(name, {}).get(counter, 0)
+
+
+def test_warm_lookups(group_id, user_id, rounds=3):
+    """Hit the cached getById paths a few times so later reads come from the cache"""
+    for _ in range(rounds):
+        client.get(f"/groups/{group_id}")
+        client.get(f"/groups/{group_id}/members")
+        client.get(f"/users/{user_id}")
+
+
+# ============================================
+# BENCHMARK MODE
+# ============================================
+class LatencyRecorder:
+    """Thread-safe per-endpoint latency and error collector"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._errors = {}
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self._samples.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self, wall_seconds):
+        """Return {endpoint: stats} with latencies in milliseconds"""
+        with self._lock:
+            samples = {k: sorted(v) for k, v in self._samples.items()}
+            errors = dict(self._errors)
+
+        endpoints = {}
+        for endpoint, values in sorted(samples.items()):
+            count = len(values)
+            endpoints[endpoint] = {
+                "count": count,
+                "errors": errors.get(endpoint, 0),
+                "error_rate": errors.get(endpoint, 0) / count,
+                "throughput_rps": count / wall_seconds if wall_seconds else 0.0,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        return endpoints
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class RateLimiter:
+    """Spaces requests evenly so all workers together hit the target rate"""
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.perf_counter()
+
+    def wait(self):
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class BenchSession:
+    """Issues timed requests on behalf of the benchmark workers"""
+
+    def __init__(self, recorder, limiter):
+        self.recorder = recorder
+        self.limiter = limiter
+
+    def call(self, method, endpoint, path, expected, **kwargs):
+        """Send one request, record it under `endpoint`, return parsed JSON or None.
+        POSTs carry a fresh Idempotency-Key, so the client may retry them safely."""
+        if method == "POST":
+            kwargs["headers"] = {IDEMPOTENCY_HEADER: uuid.uuid4().hex, **kwargs.get("headers", {})}
+        self.limiter.wait()
+        start = time.perf_counter()
+        try:
+            response = client.request(method, path, **kwargs)
+            ok = response.status_code == expected
+        except requests.exceptions.RequestException:
+            response = None
+            ok = False
+        self.recorder.record(endpoint, time.perf_counter() - start, ok)
+        if not ok:
+            return None
+        return response.json() if response.content else {}
+
+
+def bench_flow(session, worker_id, iteration):
+    """One pass over the users -> members -> tasks -> cascade delete flow"""
+    ns = f"{TEST_RUN_ID}_w{worker_id}_i{iteration}"
+    call = session.call
+
+    owner = call("POST", "POST /users", "/users", 201,
+                 json={"name": "Bench Owner", "email": f"owner_{ns}@example.com"})
+    peer = call("POST", "POST /users", "/users", 201,
+                json={"name": "Bench Peer", "email": f"peer_{ns}@example.com"})
+    team = call("POST", "POST /groups", "/groups", 201, json={"name": f"Bench Team {ns}"})
+    solo = call("POST", "POST /groups", "/groups", 201, json={"name": f"Bench Solo {ns}"})
+
+    if owner and peer and team and solo:
+        add_member = "POST /groups/:id/members"
+        call("POST", add_member, f"/groups/{team['id']}/members", 201, json={"userId": owner["id"]})
+        call("POST", add_member, f"/groups/{team['id']}/members", 201, json={"userId": peer["id"]})
+        call("POST", add_member, f"/groups/{solo['id']}/members", 201, json={"userId": owner["id"]})
+        call("GET", "GET /groups/:id/members", f"/groups/{team['id']}/members", 200)
+        call("GET", "GET /users/:id/groups", f"/users/{owner['id']}/groups", 200)
+
+        tasks = f"/groups/{team['id']}/tasks"
+        task = call("POST", "POST /groups/:groupId/tasks", tasks, 201,
+                    json={"title": "Bench task", "description": ns})
+        call("POST", "POST /groups/:groupId/tasks", f"/groups/{solo['id']}/tasks", 201,
+             json={"title": "Bench orphan task"})
+        call("GET", "GET /groups/:groupId/tasks", tasks, 200)
+        if task:
+            call("PATCH", "PATCH /groups/:groupId/tasks/:id", f"{tasks}/{task['id']}", 200,
+                 json={"title": "Bench task - updated"})
+            call("PATCH", "PATCH /groups/:groupId/tasks/:id/complete",
+                 f"{tasks}/{task['id']}/complete", 200)
+
+    # Cascade deletes: owner is the only member of solo, so solo goes with them
+    if owner:
+        call("DELETE", "DELETE /users/:id", f"/users/{owner['id']}", 200)
+    if team:
+        call("DELETE", "DELETE /groups/:id", f"/groups/{team['id']}", 200)
+    if solo and not owner:
+        call("DELETE", "DELETE /groups/:id", f"/groups/{solo['id']}", 200)
+    if peer:
+        call("DELETE", "DELETE /users/:id", f"/users/{peer['id']}", 200)
+
+
+def bench_worker(session, worker_id, deadline, iterations):
+    iteration = 0
+    while True:
+        if iterations and iteration >= iterations:
+            break
+        if not iterations and time.perf_counter() >= deadline:
+            break
+        bench_flow(session, worker_id, iteration)
+        iteration += 1
+    return iteration
+
+
+def print_bench_report(report):
+    totals = report["totals"]
+    log_section("BENCHMARK RESULTS")
+    header = f"{'endpoint':<44}{'count':>8}{'err%':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, stats in report["endpoints"].items():
+        print(f"{endpoint:<44}{stats['count']:>8}{stats['error_rate'] * 100:>6.1f}%"
+              f"{stats['throughput_rps']:>9.1f}{stats['p50_ms']:>8.1f}ms"
+              f"{stats['p95_ms']:>7.1f}ms{stats['p99_ms']:>7.1f}ms")
+    print("-" * len(header))
+    print(f"Flows: {totals['flows']}  Requests: {totals['requests']}  "
+          f"Errors: {totals['errors']} ({totals['error_rate'] * 100:.2f}%)  "
+          f"Throughput: {totals['throughput_rps']:.1f} req/s  Wall: {totals['wall_seconds']:.1f}s")
+
+
+def run_bench(args):
+    """Replay the suite's flows concurrently and write a JSON latency report"""
+    recorder = LatencyRecorder()
+    session = BenchSession(recorder, RateLimiter(args.rate))
+
+    log_section("BENCHMARK MODE")
+    log_info(f"Workers: {args.workers}, target rate: {args.rate or 'unthrottled'} req/s, "
+             + (f"iterations/worker: {args.iterations}" if args.iterations else f"duration: {args.duration}s"))
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(bench_worker, session, w, deadline, args.iterations)
+                   for w in range(args.workers)]
+        flows = sum(f.result() for f in futures)
+    wall = time.perf_counter() - start
+
+    endpoints = recorder.summary(wall)
+    requests_total = sum(s["count"] for s in endpoints.values())
+    errors_total = sum(s["errors"] for s in endpoints.values())
+    report = {
+        "run_id": TEST_RUN_ID,
+        "base_url": BASE_URL,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "workers": args.workers,
+            "rate": args.rate,
+            "duration": args.duration,
+            "iterations": args.iterations,
+        },
+        "totals": {
+            "flows": flows,
+            "requests": requests_total,
+            "errors": errors_total,
+            "error_rate": errors_total / requests_total if requests_total else 0.0,
+            "throughput_rps": requests_total / wall if wall else 0.0,
+            "wall_seconds": wall,
+        },
+        "endpoints": endpoints,
+    }
+
+    print_bench_report(report)
+    report["connections"] = log_connection_stats()
+    output = args.output or f"bench-{TEST_RUN_ID}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    log_info(f"Wrote results to {output}")
+    return report
+
+
+# ============================================
+# PERFORMANCE SCENARIOS (python test_api.py --perf NAME)
+# ============================================
+def timed(fn, *args, **kwargs):
+    """Run fn and return (result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def report_rate(label, count, seconds):
+    log_info(f"{label:<34} {count:>7} tasks in {seconds:>8.2f}s  ({count / seconds if seconds else 0:>9.1f} tasks/s)")
+
+
+def perf_bulk_tasks(size, args):
+    """Compare single-item vs bulk task create and complete throughput"""
+    log_section(f"PERF: Bulk vs single-item tasks ({size} tasks)")
+    single_group = test_create_group("Perf Single Tasks")
+    bulk_group = test_create_group("Perf Bulk Tasks")
+    if not (single_group and bulk_group):
+        return
+
+    def create_single():
+        ids = []
+        for i in range(size):
+            response = client.post(f"/groups/{single_group['id']}/tasks", json={"title": f"Task {i}"})
+            if response.status_code == 201:
+                ids.append(response.json()["id"])
+        return ids
+
+    def complete_single(ids):
+        for task_id in ids:
+            client.patch(f"/groups/{single_group['id']}/tasks/{task_id}/complete")
+
+    def create_bulk():
+        ids = []
+        for start in range(0, size, BULK_CHUNK):
+            chunk = [{"title": f"Task {i}"} for i in range(start, min(start + BULK_CHUNK, size))]
+            response = client.post(f"/groups/{bulk_group['id']}/tasks/bulk", json={"tasks": chunk})
+            if response.status_code == 201:
+                ids.extend(t["id"] for t in response.json())
+        return ids
+
+    def complete_bulk(ids):
+        for start in range(0, len(ids), BULK_CHUNK):
+            client.patch(f"/groups/{bulk_group['id']}/tasks/bulk/complete",
+                         json={"ids": ids[start:start + BULK_CHUNK]})
+
+    single_ids, single_create = timed(create_single)
+    _, single_complete = timed(complete_single, single_ids)
+    bulk_ids, bulk_create = timed(create_bulk)
+    _, bulk_complete = timed(complete_bulk, bulk_ids)
+
+    report_rate("Create (POST /tasks)", len(single_ids), single_create)
+    report_rate("Create (POST /tasks/bulk)", len(bulk_ids), bulk_create)
+    report_rate("Complete (PATCH /:id/complete)", len(single_ids), single_complete)
+    report_rate("Complete (PATCH /bulk/complete)", len(bulk_ids), bulk_complete)
+    if bulk_create and bulk_complete:
+        log_info(f"Speedup: create x{single_create / bulk_create:.1f}, complete x{single_complete / bulk_complete:.1f}")
+
+    if len(single_ids) == size and len(bulk_ids) == size:
+        log_pass(f"Both paths created {size} tasks")
+    else:
+        log_fail("Task counts differ", f"single={len(single_ids)}, bulk={len(bulk_ids)}")
+
+    test_delete_group(single_group["id"])
+    test_delete_group(bulk_group["id"])
+
+
+def perf_bulk_members(size, args):
+    """Onboard `size` users one POST at a time vs one bulk request, then remove them in bulk"""
+    log_section(f"PERF: Bulk vs single member adds ({size} users)")
+    user_ids = []
+    for i in range(size):
+        response = client.post("/users", json={"name": f"Onboard {i}", "email": f"onboard_{TEST_RUN_ID}_{i}@example.com"})
+        if response.status_code == 201:
+            user_ids.append(response.json()["id"])
+    single_group = test_create_group("Perf Single Members")
+    bulk_group = test_create_group("Perf Bulk Members")
+    if not (single_group and bulk_group):
+        return
+
+    def add_single():
+        for user_id in user_ids:
+            client.post(f"/groups/{single_group['id']}/members", json={"userId": user_id})
+
+    _, single_seconds = timed(add_single)
+    result, bulk_seconds = timed(test_bulk_members, bulk_group["id"], add=user_ids)
+    report_rate("Add (POST /members)", len(user_ids), single_seconds)
+    report_rate("Add (POST /members/bulk)", len(user_ids), bulk_seconds)
+    if bulk_seconds:
+        log_info(f"Speedup: x{single_seconds / bulk_seconds:.1f}")
+
+    single_members = test_get_members(single_group["id"])
+    bulk_members = test_get_members(bulk_group["id"])
+    if result and result["added"] == len(user_ids) == len(single_members) == len(bulk_members):
+        log_pass(f"Both paths added {len(user_ids)} members")
+    else:
+        log_fail("Member counts differ", f"single={len(single_members)}, bulk={len(bulk_members)}")
+
+    removed, remove_seconds = timed(test_bulk_members, bulk_group["id"], remove=user_ids)
+    report_rate("Remove (POST /members/bulk)", (removed or {}).get("removed", 0), remove_seconds)
+
+    test_delete_group(single_group["id"])
+    test_delete_group(bulk_group["id"])
+    for user_id in user_ids:
+        client.delete(f"/users/{user_id}")
+
+
+def perf_user_delete(size, args):
+    """Section 8 at scale: time deleting a user who belongs to `size` groups"""
+    log_section(f"PERF: Delete user in {size} groups")
+    log_info("Every other group is shared with a second user and must survive the cascade")
+    multi_user = test_create_user("Perf Multi User", f"perf_multi_{TEST_RUN_ID}@example.com")
+    other_user = test_create_user("Perf Other User", f"perf_other_{TEST_RUN_ID}@example.com")
+    if not (multi_user and other_user):
+        return
+
+    solo_ids, shared_ids = [], []
+    for i in range(size):
+        response = client.post("/groups", json={"name": f"Perf Delete Group {i}"})
+        if response.status_code != 201:
+            continue
+        group_id = response.json()["id"]
+        client.post(f"/groups/{group_id}/members", json={"userId": multi_user["id"]})
+        if i % 2:
+            client.post(f"/groups/{group_id}/members", json={"userId": other_user["id"]})
+            shared_ids.append(group_id)
+        else:
+            client.post(f"/groups/{group_id}/tasks", json={"title": f"Orphan {i}"})
+            solo_ids.append(group_id)
+    log_info(f"Setup: {len(solo_ids)} solo groups, {len(shared_ids)} shared groups")
+
+    response, seconds = timed(client.delete, f"/users/{multi_user['id']}")
+    if response.status_code == 200:
+        log_pass(f"Deleted user in {size} groups in {seconds * 1000:.1f}ms")
+    else:
+        log_fail("Delete multi-group user", f"Status: {response.status_code}")
+
+    lingering = [g for g in solo_ids if test_group_exists(g)]
+    missing = [g for g in shared_ids if not test_group_exists(g)]
+    if not lingering:
+        log_pass(f"All {len(solo_ids)} solo groups were deleted")
+    else:
+        log_fail("Solo groups should be deleted", f"Still present: {lingering[:10]}")
+    if not missing:
+        log_pass(f"All {len(shared_ids)} shared groups survived")
+    else:
+        log_fail("Shared groups should survive", f"Missing: {missing[:10]}")
+
+    test_delete_user(other_user["id"])
+    for group_id in shared_ids:
+        client.delete(f"/groups/{group_id}")
+
+
+def perf_concurrent_writers(size, args):
+    """`--workers` threads create and complete `size` tasks in one group at the same time"""
+    log_section(f"PERF: {args.workers} concurrent writers, {size} tasks")
+    log_info("Restart the server with different SQLITE_* settings and compare the --output reports")
+    group = test_create_group("Perf Concurrent Writers")
+    if not group:
+        return
+
+    recorder = LatencyRecorder()
+    session = BenchSession(recorder, RateLimiter(args.rate))
+    base = f"/groups/{group['id']}/tasks"
+
+    def writer(worker_id):
+        created = 0
+        for i in range(worker_id, size, args.workers):
+            task = session.call("POST", "POST /groups/:groupId/tasks", base, 201,
+                                json={"title": f"Writer {worker_id} task {i}"})
+            if task:
+                created += 1
+                session.call("PATCH", "PATCH /groups/:groupId/tasks/:id/complete",
+                             f"{base}/{task['id']}/complete", 200)
+        return created
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        created = sum(pool.map(writer, range(args.workers)))
+    wall = time.perf_counter() - start
+
+    endpoints = recorder.summary(wall)
+    writes = sum(s["count"] for s in endpoints.values())
+    errors = sum(s["errors"] for s in endpoints.values())
+    for endpoint, stats in endpoints.items():
+        log_info(f"{endpoint:<44} p50 {stats['p50_ms']:>7.1f}ms  p95 {stats['p95_ms']:>7.1f}ms  "
+                 f"p99 {stats['p99_ms']:>7.1f}ms  errors {stats['errors']}")
+    log_info(f"{writes} writes in {wall:.2f}s = {writes / wall if wall else 0:.1f} writes/s, {errors} errors")
+
+    tasks = test_get_tasks_by_group(group["id"], page_size=1000)
+    if len(tasks) == created and all(t["completed"] for t in tasks):
+        log_pass(f"All {created} concurrently written tasks are present and completed")
+    else:
+        log_fail("Concurrent writes lost or left incomplete",
+                 f"created={created}, stored={len(tasks)}, "
+                 f"completed={sum(1 for t in tasks if t['completed'])}")
+    if errors:
+        log_fail(f"{errors} writes failed (SQLITE_BUSY surfaces as 500)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run_id": TEST_RUN_ID, "workers": args.workers, "size": size, "wall_seconds": wall,
+                       "writes_per_second": writes / wall if wall else 0.0, "errors": errors,
+                       "endpoints": endpoints}, f, indent=2)
+        log_info(f"Wrote results to {args.output}")
+
+    test_delete_group(group["id"])
+
+
+def perf_user_feed(size, args):
+    """A user in `size` groups: open tasks via groups-then-tasks fan-out vs GET /users/:id/tasks"""
+    log_section(f"PERF: My-tasks feed vs fan-out ({size} groups)")
+    user = test_create_user("Perf Feed User", f"feed_{TEST_RUN_ID}@example.com")
+    if not user:
+        return
+    groups = [test_create_group(f"Perf Feed Group {i}") for i in range(size)]
+    groups = [g for g in groups if g]
+    for group in groups:
+        test_add_member(group["id"], user["id"])
+        created = test_bulk_create_tasks(group["id"], [{"title": f"Feed task {i}"} for i in range(20)])
+        test_bulk_complete_tasks(group["id"], [t["id"] for t in created[:5]])
+
+    recorder = LatencyRecorder()
+    fan_out_requests, feed_pages = 0, 0
+    fan_out, feed = [], []
+    for _ in range(args.iterations or 20):
+        (fan_out, fan_out_requests), seconds = timed(user_tasks_by_fan_out, user["id"], completed=False)
+        recorder.record("fan-out", seconds, fan_out is not None)
+        start = time.perf_counter()
+        feed, feed_pages, status = fetch_pages(f"/users/{user['id']}/tasks", {"completed": False})
+        recorder.record("feed", time.perf_counter() - start, status == 200)
+
+    summary = recorder.summary(0)
+    for name, requests_made in (("fan-out", fan_out_requests), ("feed", feed_pages)):
+        stats = summary[name]
+        log_info(f"{name:<8} p50 {stats['p50_ms']:.1f}ms  p95 {stats['p95_ms']:.1f}ms  "
+                 f"({requests_made} requests per load, {stats['count']} loads)")
+    if summary["feed"]["p50_ms"]:
+        log_info(f"Speedup (p50): x{summary['fan-out']['p50_ms'] / summary['feed']['p50_ms']:.1f}")
+
+    if fan_out is not None and feed is not None and [t["id"] for t in fan_out] == [t["id"] for t in feed] \
+            and len(feed) == 15 * len(groups):
+        log_pass(f"Both paths return the same {len(feed)} open tasks")
+    else:
+        log_fail("Feed and fan-out disagree", f"fan-out={len(fan_out or [])}, feed={len(feed or [])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run_id": TEST_RUN_ID, "groups": len(groups), "endpoints": summary}, f, indent=2)
+        log_info(f"Wrote results to {args.output}")
+
+    for group in groups:
+        test_delete_group(group["id"])
+    test_delete_user(user["id"])
+
+
+def perf_retry_storm(size, args):
+    """`size` task creates, each sent as several concurrent copies (hedged retries), with and without keys"""
+    copies = 3
+    log_section(f"PERF: {size} creates x{copies} copies, keyed vs unkeyed")
+    keyed_group = test_create_group("Perf Retry Keyed")
+    plain_group = test_create_group("Perf Retry Unkeyed")
+    if not (keyed_group and plain_group):
+        return
+    stats_before = get_idempotency_stats() or {}
+    recorder = LatencyRecorder()
+
+    def send(group, i, keyed):
+        headers = {IDEMPOTENCY_HEADER: f"{TEST_RUN_ID}-storm-{i}"} if keyed else {}
+        label = "keyed" if keyed else "unkeyed"
+        start = time.perf_counter()
+        try:
+            response = client.post(f"/groups/{group['id']}/tasks", json={"title": f"Storm {i}"}, headers=headers)
+        except requests.exceptions.RequestException:
+            recorder.record(label, time.perf_counter() - start, False)
+            return i, None
+        recorder.record(label, time.perf_counter() - start, response.status_code == 201)
+        return i, response.json()["id"] if response.status_code == 201 else None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        keyed = list(pool.map(lambda n: send(keyed_group, n // copies, True), range(size * copies)))
+        unkeyed = list(pool.map(lambda n: send(plain_group, n // copies, False), range(size * copies)))
+    wall = time.perf_counter() - start
+
+    ids_per_key = {}
+    for i, task_id in keyed:
+        ids_per_key.setdefault(i, set()).add(task_id)
+    keyed_count = len(test_get_tasks_by_group(keyed_group["id"]))
+    unkeyed_count = len(test_get_tasks_by_group(plain_group["id"]))
+    summary = recorder.summary(wall)
+    for label, stats in summary.items():
+        log_info(f"{label:<8} p50 {stats['p50_ms']:.1f}ms  p95 {stats['p95_ms']:.1f}ms  errors {stats['errors']}")
+    stats_after = get_idempotency_stats() or {}
+    answered = sum(stats_after.get(k, 0) - stats_before.get(k, 0) for k in ("replayed", "joined"))
+    log_info(f"Without keys: {unkeyed_count - size} duplicate tasks; with keys: {answered} copies answered "
+             f"from the store or a running request")
+
+    if keyed_count == size and all(ids == {next(iter(ids))} and None not in ids for ids in ids_per_key.values()):
+        log_pass(f"Keyed: {size} tasks for {size * copies} requests, every copy got the same task")
+    else:
+        log_fail("Keyed retries created duplicates or lost responses", f"{keyed_count} tasks for {size} keys")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run_id": TEST_RUN_ID, "size": size, "copies": copies, "wall_seconds": wall,
+                       "keyed_tasks": keyed_count, "unkeyed_tasks": unkeyed_count, "endpoints": summary}, f, indent=2)
+        log_info(f"Wrote results to {args.output}")
+
+    test_delete_group(keyed_group["id"])
+    test_delete_group(plain_group["id"])
+
+
+def get_write_queue_stats():
+    """Counters of the task write queue (GET /tasks/write-queue)"""
+    response = client.get("/tasks/write-queue")
+    return response.json() if response.status_code == 200 else None
+
+
+def get_admission_stats():
+    """In-flight cap, rate limits and rejection counters (GET /admission/stats)"""
+    response = client.get("/admission/stats")
+    return response.json() if response.status_code == 200 else None
+
+
+CLIENT_ID_HEADER = "X-Client-Id"  # set RATE_LIMIT_CLIENT_HEADER to this for per-worker buckets
+OVERLOAD_P99_BUDGET_MS = 1000
+REJECTION_P99_BUDGET_MS = 100
+
+
+def perf_overload(size, args):
+    """Offer `size` task writes at a fixed rate above capacity; admitted writes keep a bounded p99, the rest are shed"""
+    rate = args.rate or 2000
+    log_section(f"PERF: {size} task writes offered at {rate:.0f}/s by {args.workers} workers")
+    before = get_admission_stats()
+    if before:
+        limits = ", ".join(f"{r['name']} {r['ratePerSecond']}/s" for r in before["rateLimits"]) or "off"
+        log_info(f"Admission: MAX_IN_FLIGHT {before['maxInFlight'] or 'off'}, rate limits {limits}")
+    group = test_create_group("Perf Overload")
+    if not group:
+        return
+    base = f"/groups/{group['id']}/tasks"
+    seeded = test_bulk_create_tasks(group["id"], [{"title": f"Overload {i}"} for i in range(100)])
+    ids = [task["id"] for task in seeded or []] or [0]
+
+    # No retries: a shed request should be seen as shed, not re-sent after Retry-After
+    raw = ApiClient(client.base_url, pool_size=args.workers, retries=0, timeout=client.timeout)
+    recorder = LatencyRecorder()
+    missing_retry_after = []
+    start = time.perf_counter()
+
+    def send(i):
+        # Open loop: latency is measured from when the request was due, so
+        # requests waiting for a free worker count against the server
+        due = start + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        headers = {CLIENT_ID_HEADER: f"overload-{i % args.workers}"}
+        try:
+            if i % 2:
+                response = raw.post(base, json={"title": f"Burst {i}"}, headers=headers)
+            else:
+                response = raw.patch(f"{base}/{ids[i % len(ids)]}/complete", headers=headers)
+            status = response.status_code
+        except requests.exceptions.RequestException:
+            response, status = None, None
+        if status in (429, 503):
+            label = f"shed {status}"
+            if "Retry-After" not in response.headers:
+                missing_retry_after.append(i)
+        else:
+            label = "admitted"
+        recorder.record(label, time.perf_counter() - due, status in (200, 201, 429, 503))
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(send, range(size)))
+    wall = time.perf_counter() - start
+    raw.close()
+
+    endpoints = recorder.summary(wall)
+    for label, stats in sorted(endpoints.items()):
+        log_info(f"{label:<10} {stats['count']:>7}  p50 {stats['p50_ms']:>7.1f}ms  p95 {stats['p95_ms']:>7.1f}ms  "
+                 f"p99 {stats['p99_ms']:>7.1f}ms  errors {stats['errors']}")
+    admitted = endpoints.get("admitted")
+    shed = sum(endpoints[label]["count"] for label in endpoints if label.startswith("shed"))
+    errors = sum(stats["errors"] for stats in endpoints.values())
+
+    if not shed:
+        log_info("Nothing was shed. Restart with MAX_IN_FLIGHT=32 or RATE_LIMIT_TASK_WRITES=200 "
+                 "(and more --workers or --rate) and compare the --output reports")
+    elif admitted and admitted["p99_ms"] <= OVERLOAD_P99_BUDGET_MS:
+        log_pass(f"Admitted writes p99 {admitted['p99_ms']:.0f}ms with {shed} of {size} shed "
+                 f"(budget {OVERLOAD_P99_BUDGET_MS}ms)")
+    else:
+        log_fail("Admitted writes p99 over budget under overload",
+                 f"p99 {admitted['p99_ms'] if admitted else 0:.0f}ms > {OVERLOAD_P99_BUDGET_MS}ms")
+    if shed:
+        rejected_p99 = max(endpoints[label]["p99_ms"] for label in endpoints if label.startswith("shed"))
+        if rejected_p99 <= REJECTION_P99_BUDGET_MS and not missing_retry_after:
+            log_pass(f"Rejections are cheap (p99 {rejected_p99:.1f}ms) and all carry Retry-After")
+        else:
+            log_fail("Rejections slow or missing Retry-After",
+                     f"p99 {rejected_p99:.1f}ms, {len(missing_retry_after)} without Retry-After")
+    if errors:
+        log_fail(f"{errors} requests timed out or failed instead of being admitted or shed")
+
+    after = get_admission_stats()
+    if before and after:
+        limited = sum(r["limited"] for r in after["rateLimits"]) - sum(r["limited"] for r in before["rateLimits"])
+        log_info(f"Server: +{after['overloaded'] - before['overloaded']} over MAX_IN_FLIGHT, +{limited} rate limited")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run_id": TEST_RUN_ID, "workers": args.workers, "rate": rate, "size": size,
+                       "wall_seconds": wall, "shed": shed, "errors": errors, "admission": after,
+                       "endpoints": endpoints}, f, indent=2)
+        log_info(f"Wrote results to {args.output}")
+
+    test_delete_group(group["id"])
+
+
+def perf_toggle_storm(size, args):
+    """`--workers` threads send `size` completion toggles at a few hot tasks, then check the final state"""
+    log_section(f"PERF: {args.workers} workers toggling tasks, {size} writes")
+    queue_before = get_write_queue_stats()
+    if queue_before and queue_before["enabled"]:
+        log_info(f"Write queue on: {queue_before['windowMs']}ms window, {queue_before['maxPending']} pending max")
+    else:
+        log_info("Write queue off; restart with TASK_WRITE_WINDOW_MS=20 to compare")
+    group = test_create_group("Perf Toggle Storm")
+    if not group:
+        return
+    base = f"/groups/{group['id']}/tasks"
+    hot = test_bulk_create_tasks(group["id"], [{"title": f"Checklist {i}"} for i in range(max(size // 50, 1))])
+    if not hot:
+        test_delete_group(group["id"])
+        return
+    ids = [task["id"] for task in hot]
+
+    recorder = LatencyRecorder()
+    session = BenchSession(recorder, RateLimiter(args.rate))
+    mismatched = []
+
+    def toggler(worker_id):
+        rng = random.Random(worker_id)
+        for _ in range(worker_id, size, args.workers):
+            task_id = rng.choice(ids)
+            if rng.random() < 0.5:
+                task = session.call("PATCH", "PATCH /groups/:groupId/tasks/:id/complete",
+                                    f"{base}/{task_id}/complete", 200)
+            else:
+                task = session.call("PATCH", "PATCH /groups/:groupId/tasks/:id", f"{base}/{task_id}", 200,
+                                    json={"completed": rng.random() < 0.5})
+            if task and task["id"] != task_id:
+                mismatched.append(task_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(toggler, range(args.workers)))
+    wall = time.perf_counter() - start
+
+    endpoints = recorder.summary(wall)
+    writes = sum(s["count"] for s in endpoints.values())
+    errors = sum(s["errors"] for s in endpoints.values())
+    for endpoint, stats in endpoints.items():
+        log_info(f"{endpoint:<44} p50 {stats['p50_ms']:>7.1f}ms  p95 {stats['p95_ms']:>7.1f}ms  "
+                 f"p99 {stats['p99_ms']:>7.1f}ms  errors {stats['errors']}")
+    log_info(f"{writes} writes in {wall:.2f}s = {writes / wall if wall else 0:.1f} writes/s, {errors} errors")
+    queue_after = get_write_queue_stats()
+    if queue_before and queue_after and queue_after["enabled"]:
+        batches = queue_after["batches"] - queue_before["batches"]
+        merged = queue_after["merged"] - queue_before["merged"]
+        log_info(f"Write queue: {batches} transactions, {merged} writes merged, "
+                 f"{queue_after['waits'] - queue_before['waits']} waited for a full queue")
+
+    if errors or mismatched:
+        log_fail(f"{errors} toggles failed, {len(mismatched)} returned the wrong task")
+    else:
+        log_pass(f"All {writes} toggles answered with their task")
+
+    # Every worker now writes the same final value for every task, so the
+    # result is known however the writes were merged or ordered.
+    def settle(worker_id):
+        for task_id in ids:
+            session.call("PATCH", "PATCH /groups/:groupId/tasks/:id", f"{base}/{task_id}", 200,
+                         json={"completed": task_id % 2 == 0})
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(settle, range(args.workers)))
+    stored = {task["id"]: task["completed"] for task in test_get_tasks_by_group(group["id"], page_size=1000)}
+    wrong = [task_id for task_id in ids if stored.get(task_id) != (task_id % 2 == 0)]
+    if wrong:
+        log_fail("Final task state does not match the last writes", f"{len(wrong)} of {len(ids)} tasks differ")
+    else:
+        log_pass(f"All {len(ids)} tasks hold their final value after the storm")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run_id": TEST_RUN_ID, "workers": args.workers, "size": size, "wall_seconds": wall,
+                       "writes_per_second": writes / wall if wall else 0.0, "errors": errors,
+                       "write_queue": queue_after, "endpoints": endpoints}, f, indent=2)
+        log_info(f"Wrote results to {args.output}")
+
+    test_delete_group(group["id"])
+
+
+# name -> (function, default size); functions take (size, parsed CLI args)
+def perf_archive(size, args):
+    """Export a group of `size` tasks and stream it straight into an import"""
+    log_section(f"PERF: Archive round trip ({size} tasks)")
+    archive_round_trip(SectionContext("perf"), size)
+
+
+PERF_SCENARIOS = {
+    "bulk-tasks": (perf_bulk_tasks, 1000),
+    "user-delete": (perf_user_delete, 500),
+    "bulk-members": (perf_bulk_members, 2000),
+    "concurrent-writers": (perf_concurrent_writers, 2000),
+    "toggle-storm": (perf_toggle_storm, 5000),
+    "user-feed": (perf_user_feed, 50),
+    "retry-storm": (perf_retry_storm, 1000),
+    "overload": (perf_overload, 5000),
+    "archive": (perf_archive, 100_000),
+}
+
+
+def run_perf(name, size, args):
+    fn, default_size = PERF_SCENARIOS[name]
+    fn(size or default_size, args)
+    log_connection_stats()
+    if failed:
         sys.exit(1)
 
-    # ========== USERS CRUD ==========
-    log_section("1. USERS - CRUD Operations")
 
-    user1 = test_create_user("Alice Johnson", f"alice_{TEST_RUN_ID}@example.com")
-    user2 = test_create_user("Bob Smith", f"bob_{TEST_RUN_ID}@example.com")
-    user3 = test_create_user("Charlie Brown", f"charlie_{TEST_RUN_ID}@example.com")
+# ============================================
+# SECTIONS
+# ============================================
+class SectionContext:
+    """Namespace for one section run: every email and name it creates carries it"""
+
+    def __init__(self, number, tenant=None):
+        self.ns = f"{TEST_RUN_ID}_s{number}" if tenant is None else f"{TEST_RUN_ID}_t{tenant}_s{number}"
+
+    def email(self, name):
+        return f"{name}_{self.ns}@example.com"
+
+    def name(self, label):
+        return f"{label} ({self.ns})"
+
+
+def cleanup(users=(), groups=()):
+    """Delete groups first (cascades to tasks), then users"""
+    for group in filter(None, groups):
+        test_delete_group(group["id"])
+    for user in filter(None, users):
+        test_delete_user(user["id"])
+
+
+def section_users_crud(ctx):
+    """Create, list, read and update users"""
+    users = [test_create_user(ctx.name(name), ctx.email(key)) for name, key in
+             (("Alice Johnson", "alice"), ("Bob Smith", "bob"), ("Charlie Brown", "charlie"))]
+    user1 = users[0]
 
     test_get_all_users()
 
     if user1:
         test_get_user_by_id(user1["id"])
         test_update_user(user1["id"], name="Alice Updated")
-        test_update_user(user1["id"], email=f"alice.new_{TEST_RUN_ID}@example.com")
+        test_update_user(user1["id"], email=ctx.email("alice.new"))
 
-    # ========== GROUPS CRUD ==========
-    log_section("2. GROUPS - CRUD Operations")
+    cleanup(users=users)
 
-    group1 = test_create_group("Development Team", "Frontend and backend developers")
-    group2 = test_create_group("Design Team")
-    group3 = test_create_group("Solo Group", "Group with only one member")
+
+def section_groups_crud(ctx):
+    """Create, list and read groups"""
+    groups = [
+        test_create_group(ctx.name("Development Team"), "Frontend and backend developers"),
+        test_create_group(ctx.name("Design Team")),
+        test_create_group(ctx.name("Solo Group"), "Group with only one member"),
+    ]
 
     test_get_all_groups()
 
-    if group1:
-        test_get_group_by_id(group1["id"])
+    if groups[0]:
+        test_get_group_by_id(groups[0]["id"])
 
-    # ========== MEMBERS ==========
-    log_section("3. MEMBERS - Add/Remove Members")
+    cleanup(groups=groups)
+
+
+def section_members(ctx):
+    """Add and remove members; a user's groups"""
+    user1 = test_create_user(ctx.name("Alice Johnson"), ctx.email("alice"))
+    user2 = test_create_user(ctx.name("Bob Smith"), ctx.email("bob"))
+    user3 = test_create_user(ctx.name("Charlie Brown"), ctx.email("charlie"))
+    group1 = test_create_group(ctx.name("Development Team"), "Frontend and backend developers")
+    group2 = test_create_group(ctx.name("Design Team"))
+    group3 = test_create_group(ctx.name("Solo Group"), "Group with only one member")
 
     if group1 and user1 and user2:
         test_add_member(group1["id"], user1["id"])
@@ -425,27 +1797,31 @@ def run_all_tests():
         test_delete_member(group1["id"], user2["id"])
         test_get_members(group1["id"])
 
-    # ========== TASKS CRUD ==========
-    log_section("4. TASKS - CRUD Operations")
+    cleanup(users=[user1, user2, user3], groups=[group1, group2, group3])
 
-    task1 = task2 = task3 = None
-    if group1:
-        task1 = test_create_task(group1["id"], "Setup project", "Initialize repository")
-        task2 = test_create_task(group1["id"], "Write tests", "Add unit tests")
-        task3 = test_create_task(group1["id"], "Deploy app")
 
-        test_get_tasks_by_group(group1["id"])
+def section_tasks_crud(ctx):
+    """Create, read, update, complete and delete tasks"""
+    group1 = test_create_group(ctx.name("Development Team"), "Frontend and backend developers")
+    if not group1:
+        return
+
+    task1 = test_create_task(group1["id"], "Setup project", "Initialize repository")
+    task2 = test_create_task(group1["id"], "Write tests", "Add unit tests")
+    task3 = test_create_task(group1["id"], "Deploy app")
+
+    test_get_tasks_by_group(group1["id"])
 
-        if task1:
-            test_get_task_by_id(group1["id"], task1["id"])
+    if task1:
+        test_get_task_by_id(group1["id"], task1["id"])
 
     log_subsection("Update Task Fields")
-    if group1 and task1:
+    if task1:
         test_update_task(group1["id"], task1["id"], title="Setup project - UPDATED")
         test_update_task(group1["id"], task1["id"], description="New description")
 
     log_subsection("Complete Task via PATCH /complete")
-    if group1 and task1:
+    if task1:
         result = test_complete_task(group1["id"], task1["id"])
         if result and result.get("completed") == True:
             log_pass("Task completion verified (completed=true)")
@@ -453,7 +1829,7 @@ def run_all_tests():
             log_fail("Task completion verification", f"Expected completed=true, got: {result}")
 
     log_subsection("Complete Task via PATCH with completed field")
-    if group1 and task2:
+    if task2:
         result = test_update_task(group1["id"], task2["id"], completed=True)
         if result and result.get("completed") == True:
             log_pass("Task completed via PATCH body (completed=true)")
@@ -461,23 +1837,55 @@ def run_all_tests():
             log_fail("Task completion via PATCH body", f"Expected completed=true, got: {result}")
 
     log_subsection("Delete Task")
-    if group1 and task3:
+    if task3:
         test_delete_task(group1["id"], task3["id"])
         test_get_task_not_found(group1["id"], task3["id"])
 
-    # ========== 404 TESTS ==========
-    log_section("5. ERROR HANDLING - 404 Not Found")
+    cleanup(groups=[group1])
+
+
+def section_not_found(ctx):
+    """404s for reads and writes on missing records"""
+    user1 = test_create_user(ctx.name("Alice Johnson"), ctx.email("alice"))
+    user3 = test_create_user(ctx.name("Charlie Brown"), ctx.email("charlie"))
+    group1 = test_create_group(ctx.name("Development Team"))
 
     test_get_user_not_found(99999)
     test_get_group_not_found(99999)
     if group1:
         test_get_task_not_found(group1["id"], 99999)
 
-    # ========== CASCADE DELETE: Group -> Tasks ==========
-    log_section("6. CASCADE DELETE - Group Deletion")
+    log_subsection("Mutations on missing records")
+    test_mutation_not_found("PUT", "/users/99999", json={"name": "Ghost"}, expect_in_message="User with id 99999")
+    test_mutation_not_found("DELETE", "/groups/99999", expect_in_message="Group with ID 99999")
+    if group1:
+        tasks = f"/groups/{group1['id']}/tasks"
+        test_mutation_not_found("PATCH", f"{tasks}/99999", json={"title": "Ghost"},
+                                expect_in_message="Task with id 99999")
+        test_mutation_not_found("PATCH", f"{tasks}/99999/complete", expect_in_message="Task with id 99999")
+        test_mutation_not_found("DELETE", f"{tasks}/99999", expect_in_message="Task with id 99999")
+
+    log_subsection("Membership changes with missing records")
+    if user1:
+        test_mutation_not_found("POST", "/groups/99999/members", json={"userId": user1["id"]},
+                                expect_in_message="Group with ID 99999")
+    if group1:
+        test_mutation_not_found("POST", f"/groups/{group1['id']}/members", json={"userId": 99999},
+                                expect_in_message="User with id 99999")
+        test_mutation_not_found("DELETE", f"/groups/{group1['id']}/members/99999",
+                                expect_in_message="User with id 99999")
+    if group1 and user3:
+        test_mutation_not_found("DELETE", f"/groups/{group1['id']}/members/{user3['id']}",
+                                expect_in_message="is not a member")
+
+    cleanup(users=[user1, user3], groups=[group1])
+
+
+def section_group_cascade(ctx):
+    """Deleting a group deletes its tasks"""
     log_info("Deleting a group should delete all its tasks")
 
-    cascade_group = test_create_group("Cascade Test Group")
+    cascade_group = test_create_group(ctx.name("Cascade Test Group"))
     cascade_task1 = cascade_task2 = None
     if cascade_group:
         cascade_task1 = test_create_task(cascade_group["id"], "Cascade Task 1")
@@ -495,17 +1903,21 @@ def run_all_tests():
             log_fail("Group should be deleted")
 
         # Verify tasks are gone (cascade)
-        # Note: We can't check tasks directly since group is gone,
-        # but if we had a global task endpoint we could verify
+        leftover = test_get_all_tasks(groupId=cascade_group["id"])
+        if leftover == []:
+            log_pass("Group's tasks deleted by cascade")
+        else:
+            log_fail("Tasks should be deleted with their group", f"Still found: {[t['id'] for t in leftover]}")
 
-    # ========== CASCADE DELETE: User -> Empty Groups ==========
-    log_section("7. CASCADE DELETE - User Deletion (Empty Groups)")
+
+def section_user_cascade(ctx):
+    """Deleting a group's only member deletes the group"""
     log_info("Deleting a user should remove them from groups")
     log_info("If a group becomes empty, it should be deleted along with its tasks")
 
     # Create isolated test data
-    cascade_user = test_create_user("Cascade User", f"cascade_{TEST_RUN_ID}@example.com")
-    cascade_group2 = test_create_group("User Cascade Group")
+    cascade_user = test_create_user(ctx.name("Cascade User"), ctx.email("cascade"))
+    cascade_group2 = test_create_group(ctx.name("User Cascade Group"))
     cascade_task3 = None
 
     if cascade_user and cascade_group2:
@@ -534,14 +1946,15 @@ def run_all_tests():
         else:
             log_fail("Empty group should have been deleted")
 
-    # ========== USER IN MULTIPLE GROUPS ==========
-    log_section("8. CASCADE DELETE - User in Multiple Groups")
+
+def section_user_multi_groups(ctx):
+    """Deleting a user only deletes the groups it leaves empty"""
     log_info("Deleting a user in multiple groups should only delete EMPTY groups")
 
-    multi_user = test_create_user("Multi User", f"multi_{TEST_RUN_ID}@example.com")
-    other_user = test_create_user("Other User", f"other_{TEST_RUN_ID}@example.com")
-    shared_group = test_create_group("Shared Group")
-    solo_group2 = test_create_group("Solo Group 2")
+    multi_user = test_create_user(ctx.name("Multi User"), ctx.email("multi"))
+    other_user = test_create_user(ctx.name("Other User"), ctx.email("other"))
+    shared_group = test_create_group(ctx.name("Shared Group"))
+    solo_group2 = test_create_group(ctx.name("Solo Group 2"))
 
     if multi_user and other_user and shared_group and solo_group2:
         # Add multi_user to both groups
@@ -573,40 +1986,935 @@ def run_all_tests():
         test_delete_group(shared_group["id"])
         test_delete_user(other_user["id"])
 
-    # ========== CLEANUP ==========
-    log_section("9. CLEANUP")
-    log_info("Cleaning up remaining test data...")
 
-    # Delete groups first (cascades to tasks)
-    if group1:
-        test_delete_group(group1["id"])
-    if group2:
-        test_delete_group(group2["id"])
-    if group3:
-        test_delete_group(group3["id"])
+def section_bulk_tasks(ctx):
+    """Bulk create, update and complete in one request each"""
+    bulk_group = test_create_group(ctx.name("Bulk Task Group"))
+    if bulk_group:
+        created = test_bulk_create_tasks(bulk_group["id"], [
+            {"title": f"Bulk task {i}", "description": f"Imported #{i}"} for i in range(1, 6)
+        ])
+        if len(created) == 5:
+            log_pass("Bulk create returned all 5 tasks")
+        else:
+            log_fail("Bulk create should return 5 tasks", f"Got: {len(created)}")
+
+        if created:
+            updated = test_bulk_update_tasks(bulk_group["id"], [
+                {"id": created[0]["id"], "title": "Bulk task 1 - UPDATED"},
+                {"id": created[1]["id"], "completed": True},
+            ])
+            if updated and updated[0]["title"] == "Bulk task 1 - UPDATED" and updated[1]["completed"]:
+                log_pass("Bulk update applied per-task changes")
+            else:
+                log_fail("Bulk update verification", f"Got: {updated}")
+
+            test_bulk_not_found(bulk_group["id"], created[2]["id"])
+
+            count = test_bulk_complete_tasks(bulk_group["id"], [t["id"] for t in created])
+            tasks = test_get_tasks_by_group(bulk_group["id"])
+            if count == len(created) and all(t["completed"] for t in tasks):
+                log_pass("All bulk tasks completed")
+            else:
+                log_fail("Bulk complete verification", f"count={count}, tasks={tasks}")
+
+        test_delete_group(bulk_group["id"])
+
+
+def section_pagination(ctx):
+    """Cursor walks, filters and field projection"""
+    page_group = test_create_group(ctx.name("Pagination Group"))
+    page_user = test_create_user(ctx.name("Pagination User"), ctx.email("pagination"))
+    if page_group and page_user:
+        gid = page_group["id"]
+        created = test_bulk_create_tasks(gid, [{"title": f"Page task {i}"} for i in range(25)])
+        test_bulk_complete_tasks(gid, [t["id"] for t in created[:10]])
+
+        tasks = test_get_tasks_by_group(gid, page_size=10)
+        ids = [t["id"] for t in tasks]
+        if len(ids) == 25 and ids == sorted(set(ids)):
+            log_pass("Walked 3 pages of 10: 25 unique tasks in ID order")
+        else:
+            log_fail("Paged walk should return 25 unique ordered tasks", f"Got: {ids}")
 
-    # Delete users
-    if user1:
-        test_delete_user(user1["id"])
-    if user2:
-        test_delete_user(user2["id"])
-    if user3:
-        test_delete_user(user3["id"])
+        done = test_get_tasks_by_group(gid, page_size=4, completed=True)
+        todo = test_get_tasks_by_group(gid, completed=False)
+        if len(done) == 10 and len(todo) == 15 and all(t["completed"] for t in done):
+            log_pass("completed=true/false filters split 10/15")
+        else:
+            log_fail("completed filter", f"done={len(done)}, todo={len(todo)}")
+
+        projected = test_get_tasks_by_group(gid, page_size=10, fields="title")
+        if projected and all(set(t) == {"id", "title"} for t in projected):
+            log_pass("fields=title projects to {id, title}")
+        else:
+            log_fail("fields projection", f"Got: {projected[:2]}")
+
+        future = test_get_tasks_by_group(gid, createdAfter="2999-01-01T00:00:00Z")
+        if future == []:
+            log_pass("createdAfter in the future returns no tasks")
+        else:
+            log_fail("createdAfter filter", f"Got {len(future)} tasks")
+
+        test_add_member(gid, page_user["id"])
+        members = test_get_members(gid, fields="name")
+        if members and set(members[0]["user"]) == {"id", "name"}:
+            log_pass("Member fields=name projects the nested user")
+        else:
+            log_fail("Member projection", f"Got: {members}")
+
+        test_list_rejected(f"/groups/{gid}/tasks", {"fields": "secret"}, "Unknown projection field")
+        test_list_rejected(f"/groups/{gid}/tasks", {"limit": 100000}, "Limit above maximum")
+        test_list_rejected(f"/groups/{gid}/tasks", {"completed": "maybe"}, "Non-boolean completed filter")
+
+        test_delete_group(gid)
+    if page_user:
+        test_delete_user(page_user["id"])
+
+
+def section_lookup_cache(ctx):
+    """Cached lookups hit, and writes invalidate them"""
+    before = get_cache_stats()
+    cache_user = test_create_user(ctx.name("Cache User"), ctx.email("cache"))
+    cache_group = test_create_group(ctx.name("Cache Solo Group"))
+    kept_group = test_create_group(ctx.name("Cache Kept Group"))
+    if cache_user and cache_group and kept_group:
+        uid, gid = cache_user["id"], cache_group["id"]
+        test_add_member(gid, uid)
+        test_warm_lookups(gid, uid)
+        test_warm_lookups(kept_group["id"], uid)
+
+        after = get_cache_stats()
+        hits = cache_counter(after, "groups", "hits") - cache_counter(before, "groups", "hits")
+        if hits > 0:
+            log_pass(f"Repeated group lookups served from cache ({hits} hits)")
+        else:
+            log_fail("Repeated group lookups should hit the cache", f"Stats: {after}")
+
+        # updateUserByID must not leave the old name cached
+        test_update_user(uid, name="Cache User - RENAMED")
+        fetched = test_get_user_by_id(uid)
+        if fetched and fetched["name"] == "Cache User - RENAMED":
+            log_pass("User update visible immediately after warm reads")
+        else:
+            log_fail("User update served stale from cache", f"Got: {fetched}")
+
+        # deleteUser empties the solo group: both must 404 right away
+        test_delete_user(uid)
+        test_get_user_not_found(uid)
+        test_get_group_not_found(gid)
+        test_mutation_not_found("POST", f"/groups/{gid}/tasks", json={"title": "Ghost task"})
+        test_mutation_not_found("POST", f"/groups/{kept_group['id']}/members", json={"userId": uid})
+
+        # deleteGroup must not leave the group cached
+        kid = kept_group["id"]
+        test_warm_lookups(kid, uid)
+        test_delete_group(kid)
+        test_get_group_not_found(kid)
+        test_mutation_not_found("POST", f"/groups/{kid}/tasks", json={"title": "Ghost task"})
+    else:
+        for group in (cache_group, kept_group):
+            if group:
+                test_delete_group(group["id"])
+        if cache_user:
+            test_delete_user(cache_user["id"])
+
+
+def section_global_tasks(ctx):
+    """Cross-group task listing and per-group stats"""
+    stat_groups = [test_create_group(ctx.name(f"Stats Group {i}")) for i in range(3)]
+    if all(stat_groups):
+        ids = [g["id"] for g in stat_groups]
+        # 6/2, 3/3 and 0/0 total/completed
+        for gid, total, done in zip(ids, (6, 3, 0), (2, 3, 0)):
+            if total:
+                created = test_bulk_create_tasks(gid, [{"title": f"Stats task {i}"} for i in range(total)])
+                test_bulk_complete_tasks(gid, [t["id"] for t in created[:done]])
+
+        listed = test_get_all_tasks(page_size=4, groupId=ids[0])
+        if len(listed) == 6 and all(t["groupId"] == ids[0] for t in listed):
+            log_pass("GET /tasks?groupId pages through one group's tasks")
+        else:
+            log_fail("GET /tasks?groupId", f"Got: {listed}")
+
+        open_tasks = test_get_all_tasks(groupId=ids[0], completed=False, fields="title")
+        if len(open_tasks) == 4 and all(set(t) == {"id", "title"} for t in open_tasks):
+            log_pass("GET /tasks supports completed filter and projection")
+        else:
+            log_fail("GET /tasks filters", f"Got: {open_tasks}")
+
+        stats = test_get_task_stats(page_size=2, cursor=ids[0] - 1)
+        expected = {ids[0]: (6, 2), ids[1]: (3, 3), ids[2]: (0, 0)}
+        got = {gid: (stats[gid]["total"], stats[gid]["completed"]) for gid in ids if gid in stats}
+        if got == expected:
+            log_pass("Per-group totals match: 6/2, 3/3 and an empty group at 0/0")
+        else:
+            log_fail("Per-group totals", f"Expected: {expected}, Got: {got}")
+
+        # The dashboard pattern this replaces: list every group's tasks and count locally
+        start = time.perf_counter()
+        client_side = {gid: len(test_get_tasks_by_group(gid)) for gid in ids}
+        fan_out_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        # Sections running in parallel create groups in between ours, so ask for the whole ID range
+        response = client.get("/tasks/stats", params={"cursor": ids[0] - 1, "limit": ids[-1] - ids[0] + 1})
+        stats_ms = (time.perf_counter() - start) * 1000
+        server_side = {e["groupId"]: e["total"] for e in response.json()
+                       if e["groupId"] in client_side} if response.status_code == 200 else {}
+        if server_side == client_side:
+            log_pass(f"One stats request matches client-side counting "
+                     f"({stats_ms:.1f}ms vs {fan_out_ms:.1f}ms for {len(ids)} task lists)")
+        else:
+            log_fail("Stats disagree with client-side counting", f"{server_side} vs {client_side}")
+
+        test_mutation_not_found("GET", "/tasks/stats?groupId=99999999")
+        test_list_rejected("/tasks", {"groupId": "abc"}, "Non-numeric groupId")
+    for group in stat_groups:
+        if group:
+            test_delete_group(group["id"])
+
+
+def section_compression(ctx):
+    """Compressed responses and NDJSON streaming"""
+    big_group = test_create_group(ctx.name("Compression Group"))
+    if big_group:
+        gid = big_group["id"]
+        total = 3000
+        for start in range(0, total, 1000):
+            test_bulk_create_tasks(gid, [
+                {"title": f"Large task {i}", "description": f"Payload row {i} for compression tests"}
+                for i in range(start, start + 1000)
+            ])
+
+        page = {"limit": 1000}
+        status, encoding, plain, _ = fetch_wire_size(f"/groups/{gid}/tasks", page, "identity")
+        log_info(f"identity: {plain / 1024:.1f} KiB for 1000 tasks")
+        for name in supported_encodings():
+            status, encoding, wire, decoded = fetch_wire_size(f"/groups/{gid}/tasks", page, name)
+            if status == 200 and encoding == name and decoded == plain and wire < plain:
+                log_pass(f"{name}: {wire / 1024:.1f} KiB on the wire ({plain / wire:.1f}x smaller)")
+            else:
+                log_fail(f"{name} negotiation", f"status={status}, Content-Encoding={encoding}, wire={wire}")
+
+        status, encoding, wire, _ = fetch_wire_size(f"/groups/{gid}", encoding="gzip")
+        if status == 200 and encoding is None:
+            log_pass(f"Small response ({wire} bytes) left uncompressed")
+        else:
+            log_fail("Responses under the threshold should not be compressed", f"Content-Encoding={encoding}")
+
+        test_stream_ndjson(f"/groups/{gid}/tasks", total)
+        test_stream_ndjson(f"/groups/{gid}/tasks", total, encoding="identity")
+        rows, _ = stream_ndjson("/tasks", {"groupId": gid, "fields": "title"})
+        if rows == total:
+            log_pass(f"GET /tasks streams all {rows} tasks of the group with a projection")
+        else:
+            log_fail("GET /tasks NDJSON stream", f"Got {rows} rows")
+
+        member = test_create_user(ctx.name("Stream Member"), ctx.email("stream"))
+        if member:
+            test_add_member(gid, member["id"])
+            test_stream_ndjson(f"/groups/{gid}/members", 1)
+            test_delete_user(member["id"])
+
+        rows, _ = stream_ndjson("/groups/99999999/tasks")
+        if rows is None:
+            log_pass("Streaming a missing group fails before the stream starts")
+        else:
+            log_fail("Streaming a missing group should 404", f"Got {rows} rows")
+
+        test_delete_group(gid)
+
+
+def section_conditional_get(ctx):
+    """ETag/Last-Modified revalidation"""
+    etag_group = test_create_group(ctx.name("ETag Group"))
+    etag_user = test_create_user(ctx.name("ETag User"), ctx.email("etag"))
+    if etag_group and etag_user:
+        gid = etag_group["id"]
+        task = test_create_task(gid, "ETag task")
+        paths = {name: f"/groups/{gid}{suffix}" for name, suffix in
+                 (("group", ""), ("members", "/members"), ("tasks", "/tasks"))}
+        etags = {name: fetch_validators(path)[0] for name, path in paths.items()}
+        if all(etags.values()):
+            log_pass("Group, member and task reads carry an ETag")
+        else:
+            log_fail("Missing ETag", f"Got: {etags}")
+
+        # No-op: reads and a rejected write change nothing
+        test_get_group_by_id(gid)
+        client.patch(f"/groups/{gid}/tasks/99999999/complete")
+        for name, path in paths.items():
+            test_not_modified(path, etag=etags[name])
+
+        page_etag, _ = fetch_validators(f"{paths['tasks']}?limit=1")
+        if page_etag and page_etag != etags["tasks"]:
+            log_pass("Different query strings get different ETags")
+        else:
+            log_fail("Query string should be part of the ETag", f"{page_etag} vs {etags['tasks']}")
+
+        if task:
+            test_update_task(gid, task["id"], title="ETag task - UPDATED")
+            etags["tasks"] = test_modified(paths["tasks"], etags["tasks"], "test_update_task")
+            test_not_modified(paths["members"], etag=etags["members"])
+
+        test_add_member(gid, etag_user["id"])
+        etags["members"] = test_modified(paths["members"], etags["members"], "test_add_member")
+        test_not_modified(paths["members"], etag=etags["members"])
+
+        test_update_user(etag_user["id"], name="ETag User - RENAMED")
+        etags["members"] = test_modified(paths["members"], etags["members"], "renaming a member")
+
+        time.sleep(1.1)  # Last-Modified is only sent once its second is over
+        _, last_modified = fetch_validators(paths["tasks"])
+        if last_modified:
+            test_not_modified(paths["tasks"], last_modified=last_modified)
+        else:
+            log_fail("Last-Modified should be sent once its second has passed")
+
+        test_delete_group(gid)
+        response = client.get(paths["group"], headers={"If-None-Match": etags["group"]})
+        if response.status_code == 404 and "ETag" not in response.headers:
+            log_pass("Deleted group returns 404 without validators, not 304")
+        else:
+            log_fail("Deleted group should 404", f"Got: {response.status_code}")
+    else:
+        if etag_group:
+            test_delete_group(etag_group["id"])
+    if etag_user:
+        test_delete_user(etag_user["id"])
+
+
+def section_bulk_members(ctx):
+    """Bulk membership changes with per-ID results"""
+    team = [test_create_user(ctx.name(f"Team {i}"), ctx.email(f"team{i}")) for i in range(20)]
+    team_ids = [u["id"] for u in team if u]
+    team_group = test_create_group(ctx.name("Bulk Members Group"))
+    if team_group and len(team_ids) == 20:
+        gid = team_group["id"]
+        test_add_member(gid, team_ids[0])
+        missing_user = 99999999
+        result = test_bulk_members(gid, add=team_ids[:10] + [team_ids[1], missing_user])
+        statuses = member_statuses(result)
+        if (result and result["added"] == 9
+                and statuses[("add", team_ids[0])] == "already_member"
+                and statuses[("add", missing_user)] == "user_not_found"
+                and all(statuses[("add", uid)] == "added" for uid in team_ids[1:10])):
+            log_pass("Bulk add: 9 added, existing member skipped, unknown user reported, duplicates merged")
+        else:
+            log_fail("Bulk add per-ID results", f"Got: {result}")
+
+        result = test_bulk_members(gid, add=team_ids[10:], remove=team_ids[:5] + [team_ids[15]])
+        statuses = member_statuses(result)
+        # removals are checked against the membership before this request's adds
+        if result and result["added"] == 10 and result["removed"] == 5 \
+                and statuses.get(("remove", team_ids[15])) == "not_member":
+            log_pass("Mixed add/remove in one transaction: +10 -5, removing a not-yet member is a no-op")
+        else:
+            log_fail("Mixed add/remove", f"Got: {result}")
+
+        members = {m["userId"] for m in test_get_members(gid)}
+        if members == set(team_ids[5:]):
+            log_pass(f"Group has exactly the {len(members)} expected members")
+        else:
+            log_fail("Membership after bulk changes", f"Got: {sorted(members)}")
+
+        response = client.post(f"/groups/{gid}/members/bulk", json={})
+        if response.status_code == 400:
+            log_pass("Empty bulk membership request returns 400")
+        else:
+            log_fail("Empty bulk membership request should 400", f"Got: {response.status_code}")
+        test_mutation_not_found("POST", "/groups/99999999/members/bulk", json={"add": team_ids[:1]})
+
+        # Timing: the same 20 users one request at a time vs one bulk request
+        single_group = test_create_group(ctx.name("Single Members Group"))
+        if single_group:
+            start = time.perf_counter()
+            for uid in team_ids:
+                client.post(f"/groups/{single_group['id']}/members", json={"userId": uid})
+            single_ms = (time.perf_counter() - start) * 1000
+            test_delete_group(single_group["id"])
+            test_bulk_members(gid, remove=team_ids)
+            start = time.perf_counter()
+            test_bulk_members(gid, add=team_ids)
+            bulk_ms = (time.perf_counter() - start) * 1000
+            log_info(f"{len(team_ids)} members: {single_ms:.1f}ms one by one vs {bulk_ms:.1f}ms in bulk "
+                     f"(--perf bulk-members for a larger run)")
+    if team_group:
+        test_delete_group(team_group["id"])
+    for uid in team_ids:
+        test_delete_user(uid)
+
+
+def section_change_feed(ctx):
+    """SSE delivery, replay and reset"""
+    feed_group = test_create_group(ctx.name("Change Feed Group"))
+    other_group = test_create_group(ctx.name("Change Feed Other Group"))
+    feed_user = test_create_user(ctx.name("Feed User"), ctx.email("feed"))
+    if feed_group and other_group and feed_user:
+        gid = feed_group["id"]
+        subscriber = EventSubscriber(gid)
+        if subscriber.status == 200:
+            log_pass("Subscribed to the group's change feed")
+        else:
+            log_fail("Subscribe to change feed", f"Got: {subscriber.status}")
+
+        task = test_create_task(gid, "Feed Task")
+        test_complete_task(gid, task["id"])
+        test_update_task(gid, task["id"], title="Feed Task (renamed)")
+        test_add_member(gid, feed_user["id"])
+        test_delete_member(gid, feed_user["id"])
+        test_bulk_create_tasks(gid, [{"title": f"Feed Bulk {i}"} for i in range(3)])
+        test_create_task(other_group["id"], "Other Group Task")
+        test_delete_task(gid, task["id"])
+
+        events = test_receives_events(subscriber, [
+            "task.created", "task.completed", "task.updated", "member.added",
+            "member.removed", "tasks.created", "task.deleted",
+        ], "this client's own mutations, in order")
+        if events and all(e["data"]["groupId"] == gid for e in events) \
+                and events[0]["data"]["data"]["id"] == task["id"]:
+            log_pass("Events carry the group and the written row; the other group's task was not delivered")
+        else:
+            log_fail("Event payloads", f"Got: {events[:2]}")
+
+        # Resume: events published while disconnected are replayed from Last-Event-ID
+        last_id = subscriber.last_event_id()
+        subscriber.close()
+        missed = test_create_task(gid, "Created While Disconnected")
+        resumed = EventSubscriber(gid, last_event_id=last_id)
+        events = test_receives_events(resumed, ["task.created"], "the missed event on reconnect")
+        if events and events[0]["data"]["data"]["id"] == missed["id"]:
+            log_pass("Replayed event is the task created while disconnected")
+        resumed.close()
+
+        stale = EventSubscriber(gid, last_event_id="0-1")
+        test_receives_events(stale, ["reset"], "a reset for an unknown Last-Event-ID")
+        stale.close()
+
+        response = client.get("/groups/99999999/events", headers={"Accept": "text/event-stream"})
+        if response.status_code == 404:
+            log_pass("Change feed of a missing group returns 404")
+        else:
+            log_fail("Change feed of a missing group should 404", f"Got: {response.status_code}")
+    for group in (feed_group, other_group):
+        if group:
+            test_delete_group(group["id"])
+    if feed_user:
+        test_delete_user(feed_user["id"])
+
+
+SEARCH_LATENCY_BUDGET_MS = 50
+
+
+def section_search(ctx):
+    """Full-text search: ranking, scopes, index sync and latency"""
+    # One letters-and-digits word per run, so parallel runs never see each other's tasks
+    marker = "srch" + "".join(ch for ch in ctx.ns if ch.isalnum())
+    search_group = test_create_group(ctx.name("Search Group"))
+    other_group = test_create_group(ctx.name("Search Other Group"))
+    searcher = test_create_user(ctx.name("Searcher"), ctx.email("searcher"))
+    if search_group and other_group and searcher:
+        gid, other_gid = search_group["id"], other_group["id"]
+        test_add_member(gid, searcher["id"])
+        in_title = test_create_task(gid, f"Quarterly {marker} invoice review")
+        in_description = test_create_task(gid, "Archive receipts", f"mentions {marker} once")
+        renamed = test_create_task(gid, f"Draft {marker} roadmap")
+        elsewhere = test_create_task(other_gid, f"{marker} in another group")
+
+        found = test_search_tasks(marker, groupId=gid)
+        ids = [t["id"] for t in found]
+        if set(ids) == {in_title["id"], in_description["id"], renamed["id"]}:
+            log_pass("Group search returns only that group's matches")
+        else:
+            log_fail("Group search scope", f"Got: {ids}")
+        if ids and ids.index(in_title["id"]) < ids.index(in_description["id"]) \
+                and all("rank" in t for t in found):
+            log_pass("A title match ranks above a description-only match")
+        else:
+            log_fail("Search ranking", f"Got: {[(t['id'], t.get('rank')) for t in found]}")
+
+        user_ids = {t["id"] for t in test_search_tasks(marker, userId=searcher["id"])}
+        all_ids = {t["id"] for t in test_search_tasks(marker)}
+        if elsewhere["id"] not in user_ids and user_ids == set(ids) and elsewhere["id"] in all_ids:
+            log_pass("User search covers only the user's groups; unscoped search covers all")
+        else:
+            log_fail("User/global search scope", f"User: {user_ids}, All: {all_ids}")
+
+        both = {t["id"] for t in test_search_tasks(f"{marker} invoice", groupId=gid)}
+        prefix = {t["id"] for t in test_search_tasks(f"{marker[:-2]}* roadm*", userId=searcher["id"])}
+        if both == {in_title["id"]} and prefix == {renamed["id"]}:
+            log_pass("All words must match; a trailing * matches a prefix")
+        else:
+            log_fail("Multi-word/prefix search", f"Got: {both}, {prefix}")
+
+        paged = test_search_tasks(marker, page_size=1, groupId=gid)
+        if [t["id"] for t in paged] == ids:
+            log_pass("Paging with limit=1 returns the same ranking")
+        else:
+            log_fail("Search paging", f"Got: {[t['id'] for t in paged]}")
+
+        # The index follows updates and deletes, including the FK cascade of a group delete
+        test_update_task(gid, renamed["id"], title="Draft budget")
+        test_delete_task(gid, in_description["id"])
+        test_delete_group(other_gid)
+        other_group = None
+        left = {t["id"] for t in test_search_tasks(marker)}
+        renamed_hit = {t["id"] for t in test_search_tasks(f"{marker[:-2]}* budget", groupId=gid)}
+        if left == {in_title["id"]} and not renamed_hit:
+            log_pass("Updated, deleted and cascade-deleted tasks leave the index")
+        else:
+            log_fail("Search index sync", f"Got: {left}, {renamed_hit}")
+
+        test_list_rejected("/tasks/search", {"q": "*** --"}, "Search without words")
+        test_list_rejected("/tasks/search", {}, "Search without q")
+        test_mutation_not_found("GET", f"/tasks/search?q={marker}&groupId=99999999")
+        test_mutation_not_found("GET", f"/tasks/search?q={marker}&userId=99999999")
+
+        samples = []
+        for i in range(50):
+            start = time.perf_counter()
+            response = client.get("/tasks/search", params={"q": "invoice review" if i % 2 else marker,
+                                                           "userId": searcher["id"]})
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                log_fail("Search latency run", f"Status: {response.status_code}")
+                break
+        samples.sort()
+        p50, p95 = percentile(samples, 50), percentile(samples, 95)
+        if p95 < SEARCH_LATENCY_BUDGET_MS:
+            log_pass(f"Search latency p50 {p50:.1f}ms, p95 {p95:.1f}ms (budget {SEARCH_LATENCY_BUDGET_MS}ms)")
+        else:
+            log_fail("Search latency over budget", f"p50 {p50:.1f}ms, p95 {p95:.1f}ms")
+    cleanup(users=[searcher], groups=[search_group, other_group])
+
+
+def section_user_tasks(ctx):
+    """One feed of a user's tasks across groups vs fetching group by group"""
+    feed_user = test_create_user(ctx.name("Feed Owner"), ctx.email("feedowner"))
+    groups = [test_create_group(ctx.name(f"Feed Group {i}")) for i in range(5)]
+    outsider_group = test_create_group(ctx.name("Feed Outsider Group"))
+    if feed_user and all(groups) and outsider_group:
+        uid = feed_user["id"]
+        for i, group in enumerate(groups):
+            test_add_member(group["id"], uid)
+            created = test_bulk_create_tasks(group["id"], [{"title": f"Feed {i}.{j}"} for j in range(4)])
+            test_bulk_complete_tasks(group["id"], [t["id"] for t in created[:1]])
+        test_create_task(outsider_group["id"], "Not in the user's groups")
+
+        feed = test_get_user_tasks(uid, page_size=3)
+        fan_out, requests_made = user_tasks_by_fan_out(uid)
+        feed_ids = [t["id"] for t in feed]
+        if fan_out is not None and feed_ids == [t["id"] for t in fan_out] and len(feed_ids) == 20 \
+                and feed_ids == sorted(feed_ids):
+            log_pass(f"Feed pages through the same 20 tasks as {requests_made} fan-out requests, in ID order")
+        else:
+            log_fail("Feed vs fan-out", f"feed={feed_ids}, fan-out={[t['id'] for t in fan_out or []]}")
 
-    # ========== SUMMARY ==========
+        open_tasks = test_get_user_tasks(uid, completed=False, fields="title,groupId")
+        if len(open_tasks) == 15 and all(set(t) == {"id", "title", "groupId"} for t in open_tasks):
+            log_pass("Feed supports the completed filter and projection")
+        else:
+            log_fail("Feed filters", f"Got: {open_tasks[:3]}")
+
+        test_delete_member(groups[0]["id"], uid)
+        remaining = {t["groupId"] for t in test_get_user_tasks(uid)}
+        if remaining == {g["id"] for g in groups[1:]}:
+            log_pass("Leaving a group drops its tasks from the feed")
+        else:
+            log_fail("Feed after leaving a group", f"Groups: {sorted(remaining)}")
+
+        test_mutation_not_found("GET", "/users/99999999/tasks")
+
+        start = time.perf_counter()
+        user_tasks_by_fan_out(uid, completed=False)
+        fan_out_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        fetch_pages(f"/users/{uid}/tasks", {"completed": False})
+        feed_ms = (time.perf_counter() - start) * 1000
+        log_info(f"Open tasks of a user in {len(groups) - 1} groups: {fan_out_ms:.1f}ms by fan-out vs "
+                 f"{feed_ms:.1f}ms from the feed (--perf user-feed for a larger run)")
+    cleanup(users=[feed_user], groups=groups + [outsider_group])
+
+
+def section_idempotency(ctx):
+    """Idempotency-Key: replays, concurrent retries, key reuse and no duplicates"""
+    stats_before = get_idempotency_stats()
+    if not (stats_before and stats_before["maxEntries"] and stats_before["ttlMs"]):
+        log_info("Idempotency store is disabled (IDEMPOTENCY_MAX_KEYS/IDEMPOTENCY_TTL_MS = 0); skipping")
+        return
+
+    def key(label):
+        return f"{ctx.ns}-{label}"
+
+    user_body = {"name": ctx.name("Retry User"), "email": ctx.email("retry")}
+    first, retry = (idempotent_post("/users", user_body, key("user")) for _ in range(2))
+    user = first[1] if first[0] == 201 else None
+    if user and retry[0] == 201 and retry[1]["id"] == user["id"] and retry[2] and not first[2]:
+        log_pass("A retried POST /users replays the first 201 (same user, Idempotent-Replayed: true)")
+    else:
+        log_fail("POST /users replay", f"Got: {first}, {retry}")
+
+    group_body = {"name": ctx.name("Retry Group")}
+    attempts = [idempotent_post("/groups", group_body, key("group")) for _ in range(3)]
+    group = attempts[0][1] if attempts[0][0] == 201 else None
+    if group and all(a[0] == 201 and a[1]["id"] == group["id"] for a in attempts):
+        log_pass("Three POST /groups with one key created one group")
+    else:
+        log_fail("POST /groups replay", f"Got: {attempts}")
+
+    if user and group:
+        gid = group["id"]
+        member_body = {"userId": user["id"]}
+        added, again = (idempotent_post(f"/groups/{gid}/members", member_body, key("member")) for _ in range(2))
+        if added[0] == again[0] == 201 and again[2]:
+            log_pass("A retried member add replays 201 instead of failing as a duplicate")
+        else:
+            log_fail("POST /groups/:id/members replay", f"Got: {added}, {again}")
+
+        # Hedged retries: eight copies in flight at once, one key
+        task_body = {"title": "Retried task"}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda _: idempotent_post(f"/groups/{gid}/tasks", task_body, key("task")), range(8)))
+        ids = {body["id"] for status, body, _ in results if status == 201}
+        tasks = test_get_tasks_by_group(gid)
+        if len(ids) == 1 and len(tasks) == 1 and sum(replayed for _, _, replayed in results) == 7:
+            log_pass("8 concurrent copies of one keyed POST created exactly one task")
+        else:
+            log_fail("Concurrent keyed task creates", f"IDs: {ids}, tasks in group: {len(tasks)}")
+
+        status, body, _ = idempotent_post(f"/groups/{gid}/tasks", {"title": "Something else"}, key("task"))
+        if status == 422:
+            log_pass("Reusing a key with a different body returns 422")
+        else:
+            log_fail("Key reuse with another body should 422", f"Got: {status}, {body}")
+
+        bulk_body = {"tasks": [{"title": f"Bulk retry {i}"} for i in range(5)]}
+        for _ in range(2):
+            idempotent_post(f"/groups/{gid}/tasks/bulk", bulk_body, key("bulk"))
+        tasks = test_get_tasks_by_group(gid)
+        if len(tasks) == 6:
+            log_pass("A retried bulk create did not duplicate its 5 tasks")
+        else:
+            log_fail("Bulk create replay", f"Tasks in group: {len(tasks)}")
+
+        # The stored response is served without touching the tables: a deleted task is not recreated
+        if ids:
+            task_id = ids.pop()
+            test_delete_task(gid, task_id)
+            status, body, replayed = idempotent_post(f"/groups/{gid}/tasks", task_body, key("task"))
+            remaining = test_get_tasks_by_group(gid)
+            if status == 201 and replayed and body["id"] == task_id and len(remaining) == 5:
+                log_pass("A replay returns the stored response and writes nothing")
+            else:
+                log_fail("Replay after delete", f"Got: {status}, {body}, {len(remaining)} tasks")
+
+        # Failures are not stored: both attempts reach the handler and 404
+        missing = [idempotent_post("/groups/99999999/tasks", task_body, key("missing")) for _ in range(2)]
+        if [m[0] for m in missing] == [404, 404] and not any(m[2] for m in missing):
+            log_pass("A failed request is not stored, so its retry runs again")
+        else:
+            log_fail("Failed keyed request", f"Got: {missing}")
+
+        response = client.post(f"/groups/{gid}/tasks", json=task_body, headers={IDEMPOTENCY_HEADER: "k" * 300})
+        if response.status_code == 400:
+            log_pass("An over-long Idempotency-Key returns 400")
+        else:
+            log_fail("Over-long key should 400", f"Got: {response.status_code}")
+
+    stats_after = get_idempotency_stats()
+    if stats_after:
+        log_info(f"Idempotency store: {stats_after['size']} keys, "
+                 f"+{stats_after['replayed'] - stats_before['replayed']} replayed, "
+                 f"+{stats_after['joined'] - stats_before['joined']} joined a running request")
+    cleanup(users=[user], groups=[group])
+
+
+ARCHIVE_TASKS = 1000  # functional run; --perf archive round-trips 100,000 by default
+
+
+def archive_round_trip(ctx, size):
+    """Export a group with `size` tasks and import it back as a new group, in one streamed round trip"""
+    owner = test_create_user(ctx.name("Archive Owner"), ctx.email("archiveowner"))
+    peer = test_create_user(ctx.name("Archive Peer"), ctx.email("archivepeer"))
+    group = test_create_group(ctx.name("Archive Group"), "Exported and imported again")
+    imported = None
+    if owner and peer and group:
+        gid = group["id"]
+        test_bulk_members(gid, add=[owner["id"], peer["id"]])
+        completed = 0
+        for start in range(0, size, BULK_CHUNK):
+            created = test_bulk_create_tasks(gid, [{"title": f"Archived {i}", "description": f"Row {i}"}
+                                                   for i in range(start, min(start + BULK_CHUNK, size))])
+            completed += test_bulk_complete_tasks(gid, [t["id"] for t in created[:100]])
+
+        # Export is piped straight into the import, gzip both ways, without holding the archive
+        counts = {}
+        start = time.perf_counter()
+        export = open_export(gid)
+        if export:
+            compressed = export.headers.get("Content-Encoding") == "gzip"
+            imported_result = test_import_group(archive_chunks(export.iter_lines(), counts, "gzip"), "gzip")
+            elapsed = time.perf_counter() - start
+            imported = imported_result and imported_result["group"]
+            log_info(f"Round trip of {size} tasks in {elapsed:.1f}s "
+                     f"({export.raw.tell() / 1024 / 1024:.1f} MiB exported, gzip: {compressed})")
+            if counts == {"group": 1, "member": 2, "task": size} and compressed:
+                log_pass(f"Export streamed 1 group, 2 member and {size} task records, gzip-compressed")
+            else:
+                log_fail("Export records", f"Got: {counts}, Content-Encoding gzip: {compressed}")
+
+        if imported:
+            nid = imported["id"]
+            if imported_result["sourceGroupId"] == gid and nid != gid and imported["name"] == group["name"] \
+                    and (imported_result["usersMatched"], imported_result["usersCreated"]) == (2, 0):
+                log_pass("Import created a new group and matched both members to their users by email")
+            else:
+                log_fail("Import remapping", f"Got: {imported_result}")
+
+            stats = test_get_task_stats(groupId=gid)
+            stats.update(test_get_task_stats(groupId=nid))
+            source, copy = stats.get(gid, {}), stats.get(nid, {})
+            if imported_result["tasks"] == size and (copy.get("total"), copy.get("completed")) == \
+                    (source.get("total"), source.get("completed")) == (size, completed):
+                log_pass(f"Task counts match: {size} total, {completed} completed in both groups")
+            else:
+                log_fail("Task counts after import", f"Source: {source}, imported: {copy}")
+
+            fields = ("title", "description", "completed", "createdAt")
+            first = [[{f: t[f] for f in fields} for t in client.get(f"/groups/{g}/tasks", params={"limit": 50}).json()]
+                     for g in (gid, nid)]
+            members = [sorted(m["user"]["email"] for m in test_get_members(g)) for g in (gid, nid)]
+            if first[0] == first[1] and members[0] == members[1] == sorted([owner["email"], peer["email"]]):
+                log_pass("Imported tasks keep their fields and order; members are the same users")
+            else:
+                log_fail("Imported data differs", f"Members: {members}")
+
+    cleanup(users=[owner, peer], groups=[group, imported])
+
+
+def section_archive(ctx):
+    """An archive round trip of ARCHIVE_TASKS tasks; missing groups and broken archives are rejected"""
+    archive_round_trip(ctx, ARCHIVE_TASKS)
+
+    test_mutation_not_found("GET", "/groups/99999999/export")
+    header = {"type": "group", "version": 1, "name": ctx.name("Archive Broken")}
+    # One full batch of members is written before the bad line, so this also checks the rollback
+    ghosts = [{"type": "member", "name": "Ghost", "email": ctx.email(f"archiveghost{i}")} for i in range(IMPORT_BATCH)]
+    test_import_rejected([header, *ghosts, "not json\n"], "with a bad line after a written batch")
+    ghost = test_create_user("Ghost", ghosts[0]["email"])
+    if ghost:
+        log_pass("A failed import removed the users it had created")
+    test_import_rejected([header, {"type": "task"}], "with a task without a title")
+    test_import_rejected([{**header, "version": 99}], "of an unknown version")
+    test_import_rejected([{"type": "task", "title": "No header"}], "without a group record")
+    test_import_rejected([header], "sent as JSON", expected=415, content_type="application/json")
+    cleanup(users=[ghost])
+
+
+# Section 9 (cleanup) is folded into each section, which tears down its own data.
+SECTIONS = {
+    1: ("USERS - CRUD Operations", section_users_crud),
+    2: ("GROUPS - CRUD Operations", section_groups_crud),
+    3: ("MEMBERS - Add/Remove Members", section_members),
+    4: ("TASKS - CRUD Operations", section_tasks_crud),
+    5: ("ERROR HANDLING - 404 Not Found", section_not_found),
+    6: ("CASCADE DELETE - Group Deletion", section_group_cascade),
+    7: ("CASCADE DELETE - User Deletion (Empty Groups)", section_user_cascade),
+    8: ("CASCADE DELETE - User in Multiple Groups", section_user_multi_groups),
+    10: ("BULK TASKS - Create/Update/Complete", section_bulk_tasks),
+    11: ("PAGINATION - Cursors, Filters, Projection", section_pagination),
+    12: ("LOOKUP CACHE - Hits and Invalidation", section_lookup_cache),
+    13: ("GLOBAL TASKS - Listing and Aggregation", section_global_tasks),
+    14: ("COMPRESSION AND STREAMING - gzip/br, NDJSON", section_compression),
+    15: ("CONDITIONAL GET - ETag and 304", section_conditional_get),
+    16: ("BULK MEMBERS - Add/Remove Many", section_bulk_members),
+    17: ("CHANGE FEED - Server-Sent Events", section_change_feed),
+    18: ("SEARCH - Full-Text Task Search", section_search),
+    19: ("USER TASKS - Cross-Group Feed", section_user_tasks),
+    20: ("IDEMPOTENCY - Safe Retries", section_idempotency),
+    21: ("ARCHIVE - Export/Import", section_archive),
+}
+# Member-list ETags depend on one server-wide users counter that any user
+# write bumps, so this section runs alone after the parallel ones.
+EXCLUSIVE_SECTIONS = {15}
+# These read streamed responses or upload streamed bodies (NDJSON, SSE,
+# archives), which only the requests-based ApiClient supports.
+STREAMING_SECTIONS = {14, 17, 21}
+
+
+# ============================================
+# MAIN TEST RUNNER
+# ============================================
+def check_server():
+    """Exit early with a hint if the server is not reachable"""
+    try:
+        client.get("/users", timeout=5)
+    except requests.exceptions.ConnectionError:
+        print(f"\n{RED}ERROR: Cannot connect to server at {BASE_URL}")
+        print(f"Make sure the server is running with: npm run start:dev{RESET}\n")
+        sys.exit(1)
+
+
+def run_section(number, live=True, tenant=None):
+    """Run one section under its own namespace (per tenant, if given); returns its SectionResult"""
+    title, fn = SECTIONS[number]
+    result = SectionResult(number, title, live)
+    _current.section = result
+    start = time.perf_counter()
+    try:
+        log_section(f"{number}. {title}")
+        fn(SectionContext(number, tenant))
+    except Exception as error:  # one broken section must not stop the others
+        log_fail(f"Section {number} crashed", "".join(traceback.format_exception_only(type(error), error)).strip())
+    finally:
+        result.seconds = time.perf_counter() - start
+        _current.section = None
+    return result
+
+
+def configure_worker(base_url, run_id, pool_size, retries, timeout):
+    """Process-pool initializer: fresh HTTP pool and the parent's run ID"""
+    global BASE_URL, TEST_RUN_ID
+    BASE_URL, TEST_RUN_ID = base_url, run_id
+    client.configure(base_url=base_url, pool_size=pool_size, retries=retries, timeout=timeout)
+
+
+def section_executor(args):
+    if args.pool == "process":
+        return ProcessPoolExecutor(
+            max_workers=args.jobs, initializer=configure_worker,
+            initargs=(BASE_URL, TEST_RUN_ID, args.pool_size, args.retries, (3.05, args.timeout)))
+    return ThreadPoolExecutor(max_workers=args.jobs)
+
+
+def print_timings(results, wall):
+    print(f"\n{'section':<52}{'seconds':>9}{'passed':>8}{'failed':>8}")
+    for result in sorted(results, key=lambda r: -r.seconds):
+        color = RED if result.failed else GREEN
+        print(f"{color}{f'{result.number}. {result.title}'[:51]:<52}{RESET}"
+              f"{result.seconds:>9.2f}{result.passed:>8}{result.failed:>8}")
+    serial = sum(r.seconds for r in results)
+    slowest = max((r.seconds for r in results), default=0)
+    log_info(f"Wall time {wall:.2f}s; sections took {serial:.2f}s end to end, the slowest {slowest:.2f}s "
+             f"({serial / wall if wall else 0:.1f}x from parallelism)")
+
+
+def run_all_tests(args):
+    print(f"\n{BLUE}{'#'*60}")
+    print(f"  TASK MANAGER API - COMPREHENSIVE TEST SUITE")
+    print(f"  Server: {BASE_URL}")
+    print(f"{'#'*60}{RESET}")
+
+    check_server()
+    global section_metrics
+    baseline = scrape_metrics()
+    if baseline is None:
+        log_info("Server exposes no /metrics; query counts will not be reported")
+    elif args.jobs > 1:
+        log_info("Per-section query counts are only reported with --jobs 1")
+    else:
+        section_metrics = SectionMetrics(baseline)
+
+    numbers = args.sections or sorted(SECTIONS)
+    shared = [n for n in numbers if n not in EXCLUSIVE_SECTIONS]
+    exclusive = [n for n in numbers if n in EXCLUSIVE_SECTIONS]
+    results = []
+    start = time.perf_counter()
+    if args.jobs > 1 and len(shared) > 1:
+        log_info(f"Running {len(shared)} sections on {args.jobs} {args.pool} workers")
+        with section_executor(args) as pool:
+            futures = [pool.submit(run_section, n, False) for n in shared]
+            for future in as_completed(futures):
+                result = future.result()
+                print("\n".join(result.output))
+                results.append(result)
+    else:
+        results += [run_section(n) for n in shared]
+    results += [run_section(n) for n in exclusive]
+    wall = time.perf_counter() - start
+
+    if section_metrics:
+        section_metrics.finish()
+    total_passed = sum(r.passed for r in results)
+    total_failed = sum(r.failed for r in results)
     print(f"\n{BLUE}{'='*60}")
     print(f" TEST SUMMARY")
     print(f"{'='*60}{RESET}")
-    print(f"{GREEN}Passed: {passed}{RESET}")
-    print(f"{RED}Failed: {failed}{RESET}")
-    print(f"Total:  {passed + failed}")
-
-    if failed == 0:
+    print(f"{GREEN}Passed: {total_passed}{RESET}")
+    print(f"{RED}Failed: {total_failed}{RESET}")
+    print(f"Total:  {total_passed + total_failed}")
+    for result in sorted(results, key=lambda r: r.number):
+        for failure in result.failures:
+            print(f"{RED}  {result.number}. {failure}{RESET}")
+    print_timings(results, wall)
+    log_connection_stats()
+    if section_metrics:
+        section_metrics.report()
+
+    if total_failed == 0:
         print(f"\n{GREEN}All tests passed!{RESET}\n")
     else:
         print(f"\n{RED}Some tests failed. Review output above.{RESET}\n")
         sys.exit(1)
 
 
+def parse_sections(value):
+    sections = [int(s) for s in value.split(",") if s.strip()]
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown sections: {unknown} (choose from {sorted(SECTIONS)})")
+    return sections
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Task Manager API test suite and load generator")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"server URL (default: {BASE_URL})")
+    parser.add_argument("--bench", action="store_true",
+                        help="replay the test flows concurrently and report latency percentiles")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent workers for --bench and --perf (default: 8)")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="target requests/second across all workers, 0 = unthrottled "
+                             "(default: 0; --perf overload: offered rate, default 2000)")
+    parser.add_argument("--duration", type=float, default=30, help="bench duration in seconds (default: 30)")
+    parser.add_argument("--iterations", type=int, default=0,
+                        help="flows per worker; overrides --duration when set (--perf user-feed: loads per path)")
+    parser.add_argument("--output", help="JSON result file for --bench (default: bench-<run id>.json) and --perf")
+    parser.add_argument("--perf", choices=sorted(PERF_SCENARIOS),
+                        help="run a single performance scenario instead of the suite")
+    parser.add_argument("--size", type=int, default=0,
+                        help="scale for --perf scenarios (default: per scenario)")
+    parser.add_argument("--pool-size", type=int, default=32,
+                        help="keep-alive connections to hold open; raised to --workers/--jobs (default: 32)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries with backoff for connection errors and 502/503/504 (default: 3)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request read timeout in seconds (default: 30)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="suite sections to run at once; each gets its own users and groups (default: 1)")
+    parser.add_argument("--pool", choices=("thread", "process"), default="thread",
+                        help="worker pool for --jobs > 1 (default: thread)")
+    parser.add_argument("--sections", type=parse_sections,
+                        help=f"comma-separated suite sections to run (default: all of {sorted(SECTIONS)})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global BASE_URL
+    args = parse_args(argv)
+    BASE_URL = args.base_url.rstrip("/")
+    args.pool_size = max(args.pool_size, args.workers if args.bench or args.perf else args.jobs)
+    client.configure(base_url=BASE_URL, pool_size=args.pool_size, retries=args.retries,
+                     timeout=(3.05, args.timeout))
+
+    if args.bench:
+        check_server()
+        run_bench(args)
+    elif args.perf:
+        check_server()
+        run_perf(args.perf, args.size, args)
+    else:
+        run_all_tests(args)
+
+
 if __name__ == "__main__":
-    run_all_tests()
+    main()
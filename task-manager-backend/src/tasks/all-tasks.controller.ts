@@ -0,0 +1,40 @@
+import { Controller, Get, Query, Req, Res } from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { TasksService } from './tasks.service';
+import { TaskWriteQueue } from './task-write-queue';
+import { AllTasksQueryDto, TaskStatsQueryDto } from './dto/all-tasks-query.dto';
+import { SearchTasksQueryDto } from './dto/search-tasks-query.dto';
+import { listQueryPipe, sendPage } from 'src/common/pagination';
+import { ndjson, wantsNdjson } from 'src/common/ndjson';
+
+// Cross-group reads; everything scoped to one group lives in TasksController
+@Controller('tasks')
+export class AllTasksController {
+    constructor(
+        private readonly tasksService: TasksService,
+        private readonly writeQueue: TaskWriteQueue
+    ){}
+
+    @Get('write-queue')
+    getWriteQueueStats() {
+        return this.writeQueue.stats()
+    }
+
+    @Get('search')
+    async search(@Query(listQueryPipe) query: SearchTasksQueryDto, @Res({ passthrough: true }) res: Response) {
+        return sendPage(res, await this.tasksService.search(query))
+    }
+
+    @Get('stats')
+    async getStats(@Query(listQueryPipe) query: TaskStatsQueryDto, @Res({ passthrough: true }) res: Response) {
+        return sendPage(res, await this.tasksService.countByGroup(query))
+    }
+
+    @Get()
+    async getAll(@Query(listQueryPipe) query: AllTasksQueryDto, @Req() req: Request, @Res({ passthrough: true }) res: Response) {
+        if (wantsNdjson(req)) {
+            return ndjson(this.tasksService.streamAll(query))
+        }
+        return sendPage(res, await this.tasksService.findAll(query))
+    }
+}
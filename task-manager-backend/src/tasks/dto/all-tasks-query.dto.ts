@@ -0,0 +1,22 @@
+import { Type } from "class-transformer";
+import { IsInt, IsOptional, Min } from "class-validator";
+import { PickType } from "@nestjs/mapped-types";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { TaskListQueryDto } from "./task-list-query.dto";
+
+export class AllTasksQueryDto extends TaskListQueryDto {
+    @IsOptional()
+    @Type(() => Number)
+    @IsInt()
+    @Min(1)
+    groupId?: number;
+}
+
+// Stats page over groups; the date range filters which tasks are counted
+export class TaskStatsQueryDto extends PickType(ListQueryDto, ['limit', 'cursor', 'createdAfter', 'createdBefore'] as const) {
+    @IsOptional()
+    @Type(() => Number)
+    @IsInt()
+    @Min(1)
+    groupId?: number;
+}
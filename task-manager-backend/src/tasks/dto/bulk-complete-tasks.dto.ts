@@ -0,0 +1,10 @@
+import { ArrayMaxSize, ArrayNotEmpty, IsArray, IsInt } from "class-validator";
+import { MAX_BULK_TASKS } from "./bulk-create-tasks.dto";
+
+export class BulkCompleteTasksDto {
+    @IsArray()
+    @ArrayNotEmpty()
+    @ArrayMaxSize(MAX_BULK_TASKS)
+    @IsInt({ each: true })
+    ids: number[];
+}
@@ -0,0 +1,14 @@
+import { Type } from "class-transformer";
+import { ArrayMaxSize, ArrayNotEmpty, IsArray, ValidateNested } from "class-validator";
+import { CreateTaskDto } from "./create-task.dto";
+
+export const MAX_BULK_TASKS = 10000;
+
+export class BulkCreateTasksDto {
+    @IsArray()
+    @ArrayNotEmpty()
+    @ArrayMaxSize(MAX_BULK_TASKS)
+    @ValidateNested({ each: true })
+    @Type(() => CreateTaskDto)
+    tasks: CreateTaskDto[];
+}
@@ -0,0 +1,26 @@
+import { Type } from "class-transformer";
+import { ArrayMaxSize, ArrayNotEmpty, IsArray, IsBoolean, IsInt, IsOptional, IsString, ValidateNested } from "class-validator";
+import { MAX_BULK_TASKS } from "./bulk-create-tasks.dto";
+
+export class BulkUpdateTaskItemDto {
+    @IsInt()
+    id: number;
+    @IsOptional()
+    @IsString()
+    title?: string;
+    @IsOptional()
+    @IsString()
+    description?: string;
+    @IsOptional()
+    @IsBoolean()
+    completed?: boolean;
+}
+
+export class BulkUpdateTasksDto {
+    @IsArray()
+    @ArrayNotEmpty()
+    @ArrayMaxSize(MAX_BULK_TASKS)
+    @ValidateNested({ each: true })
+    @Type(() => BulkUpdateTaskItemDto)
+    tasks: BulkUpdateTaskItemDto[];
+}
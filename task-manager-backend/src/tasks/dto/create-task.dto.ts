@@ -1,5 +1,10 @@
+import { IsNotEmpty, IsOptional, IsString } from "class-validator";
 
 export class CreateTaskDto {
+    @IsString()
+    @IsNotEmpty()
     title: string; 
+    @IsOptional()
+    @IsString()
     description?: string
-}
\ No newline at end of file
+}
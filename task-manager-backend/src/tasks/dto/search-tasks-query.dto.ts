@@ -0,0 +1,32 @@
+import { Type } from "class-transformer";
+import { IsInt, IsNotEmpty, IsOptional, IsString, Matches, MaxLength, Min } from "class-validator";
+import { PickType } from "@nestjs/mapped-types";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { SEARCH_CURSOR } from "../task-search";
+
+// Results are ranked, not keyed by id: the cursor is the last hit's rank and id
+export class SearchTasksQueryDto extends PickType(ListQueryDto, ['limit', 'fields'] as const) {
+    @IsString()
+    @IsNotEmpty()
+    @MaxLength(500)
+    q: string;
+
+    @IsOptional()
+    @IsString()
+    @MaxLength(64)
+    @Matches(SEARCH_CURSOR, { message: 'cursor must be the X-Next-Cursor of the previous page' })
+    cursor?: string;
+
+    @IsOptional()
+    @Type(() => Number)
+    @IsInt()
+    @Min(1)
+    groupId?: number;
+
+    // Only the groups this user belongs to
+    @IsOptional()
+    @Type(() => Number)
+    @IsInt()
+    @Min(1)
+    userId?: number;
+}
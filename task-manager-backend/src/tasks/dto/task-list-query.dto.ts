@@ -0,0 +1,10 @@
+import { Transform } from "class-transformer";
+import { IsBoolean, IsOptional } from "class-validator";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+
+export class TaskListQueryDto extends ListQueryDto {
+    @IsOptional()
+    @Transform(({ value }) => value === 'true' ? true : value === 'false' ? false : value)
+    @IsBoolean()
+    completed?: boolean;
+}
@@ -1,5 +1,18 @@
-export interface UpdateTaskDto {
-    title? : string;
+import { ValidationPipe } from "@nestjs/common";
+import { IsBoolean, IsOptional, IsString } from "class-validator";
+
+export class UpdateTaskDto {
+    @IsOptional()
+    @IsString()
+    title?: string;
+    @IsOptional()
+    @IsString()
     description?: string;
-    completed? : boolean
+    @IsOptional()
+    @IsBoolean()
+    completed?: boolean;
 }
+
+// Unknown fields are a 400: single-task updates may be merged in the write
+// queue, where one bad field would fail every write it was merged with
+export const updateTaskPipe = new ValidationPipe({ whitelist: true, forbidNonWhitelisted: true });
@@ -0,0 +1,52 @@
+import {
+  MAX_SEARCH_TERMS,
+  SEARCH_CURSOR,
+  matchExpression,
+  parseSearchCursor,
+  searchCursor,
+  searchTerms,
+} from './task-search';
+
+describe('searchTerms', () => {
+  it('quotes every word so FTS5 operators are plain text', () => {
+    expect(searchTerms('milk OR "eggs" NEAR(bread)')).toEqual([
+      '"milk"',
+      '"OR"',
+      '"eggs"',
+      '"NEAR"',
+      '"bread"',
+    ]);
+  });
+
+  it('keeps a trailing * as a prefix, except on one letter', () => {
+    expect(searchTerms('repo* a* café')).toEqual(['"repo"*', '"a"', '"café"']);
+  });
+
+  it('ignores input without letters or digits and caps the term count', () => {
+    expect(searchTerms(' -*- ')).toEqual([]);
+    expect(searchTerms('w '.repeat(50))).toHaveLength(MAX_SEARCH_TERMS);
+  });
+});
+
+describe('matchExpression', () => {
+  it('limits the terms to the text columns and ORs the group scopes', () => {
+    expect(matchExpression(['"milk"'])).toBe('{title description} : ("milk")');
+    expect(matchExpression(['"milk"', '"eggs"*'], [3, 7])).toBe(
+      '{title description} : ("milk" "eggs"*) AND scope : (g3 OR g7)',
+    );
+  });
+});
+
+describe('searchCursor', () => {
+  it('round-trips the rank and ID of the last hit exactly', () => {
+    for (const hit of [
+      { rank: -3.0517578125e-7, id: 42 },
+      { rank: -12.345678901234567, id: 7 },
+      { rank: 0, id: 1 },
+    ]) {
+      const cursor = searchCursor(hit);
+      expect(cursor).toMatch(SEARCH_CURSOR);
+      expect(parseSearchCursor(cursor)).toEqual(hit);
+    }
+  });
+});
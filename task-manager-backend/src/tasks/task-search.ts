@@ -0,0 +1,51 @@
+// Search text is never passed to FTS5 as syntax: every word becomes a quoted
+// term (all must match), and a trailing * on a word makes it a prefix.
+// Groups are matched through the scope column ("g<groupId>").
+export const MAX_SEARCH_TERMS = 16;
+
+// bm25 counts the rows of every phrase in the MATCH, scope tokens included,
+// so scopes with at least this many tasks are filtered by joining Task instead
+export const SCOPE_JOIN_TASKS = 100_000;
+
+// Search pages are keyed by the last hit's bm25 rank and ID, as "<rank>:<id>"
+export const SEARCH_CURSOR = /^(-?\d+(?:\.\d+)?(?:e[-+]?\d+)?):(\d+)$/i;
+
+export interface SearchHit {
+    id: number;
+    rank: number;
+}
+
+const WORD = /([\p{L}\p{N}]+)(\*?)/gu;
+
+export function searchTerms(q: string): string[] {
+    const terms: string[] = [];
+    for (const [, word, star] of q.matchAll(WORD)) {
+        // One-letter prefixes would expand to most of the vocabulary
+        terms.push(star && word.length >= 2 ? `"${word}"*` : `"${word}"`);
+        if (terms.length === MAX_SEARCH_TERMS) {
+            break;
+        }
+    }
+    return terms;
+}
+
+// String() of a double parses back to the same double, so the next page
+// compares against the exact rank SQLite returned
+export function searchCursor(hit: SearchHit) {
+    return `${hit.rank}:${Number(hit.id)}`;
+}
+
+/** The rank and ID after which the next page starts; `cursor` matches SEARCH_CURSOR */
+export function parseSearchCursor(cursor: string): SearchHit {
+    const [, rank, id] = SEARCH_CURSOR.exec(cursor)!;
+    return { rank: Number(rank), id: Number(id) };
+}
+
+/** FTS5 MATCH expression for `q`, limited to `groupIds` when given */
+export function matchExpression(terms: string[], groupIds?: number[]) {
+    const text = `{title description} : (${terms.join(' ')})`;
+    if (groupIds === undefined) {
+        return text;
+    }
+    return `${text} AND scope : (${groupIds.map((id) => `g${id}`).join(' OR ')})`;
+}
@@ -0,0 +1,190 @@
+import { BeforeApplicationShutdown, Injectable, Logger, NotFoundException } from "@nestjs/common";
+import { Task } from "@prisma/client";
+import { PrismaService } from "src/prisma/prisma.service";
+import { intFromEnv } from "src/common/env";
+import { orNotFound } from "src/prisma/prisma-errors";
+import { BULK_TRANSACTION_OPTIONS } from "src/prisma/transactions";
+import { UpdateTaskDto } from "./dto/update-task.dto";
+
+interface Waiter {
+    // This caller's own fields, replayed alone if the merged batch fails
+    data: UpdateTaskDto;
+    resolve: (task: Task) => void;
+    reject: (error: unknown) => void;
+}
+
+interface PendingWrite {
+    data: UpdateTaskDto;
+    waiters: Waiter[];
+}
+
+export interface WriteQueueStats {
+    enabled: boolean;
+    windowMs: number;
+    maxPending: number;
+    pending: number;
+    enqueued: number;
+    merged: number;
+    batches: number;
+    written: number;
+    waits: number;
+}
+
+/**
+ * Group commit for single-task updates. Writes to the same task within
+ * TASK_WRITE_WINDOW_MS are merged (later fields win), and everything
+ * pending is committed in one transaction, so a burst of checklist ticks
+ * takes the SQLite write lock once instead of once per PATCH. Callers
+ * still wait for the commit: the response, and any 404, reflect the
+ * database. At most TASK_WRITE_QUEUE_MAX tasks are pending; further
+ * writes wait for the running flush. A window of 0 disables the queue.
+ */
+@Injectable()
+export class TaskWriteQueue implements BeforeApplicationShutdown {
+    private readonly logger = new Logger(TaskWriteQueue.name);
+    readonly windowMs = intFromEnv('TASK_WRITE_WINDOW_MS', 0);
+    readonly maxPending = Math.max(intFromEnv('TASK_WRITE_QUEUE_MAX', 1000), 1);
+    private pending = new Map<number, PendingWrite>();
+    private timer?: NodeJS.Timeout;
+    private flushing?: Promise<void>;
+    private counters = { enqueued: 0, merged: 0, batches: 0, written: 0, waits: 0 };
+
+    constructor(private prisma: PrismaService) {}
+
+    get enabled() {
+        return this.windowMs > 0;
+    }
+
+    async enqueue(id: number, data: UpdateTaskDto): Promise<Task> {
+        // Full: wait for the running flush (or start one) instead of growing
+        if (!this.pending.has(id) && this.pending.size >= this.maxPending) {
+            this.counters.waits++;
+            do {
+                await this.flush();
+            } while (!this.pending.has(id) && this.pending.size >= this.maxPending);
+        }
+
+        return new Promise<Task>((resolve, reject) => {
+            this.counters.enqueued++;
+            const entry = this.pending.get(id);
+            if (entry) {
+                this.counters.merged++;
+                entry.data = { ...entry.data, ...data };
+                entry.waiters.push({ data, resolve, reject });
+            } else {
+                this.pending.set(id, { data: { ...data }, waiters: [{ data, resolve, reject }] });
+            }
+
+            if (this.pending.size >= this.maxPending) {
+                void this.flush();
+            } else {
+                this.schedule();
+            }
+        });
+    }
+
+    stats(): WriteQueueStats {
+        return {
+            enabled: this.enabled,
+            windowMs: this.windowMs,
+            maxPending: this.maxPending,
+            pending: this.pending.size,
+            ...this.counters
+        };
+    }
+
+    // Runs before the HTTP server closes, so waiting requests still get their response
+    async beforeApplicationShutdown() {
+        clearTimeout(this.timer);
+        while (this.pending.size > 0 || this.flushing) {
+            await this.flush();
+        }
+        this.logger.log(`Write queue drained (${this.counters.written} tasks in ${this.counters.batches} batches)`);
+    }
+
+    private schedule() {
+        // A running flush reschedules when it finishes
+        if (!this.timer && !this.flushing) {
+            this.timer = setTimeout(() => void this.flush(), this.windowMs);
+        }
+    }
+
+    private flush(): Promise<void> {
+        clearTimeout(this.timer);
+        this.timer = undefined;
+        if (this.flushing) {
+            return this.flushing;
+        }
+        if (this.pending.size === 0) {
+            return Promise.resolve();
+        }
+
+        const batch = this.pending;
+        this.pending = new Map();
+        this.flushing = this.write(batch).finally(() => {
+            this.flushing = undefined;
+            if (this.pending.size > 0) {
+                this.schedule();
+            }
+        });
+        return this.flushing;
+    }
+
+    private async write(batch: Map<number, PendingWrite>) {
+        // Tasks with identical merged data share one UPDATE ... WHERE id IN (...)
+        const byData = new Map<string, number[]>();
+        for (const [id, { data }] of batch) {
+            const key = JSON.stringify(data);
+            const ids = byData.get(key);
+            if (ids) {
+                ids.push(id);
+            } else {
+                byData.set(key, [id]);
+            }
+        }
+
+        let tasks: Task[];
+        try {
+            tasks = await this.prisma.$transaction(async (tx) => {
+                for (const [key, ids] of byData) {
+                    await tx.task.updateMany({ where: { id: { in: ids } }, data: JSON.parse(key) });
+                }
+                return tx.task.findMany({ where: { id: { in: [...batch.keys()] } } });
+            }, BULK_TRANSACTION_OPTIONS);
+        } catch (error) {
+            this.logger.warn(`Write batch of ${batch.size} tasks failed, retrying one by one: ${error}`);
+            return this.writeEach(batch);
+        }
+
+        this.counters.batches++;
+        this.counters.written += tasks.length;
+
+        const found = new Map(tasks.map((task) => [task.id, task]));
+        for (const [id, { waiters }] of batch) {
+            const task = found.get(id);
+            for (const waiter of waiters) {
+                if (task) {
+                    waiter.resolve(task);
+                } else {
+                    waiter.reject(new NotFoundException(`Task with id ${id} not found!`));
+                }
+            }
+        }
+    }
+
+    // One bad update must not fail the writes it was batched or merged with:
+    // each caller's own fields are applied in arrival order
+    private async writeEach(batch: Map<number, PendingWrite>) {
+        for (const [id, { waiters }] of batch) {
+            for (const { data, resolve, reject } of waiters) {
+                try {
+                    const task = await orNotFound(this.prisma.task.update({ where: { id }, data }), `Task with id ${id} not found!`);
+                    this.counters.written++;
+                    resolve(task);
+                } catch (error) {
+                    reject(error);
+                }
+            }
+        }
+    }
+}
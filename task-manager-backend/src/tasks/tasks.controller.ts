@@ -1,17 +1,45 @@
-import {Controller , Get, Post, Put ,Delete, Patch,Body,  Param} from '@nestjs/common';
+import {Controller , Get, Post, Put ,Delete, Patch,Body,  Param, Query, Req, Res, UseInterceptors} from '@nestjs/common';
+import type { Request, Response } from 'express';
 import {TasksService} from './tasks.service'
+import { TaskListQueryDto } from './dto/task-list-query.dto';
+import { listQueryPipe, sendPage } from 'src/common/pagination';
+import { ndjson, wantsNdjson } from 'src/common/ndjson';
 import type { CreateTaskDto } from './dto/create-task.dto';
-import type {UpdateTaskDto } from './dto/update-task.dto';
+import { UpdateTaskDto, updateTaskPipe } from './dto/update-task.dto';
+import { BulkCreateTasksDto } from './dto/bulk-create-tasks.dto';
+import { BulkUpdateTasksDto } from './dto/bulk-update-tasks.dto';
+import { BulkCompleteTasksDto } from './dto/bulk-complete-tasks.dto';
+import { IdempotencyInterceptor } from 'src/idempotency/idempotency.interceptor';
 
 @Controller('groups/:groupId/tasks')
 export class TasksController {
     constructor(
         private readonly tasksService: TasksService
     ){}
+    // Bulk routes are declared before the ':id' routes so 'bulk' is not parsed as a task id
+    @Post('bulk')
+    @UseInterceptors(IdempotencyInterceptor)
+    createTasks(@Param('groupId') groupId: string, @Body() body: BulkCreateTasksDto) {
+        return this.tasksService.createTasks(parseInt(groupId), body.tasks);
+    }
+
+    @Patch('bulk/complete')
+    completeTasks(@Param('groupId') groupId: string, @Body() body: BulkCompleteTasksDto) {
+        return this.tasksService.completeTasks(parseInt(groupId), body.ids);
+    }
+
+    @Patch('bulk')
+    updateTasks(@Param('groupId') groupId: string, @Body() body: BulkUpdateTasksDto) {
+        return this.tasksService.updateTasks(parseInt(groupId), body.tasks);
+    }
+
     @Get()
-    getTasksByGroup(@Param('groupId') groupId: string) {
+    async getTasksByGroup(@Param('groupId') groupId: string, @Query(listQueryPipe) query: TaskListQueryDto, @Req() req: Request, @Res({ passthrough: true }) res: Response) {
         const groupID = parseInt(groupId)
-        return this.tasksService.findByGroupId(groupID)
+        if (wantsNdjson(req)) {
+            return ndjson(await this.tasksService.streamByGroupId(groupID, query))
+        }
+        return sendPage(res, await this.tasksService.findByGroupId(groupID, query))
     }
     @Get(':id')
     getByID(@Param('id')taskid: string){
@@ -20,6 +48,7 @@ export class TasksController {
     }
 
     @Post()
+    @UseInterceptors(IdempotencyInterceptor)
     createTask(@Param('groupId') groupId: string, @Body() taskD : CreateTaskDto){
         return this.tasksService.createTask(parseInt(groupId),taskD);
     }
@@ -36,7 +65,7 @@ export class TasksController {
         return this.tasksService.setComplete(taskID);
     }
     @Patch(':id') 
-    partialUpdateTask(@Param('id') taskid : string, @Body() data: UpdateTaskDto) {
+    partialUpdateTask(@Param('id') taskid : string, @Body(updateTaskPipe) data: UpdateTaskDto) {
         const taskID = parseInt(taskid);
         return this.tasksService.updateTask(taskID , data);
     }
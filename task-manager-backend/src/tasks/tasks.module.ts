@@ -1,14 +1,18 @@
 import { Module} from "@nestjs/common";
 import { TasksService } from "./tasks.service";
 import { TasksController } from "./tasks.controller";
+import { AllTasksController } from "./all-tasks.controller";
+import { UserTasksController } from "./user-tasks.controller";
 import { PrismaModule } from "../prisma/prisma.module";
 import { GroupsModule } from "src/groups/groups.module";
+import { UsersModule } from "src/users/users.module";
+import { TaskWriteQueue } from "./task-write-queue";
 
 
 @Module({
-    imports: [PrismaModule, GroupsModule],
-    controllers: [TasksController],
-    providers: [TasksService],
+    imports: [PrismaModule, GroupsModule, UsersModule],
+    controllers: [TasksController, AllTasksController, UserTasksController],
+    providers: [TasksService, TaskWriteQueue],
     exports: [TasksService]
 })
 export class TasksModule{}
\ No newline at end of file
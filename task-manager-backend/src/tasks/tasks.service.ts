@@ -1,23 +1,175 @@
-import { Injectable, NotFoundException } from "@nestjs/common";
+import { BadRequestException, Injectable, NotFoundException } from "@nestjs/common";
+import { Prisma } from "@prisma/client";
 import { PrismaService } from "../prisma/prisma.service";
 import { CreateTaskDto } from "./dto/create-task.dto";
 import { UpdateTaskDto } from "./dto/update-task.dto";
+import { BulkUpdateTaskItemDto } from "./dto/bulk-update-tasks.dto";
 import { GroupsService } from "src/groups/groups.service";
+import { orNotFound } from "src/prisma/prisma-errors";
+import { BULK_TRANSACTION_OPTIONS } from "src/prisma/transactions";
+import { TaskListQueryDto } from "./dto/task-list-query.dto";
+import { AllTasksQueryDto, TaskStatsQueryDto } from "./dto/all-tasks-query.dto";
+import { dateRange, pageWindow, selectFields, toPage } from "src/common/pagination";
+import { pageBatches, STREAM_BATCH_SIZE } from "src/common/ndjson";
+import { VersionsService } from "src/versions/versions.service";
+import { TaskWriteQueue } from "./task-write-queue";
+import { ChangeType, EventsService } from "src/events/events.service";
+import { UsersService } from "src/users/users.service";
+import { DEFAULT_PAGE_SIZE } from "src/common/dto/list-query.dto";
+import { SearchTasksQueryDto } from "./dto/search-tasks-query.dto";
+import { matchExpression, parseSearchCursor, SCOPE_JOIN_TASKS, SearchHit, searchCursor, searchTerms } from "./task-search";
+
+export const TASK_FIELDS = ['id', 'title', 'description', 'completed', 'groupId', 'createdAt'] as const;
 
 @Injectable()
 export class TasksService {
-    constructor(private prisma: PrismaService,private groupsService: GroupsService){}
-    async findAll(){
-        return this.prisma.task.findMany({
-            include: {
-                group : {
-                    select : {
-                        id : true,
-                        name: true
-                    }
-                }
+    constructor(
+        private prisma: PrismaService,
+        private groupsService: GroupsService,
+        private usersService: UsersService,
+        private versions: VersionsService,
+        private writeQueue: TaskWriteQueue,
+        private events: EventsService
+    ){}
+
+    // No group join: rows carry groupId, and names come from /groups or countByGroup
+    async findAll(query: AllTasksQueryDto){
+        const { limit, take, after } = pageWindow(query);
+        const tasks = await this.prisma.task.findMany({
+            where: {
+                id: after,
+                groupId: query.groupId,
+                completed: query.completed,
+                createdAt: dateRange(query)
+            },
+            select: selectFields(query.fields, TASK_FIELDS, 'id'),
+            orderBy: { id: 'asc' },
+            take
+        });
+
+        return toPage(tasks, limit, (task) => task.id);
+    }
+
+    // Totals come from one GROUP BY over the (groupId, completed) index; no
+    // task rows are loaded. Groups are paged from the Group table so groups
+    // without tasks still report zeros.
+    async countByGroup(query: TaskStatsQueryDto) {
+        if (query.groupId !== undefined) {
+            await this.groupsService.getById(query.groupId)
+        }
+
+        const { limit, take, after } = pageWindow(query);
+        const groups = await this.prisma.group.findMany({
+            where: { id: query.groupId ?? after },
+            select: { id: true, name: true },
+            orderBy: { id: 'asc' },
+            take
+        });
+        const page = toPage(groups, limit, (group) => group.id);
+
+        const counts = await this.prisma.task.groupBy({
+            by: ['groupId', 'completed'],
+            where: {
+                groupId: { in: page.items.map((group) => group.id) },
+                createdAt: dateRange(query)
+            },
+            _count: { _all: true }
+        });
+
+        const stats = new Map(page.items.map((group) => [
+            group.id,
+            { groupId: group.id, name: group.name, total: 0, completed: 0 }
+        ]));
+        for (const row of counts) {
+            const entry = stats.get(row.groupId)!;
+            entry.total += row._count._all;
+            if (row.completed) {
+                entry.completed += row._count._all;
             }
+        }
+
+        return { items: [...stats.values()], nextCursor: page.nextCursor };
+    }
+
+    // Ranked full-text search over the TaskSearch index, optionally scoped to
+    // one group and/or the groups a user belongs to
+    async search(query: SearchTasksQueryDto) {
+        const terms = searchTerms(query.q);
+        if (terms.length === 0) {
+            throw new BadRequestException('q must contain at least one letter or digit')
+        }
+        const groupIds = await this.searchScope(query);
+        if (groupIds?.length === 0) {
+            return { items: [], nextCursor: null }
+        }
+
+        const limit = query.limit ?? DEFAULT_PAGE_SIZE;
+        const after = query.cursor === undefined ? undefined : parseSearchCursor(query.cursor);
+        const hits = await this.prisma.$queryRaw<SearchHit[]>(await this.searchSql(terms, groupIds, after, limit + 1));
+        const page = toPage(hits, limit, searchCursor);
+
+        const tasks = await this.prisma.task.findMany({
+            where: { id: { in: page.items.map((hit) => Number(hit.id)) } },
+            select: selectFields(query.fields, TASK_FIELDS, 'id')
         });
+        const byId = new Map(tasks.map((task) => [task.id, task]));
+        // A task deleted between the two queries is simply left out
+        const items = page.items.flatMap((hit) => {
+            const task = byId.get(Number(hit.id));
+            return task ? [{ ...task, rank: hit.rank }] : [];
+        });
+
+        return { items, nextCursor: page.nextCursor };
+    }
+
+    // Every match is ranked in the FTS query, best first and newest first on
+    // ties; a page continues after the previous page's last (rank, id).
+    // Small scopes are part of the MATCH; large ones would make ranking count
+    // their scope tokens' rows, so they are checked against Task.groupId
+    private async searchSql(terms: string[], groupIds: number[] | undefined, after: SearchHit | undefined, take: number) {
+        let from = Prisma.sql`"TaskSearch"`;
+        let match = matchExpression(terms, groupIds);
+        let scope = Prisma.empty;
+        if (groupIds !== undefined) {
+            const [{ tasks }] = await this.prisma.$queryRaw<{ tasks: number }[]>`
+                SELECT COUNT(*) AS tasks FROM (
+                    SELECT 1 FROM "Task" WHERE "groupId" IN (${Prisma.join(groupIds)}) LIMIT ${SCOPE_JOIN_TASKS}
+                )`;
+            if (Number(tasks) >= SCOPE_JOIN_TASKS) {
+                from = Prisma.sql`"TaskSearch" JOIN "Task" t ON t.id = "TaskSearch".rowid`;
+                match = matchExpression(terms);
+                scope = Prisma.sql`AND t."groupId" IN (${Prisma.join(groupIds)})`;
+            }
+        }
+        const keyset = after === undefined ? Prisma.empty : Prisma.sql`
+            AND ("TaskSearch".rank > ${after.rank}
+                OR ("TaskSearch".rank = ${after.rank} AND "TaskSearch".rowid < ${after.id}))`;
+
+        return Prisma.sql`
+            SELECT "TaskSearch".rowid AS id, "TaskSearch".rank AS rank FROM ${from}
+            WHERE "TaskSearch" MATCH ${match} ${scope} ${keyset}
+            ORDER BY "TaskSearch".rank, "TaskSearch".rowid DESC LIMIT ${take}`;
+    }
+
+    // undefined searches every group
+    private async searchScope(query: SearchTasksQueryDto) {
+        if (query.userId === undefined) {
+            if (query.groupId !== undefined) {
+                await this.groupsService.getById(query.groupId)
+                return [query.groupId]
+            }
+            return undefined
+        }
+
+        await this.usersService.getById(query.userId)
+        if (query.groupId !== undefined) {
+            await this.groupsService.getById(query.groupId)
+        }
+        const memberships = await this.prisma.userGroup.findMany({
+            where: { userId: query.userId, groupId: query.groupId },
+            select: { groupId: true }
+        });
+        return memberships.map((m) => m.groupId)
     }
 
     async getByID(id: number){
@@ -30,53 +182,178 @@ export class TasksService {
 
         return task
     }
-    async findByGroupId(groupId : number) {
+    async findByGroupId(groupId : number, query: TaskListQueryDto) {
+        await this.groupsService.getById(groupId)
+
+        return this.pageByGroup(groupId, query)
+    }
+
+    // Every task in the group from query.cursor on, one batch in memory at a time.
+    // The group is checked up front so a 404 is sent before streaming starts.
+    async streamByGroupId(groupId: number, query: TaskListQueryDto) {
         await this.groupsService.getById(groupId)
-        return this.prisma.task.findMany(
+
+        return pageBatches((cursor) => this.pageByGroup(groupId, { ...query, cursor, limit: STREAM_BATCH_SIZE }), query.cursor)
+    }
+
+    streamAll(query: AllTasksQueryDto) {
+        return pageBatches((cursor) => this.findAll({ ...query, cursor, limit: STREAM_BATCH_SIZE }), query.cursor)
+    }
+
+    // The "my tasks" feed: one query, with the user's groups joined in
+    // through UserGroup, instead of one task list per group
+    async findByUserId(userId: number, query: TaskListQueryDto) {
+        await this.usersService.getById(userId)
+
+        return this.pageByUser(userId, query)
+    }
+
+    async streamByUserId(userId: number, query: TaskListQueryDto) {
+        await this.usersService.getById(userId)
+
+        return pageBatches((cursor) => this.pageByUser(userId, { ...query, cursor, limit: STREAM_BATCH_SIZE }), query.cursor)
+    }
+
+    private pageByGroup(groupId: number, query: TaskListQueryDto) {
+        return this.pageTasks({ groupId }, query)
+    }
+
+    // groupId IN (the user's memberships): each group's (groupId, id) index
+    // range is read in id order, so a page stays cheap however large the groups are
+    private pageByUser(userId: number, query: TaskListQueryDto) {
+        return this.pageTasks({ group: { members: { some: { userId } } } }, query)
+    }
+
+    private async pageTasks(scope: Prisma.TaskWhereInput, query: TaskListQueryDto) {
+        const { limit, take, after } = pageWindow(query);
+        const tasks = await this.prisma.task.findMany(
             {
-                where: {groupId}
+                where: {
+                    ...scope,
+                    id: after,
+                    completed: query.completed,
+                    createdAt: dateRange(query)
+                },
+                select: selectFields(query.fields, TASK_FIELDS, 'id'),
+                orderBy: { id: 'asc' },
+                take
             }
         );
+
+        return toPage(tasks, limit, (task) => task.id);
     }
     async createTask(groupId: number, task: CreateTaskDto){
         
         await this.groupsService.getById(groupId)
-        return this.prisma.task.create({
+        return this.changed('task.created', this.prisma.task.create({
             data: {
                 title: task.title,
                 description: task.description || null,
                 completed: false,
                 groupId: groupId
             }
-        });
+        }));
     }
 
-    async updateTask(id: number , data: UpdateTaskDto){
-        await this.getByID(id);
+    async createTasks(groupId: number, tasks: CreateTaskDto[]) {
+        await this.groupsService.getById(groupId)
+
+        const created = await this.prisma.$transaction((tx) =>
+            tx.task.createManyAndReturn({
+                data: tasks.map((task) => ({
+                    title: task.title,
+                    description: task.description || null,
+                    completed: false,
+                    groupId: groupId
+                }))
+            }),
+            BULK_TRANSACTION_OPTIONS
+        );
+        this.versions.touchGroups('tasks', groupId)
+        this.events.publish(groupId, 'tasks.created', { ids: created.map((task) => task.id) })
+
+        return created
+    }
+
+    async updateTasks(groupId: number, updates: BulkUpdateTaskItemDto[]) {
+        await this.groupsService.getById(groupId)
+
+        const updated = await this.prisma.$transaction(async (tx) => {
+            for (const { id, ...data } of updates) {
+                const { count } = await tx.task.updateMany({
+                    where: { id, groupId },
+                    data
+                });
+                if (count === 0) {
+                    throw new NotFoundException(`Task with id ${id} not found in group ${groupId}!`);
+                }
+            }
 
-        return this.prisma.task.update({
+            return tx.task.findMany({
+                where: { id: { in: updates.map((u) => u.id) } },
+                orderBy: { id: 'asc' }
+            });
+        }, BULK_TRANSACTION_OPTIONS);
+        this.versions.touchGroups('tasks', groupId)
+        this.events.publish(groupId, 'tasks.updated', { ids: updated.map((task) => task.id) })
+
+        return updated
+    }
+
+    async completeTasks(groupId: number, ids: number[]) {
+        await this.groupsService.getById(groupId)
+        const uniqueIds = [...new Set(ids)];
+
+        const result = await this.prisma.$transaction(async (tx) => {
+            const { count } = await tx.task.updateMany({
+                where: { id: { in: uniqueIds }, groupId },
+                data: { completed: true }
+            });
+            if (count !== uniqueIds.length) {
+                throw new NotFoundException(`${uniqueIds.length - count} of ${uniqueIds.length} tasks not found in group ${groupId}!`);
+            }
+
+            return { count };
+        }, BULK_TRANSACTION_OPTIONS);
+        this.versions.touchGroups('tasks', groupId)
+        this.events.publish(groupId, 'tasks.completed', { ids: uniqueIds })
+
+        return result
+    }
+
+    async updateTask(id: number , data: UpdateTaskDto){
+        if (this.writeQueue.enabled) {
+            return this.changed('task.updated', this.writeQueue.enqueue(id, data))
+        }
+        return this.changed('task.updated', orNotFound(this.prisma.task.update({
             where: {id},
             data
-        });
+        }), `Task with id ${id} not found!`));
     }
     async deleteTask(id: number){
-
-        await this.getByID(id)
-
-        return this.prisma.task.delete({
+        return this.changed('task.deleted', orNotFound(this.prisma.task.delete({
             where:{id}
-        });
+        }), `Task with id ${id} not found!`));
     }
 
 
     async setComplete(id: number) {
-        await this.getByID(id)
-
-        return this.prisma.task.update({
+        if (this.writeQueue.enabled) {
+            return this.changed('task.completed', this.writeQueue.enqueue(id, { completed: true }))
+        }
+        return this.changed('task.completed', orNotFound(this.prisma.task.update({
             where:{id},
             data : {
                 completed: true
             }
-        })
+        }), `Task with id ${id} not found!`))
+    }
+
+    // Once the write has committed: bump the group's version (ETags) and publish the change
+    private async changed<T extends { groupId: number }>(type: ChangeType, write: Promise<T>) {
+        const task = await write
+        this.versions.touchGroups('tasks', task.groupId)
+        this.events.publish(task.groupId, type, task)
+        return task
     }
 }
\ No newline at end of file
@@ -0,0 +1,24 @@
+import { Controller, Get, Param, Query, Req, Res } from '@nestjs/common';
+import type { Request, Response } from 'express';
+import { TasksService } from './tasks.service';
+import { TaskListQueryDto } from './dto/task-list-query.dto';
+import { listQueryPipe, sendPage } from 'src/common/pagination';
+import { ndjson, wantsNdjson } from 'src/common/ndjson';
+
+// Tasks across every group the user belongs to; lives with the tasks
+// module for the same reason group task lists do
+@Controller('users/:userId/tasks')
+export class UserTasksController {
+    constructor(
+        private readonly tasksService: TasksService
+    ){}
+
+    @Get()
+    async getTasksByUser(@Param('userId') userId: string, @Query(listQueryPipe) query: TaskListQueryDto, @Req() req: Request, @Res({ passthrough: true }) res: Response) {
+        const userID = parseInt(userId)
+        if (wantsNdjson(req)) {
+            return ndjson(await this.tasksService.streamByUserId(userID, query))
+        }
+        return sendPage(res, await this.tasksService.findByUserId(userID, query))
+    }
+}
@@ -1,15 +1,19 @@
-import { Get, Post, Put, Delete, Controller, Param, Body } from "@nestjs/common";
+import { Get, Post, Put, Delete, Controller, Param, Body, Query, Res, UseInterceptors } from "@nestjs/common";
+import type { Response } from "express";
 import { UsersService } from "./users.service";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { listQueryPipe, sendPage } from "src/common/pagination";
 import { CreateUserDto } from "./dto/create-user.dto";
 import { UpdateUserDto } from "./dto/update-user.dto";
+import { IdempotencyInterceptor } from "src/idempotency/idempotency.interceptor";
 // import type { CreateTaskDto } from "src/tasks/dto/create-task.dto";
 
 @Controller('users')
 export class UsersController {
     constructor(private usersService: UsersService){}
     @Get()
-    getUsers() {
-        return this.usersService.getUsers();
+    async getUsers(@Query(listQueryPipe) query: ListQueryDto, @Res({ passthrough: true }) res: Response) {
+        return sendPage(res, await this.usersService.getUsers(query));
     }
 
     @Get(':id')
@@ -25,6 +29,7 @@ export class UsersController {
         return this.usersService.updateUserByID(userId, data);
     }
     @Post()
+    @UseInterceptors(IdempotencyInterceptor)
     createUser(@Body() data: CreateUserDto) {
         return this.usersService.createUser(data);
     }
@@ -2,20 +2,48 @@ import { Injectable, NotFoundException } from "@nestjs/common";
 import { PrismaService } from "src/prisma/prisma.service";
 import { CreateUserDto } from "./dto/create-user.dto";
 import { UpdateUserDto } from "./dto/update-user.dto";
+import { orNotFound } from "src/prisma/prisma-errors";
+import { ListQueryDto } from "src/common/dto/list-query.dto";
+import { dateRange, pageWindow, selectFields, toPage } from "src/common/pagination";
+import { CacheService } from "src/cache/cache.service";
+import { LruCache } from "src/cache/lru-cache";
+import type { Group, User } from "@prisma/client";
+import { VersionsService } from "src/versions/versions.service";
+import { EventsService } from "src/events/events.service";
+
+export const USER_FIELDS = ['id', 'name', 'email', 'createdAt'] as const;
 
 
 @Injectable()
 export class UsersService{
-    constructor(private prisma: PrismaService){}
+    private readonly users: LruCache<number, User>;
+    private readonly groups: LruCache<number, Group>;
+
+    constructor(private prisma: PrismaService, private versions: VersionsService, private events: EventsService, cacheService: CacheService){
+        this.users = cacheService.cache('users')
+        this.groups = cacheService.cache('groups')
+    }
 
-    async getUsers(){
-        return this.prisma.user.findMany();
+    async getUsers(query: ListQueryDto){
+        const { limit, take, after } = pageWindow(query);
+        const users = await this.prisma.user.findMany({
+            where: {
+                id: after,
+                createdAt: dateRange(query)
+            },
+            select: selectFields(query.fields, USER_FIELDS, 'id'),
+            orderBy: { id: 'asc' },
+            take
+        });
+
+        return toPage(users, limit, (user) => user.id);
     }
 
+    // Read-through: existence checks from groups and tasks hit the cache
     async getById(id: number) {
-        const user = await this.prisma.user.findUnique({
+        const user = await this.users.getOrLoad(id, () => this.prisma.user.findUnique({
             where: {id}
-        });
+        }));
 
         if (!user) {
             throw new NotFoundException(`User with id ${id} not found!`);
@@ -34,14 +62,16 @@ export class UsersService{
     }
 
     async updateUserByID(id: number, data: UpdateUserDto) {
-        await this.getById(id);
-
-        return this.prisma.user.update({
+        const user = await orNotFound(this.prisma.user.update({
             where: {id},
             data : {
                 ...data
             }
-        })
+        }), `User with id ${id} not found!`)
+        this.users.delete(id)
+        this.versions.touchUsers()
+
+        return user
     }
     async seeUserGroups(userId : number) {
         await this.getById(userId)
@@ -63,38 +93,50 @@ export class UsersService{
         })
     }
     async deleteUser(userId: number) {
-        await this.getById(userId)
-
-        const userGroups = await this.prisma.userGroup.findMany({
-            where: {userId: userId},
-            select: {groupId: true}
-        });
-
-        const groupIds = userGroups.map(ug => ug.groupId)
-
-        // remove user from all these groups 
-
-        await this.prisma.userGroup.deleteMany({
-            where: {userId}
-        });
-
-
-        for (const groupId of groupIds) {
-            const memberCount = await this.prisma.userGroup.count({
-                where : {groupId}
-            });
-
-            if (memberCount === 0 ) {
-                await this.prisma.group.delete(
-                    {
-                        where: {id: groupId}
+        // One transaction, a fixed number of set-based statements regardless
+        // of how many groups the user is in. Groups where this user is the
+        // only member would become empty, so they go first (their tasks
+        // cascade); their IDs are read up front so the cache can drop them,
+        // and the other memberships so their groups' feeds hear about it.
+        const { user, emptiedGroupIds, memberships } = await orNotFound(this.prisma.$transaction(async (tx) => {
+            const memberships = await tx.userGroup.findMany({
+                where: { userId }
+            })
+            const emptied = await tx.group.findMany({
+                where: {
+                    members: {
+                        some: { userId },
+                        every: { userId }
                     }
-                );
+                },
+                select: { id: true }
+            })
+            const emptiedGroupIds = emptied.map((group) => group.id)
+            await tx.group.deleteMany({
+                where: { id: { in: emptiedGroupIds } }
+            })
+            await tx.userGroup.deleteMany({
+                where: { userId }
+            })
+            const user = await tx.user.delete({
+                where: { id: userId }
+            })
+            return { user, emptiedGroupIds, memberships }
+        }), `User with id ${userId} not found!`);
+
+        this.users.delete(userId)
+        emptiedGroupIds.forEach((id) => this.groups.delete(id))
+        // member lists of the user's other groups changed too
+        this.versions.touchUsers()
+        this.versions.touchGroups('group', ...emptiedGroupIds)
+        for (const member of memberships) {
+            if (emptiedGroupIds.includes(member.groupId)) {
+                this.events.publish(member.groupId, 'group.deleted', { id: member.groupId })
+            } else {
+                this.events.publish(member.groupId, 'member.removed', member)
             }
         }
 
-        return this.prisma.user.delete({
-            where: { id : userId}
-        });
+        return user
     }
 }
\ No newline at end of file
@@ -0,0 +1,85 @@
+import { Injectable, NestMiddleware } from '@nestjs/common';
+import type { NextFunction, Request, Response } from 'express';
+import { createHash } from 'node:crypto';
+import { VersionsService } from './versions.service';
+
+// GET /groups/:id, /groups/:id/members and /groups/:groupId/tasks
+const CONDITIONAL_ROUTE = /^\/groups\/(\d+)(\/members|\/tasks)?\/?$/;
+
+function etagMatches(header: string, etag: string) {
+  const opaque = (tag: string) => tag.trim().replace(/^W\//, '');
+  return header
+    .split(',')
+    .some((tag) => tag.trim() === '*' || opaque(tag) === opaque(etag));
+}
+
+/**
+ * Answers revalidations from the group's change counter without touching
+ * the database. The ETag also hashes the URL and Accept header, because
+ * pages, filters and NDJSON are different representations of one group.
+ */
+@Injectable()
+export class ConditionalGetMiddleware implements NestMiddleware {
+  constructor(private readonly versions: VersionsService) {}
+
+  use(req: Request, res: Response, next: NextFunction) {
+    const match =
+      (req.method === 'GET' || req.method === 'HEAD') &&
+      CONDITIONAL_ROUTE.exec(req.path);
+    if (!match) {
+      return next();
+    }
+
+    const groupId = Number(match[1]);
+    const versions = [this.versions.group('group', groupId)];
+    if (match[2] === '/tasks') {
+      versions.push(this.versions.group('tasks', groupId));
+    } else if (match[2] === '/members') {
+      versions.push(
+        this.versions.group('members', groupId),
+        this.versions.usersVersion(),
+      );
+    }
+    const parts = [this.versions.bootId, ...versions.map((v) => v.version)];
+    const modifiedAt = Math.max(...versions.map((v) => v.modifiedAt));
+    const variant = createHash('sha1')
+      .update(`${req.originalUrl}\n${req.headers.accept ?? ''}`)
+      .digest('base64url')
+      .slice(0, 12);
+
+    const validators: Record<string, string> = {
+      ETag: `W/"${parts.join('.')}.${variant}"`,
+      'Cache-Control': 'no-cache',
+    };
+    // Last-Modified has one-second resolution: only send it once that second
+    // is over, or a second write within it would look unmodified
+    const modifiedSecond = Math.floor(modifiedAt / 1000);
+    if (modifiedSecond < Math.floor(Date.now() / 1000)) {
+      validators['Last-Modified'] = new Date(modifiedSecond * 1000).toUTCString();
+    }
+    res.vary('Accept');
+
+    const ifNoneMatch = req.headers['if-none-match'];
+    const ifModifiedSince = Date.parse(req.headers['if-modified-since'] ?? '');
+    const fresh = ifNoneMatch
+      ? etagMatches(ifNoneMatch, validators.ETag)
+      : validators['Last-Modified'] !== undefined &&
+        modifiedSecond * 1000 <= ifModifiedSince;
+    res.set(validators);
+    if (fresh) {
+      res.status(304).end();
+      return;
+    }
+
+    // Set before the handler so Express does not hash the body for its own
+    // ETag; dropped again if the handler fails (a 404 has no validators)
+    const writeHead = res.writeHead;
+    res.writeHead = function (this: Response, statusCode: number, ...rest: any[]) {
+      if (statusCode < 200 || (statusCode >= 300 && statusCode !== 304)) {
+        Object.keys(validators).forEach((name) => this.removeHeader(name));
+      }
+      return writeHead.call(this, statusCode, ...rest);
+    } as Response['writeHead'];
+    next();
+  }
+}
@@ -0,0 +1,14 @@
+import { Global, MiddlewareConsumer, Module, NestModule } from '@nestjs/common';
+import { ConditionalGetMiddleware } from './conditional-get.middleware';
+import { VersionsService } from './versions.service';
+
+@Global()
+@Module({
+  providers: [VersionsService],
+  exports: [VersionsService],
+})
+export class VersionsModule implements NestModule {
+  configure(consumer: MiddlewareConsumer) {
+    consumer.apply(ConditionalGetMiddleware).forRoutes('{*splat}');
+  }
+}
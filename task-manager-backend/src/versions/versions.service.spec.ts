@@ -0,0 +1,46 @@
+import { VersionsService } from './versions.service';
+
+describe('VersionsService', () => {
+  let service: VersionsService;
+
+  beforeEach(() => {
+    process.env.VERSIONS_MAX_GROUPS = '2';
+    service = new VersionsService();
+  });
+
+  afterEach(() => {
+    delete process.env.VERSIONS_MAX_GROUPS;
+  });
+
+  it('keeps only the most recently written counters', () => {
+    for (let id = 1; id <= 100; id++) {
+      service.touchGroups('tasks', id);
+    }
+
+    expect(service.size).toBe(2);
+  });
+
+  it('never hands an evicted group a version it had before', () => {
+    service.touchGroups('group', 1);
+    service.touchGroups('group', 1);
+    const deleted = service.group('group', 1).version;
+
+    service.touchGroups('tasks', 2);
+    service.touchGroups('tasks', 3);
+
+    expect(service.size).toBe(2);
+    expect(service.group('group', 1).version).toBeGreaterThanOrEqual(deleted);
+    service.touchGroups('group', 1);
+    expect(service.group('group', 1).version).toBeGreaterThan(deleted);
+  });
+
+  it('moves counters without an entry past every evicted version', () => {
+    service.touchGroups('members', 1, 1, 1);
+    const before = service.group('members', 7).version;
+
+    service.touchGroups('members', 2, 3);
+
+    expect(service.group('members', 7).version).toBeGreaterThanOrEqual(3);
+    expect(service.group('members', 7).version).toBeGreaterThan(before);
+  });
+});
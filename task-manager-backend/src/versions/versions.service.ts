@@ -0,0 +1,72 @@
+import { Injectable } from '@nestjs/common';
+import { intFromEnv } from '../common/env';
+
+export interface Version {
+  version: number;
+  modifiedAt: number;
+}
+
+// What changed in a group: the group itself (deletion), its tasks or its members
+export type GroupScope = 'group' | 'tasks' | 'members';
+
+/**
+ * Change counters behind the conditional-GET validators. Each group has
+ * one counter per scope so a task write does not invalidate member lists;
+ * user writes bump one counter shared by every member list. Counters live
+ * in memory, and the boot ID is part of each ETag so validators issued
+ * before a restart never match.
+ *
+ * Only the VERSIONS_MAX_GROUPS most recently written counters are kept.
+ * An evicted counter is folded into a floor that every counter without an
+ * entry reads, so a group's version never goes back and an old ETag cannot
+ * match a later state; at worst an untouched group revalidates once.
+ */
+@Injectable()
+export class VersionsService {
+  readonly bootId = Date.now().toString(36);
+  readonly maxGroups = Math.max(intFromEnv('VERSIONS_MAX_GROUPS', 100000), 1);
+  // Least recently written first; deleted groups keep their entries (or the
+  // floor covers them) so an old ETag cannot match a 404
+  private readonly groups = new Map<string, Version>();
+  private floor: Version = { version: 0, modifiedAt: Date.now() };
+  private users: Version = { version: 0, modifiedAt: this.floor.modifiedAt };
+
+  get size() {
+    return this.groups.size;
+  }
+
+  group(scope: GroupScope, id: number): Version {
+    return this.groups.get(`${scope}:${id}`) ?? this.floor;
+  }
+
+  usersVersion(): Version {
+    return this.users;
+  }
+
+  touchGroups(scope: GroupScope, ...ids: number[]) {
+    const modifiedAt = Date.now();
+    for (const id of ids) {
+      const key = `${scope}:${id}`;
+      const version = this.group(scope, id).version + 1;
+      // Re-inserted, so the map stays in least recently written order
+      this.groups.delete(key);
+      this.groups.set(key, { version, modifiedAt });
+      if (this.groups.size > this.maxGroups) {
+        this.evictOldest();
+      }
+    }
+  }
+
+  private evictOldest() {
+    const [key, evicted] = this.groups.entries().next().value!;
+    this.groups.delete(key);
+    this.floor = {
+      version: Math.max(this.floor.version, evicted.version),
+      modifiedAt: Math.max(this.floor.modifiedAt, evicted.modifiedAt),
+    };
+  }
+
+  touchUsers() {
+    this.users = { version: this.users.version + 1, modifiedAt: Date.now() };
+  }
+}